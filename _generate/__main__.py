@@ -9,6 +9,7 @@ of the maintainers of this library.
 """
 import subprocess as sp
 import pathlib
+import keyword
 import ast
 import re
 
@@ -131,6 +132,9 @@ def _clean_scriptability():  # noqa: C901
     #
     # As of right now, betterproto (v2.0.0b5) does not allow optionality.
     #
+    # Don't emit @dataclass(slots=True), betterproto.Message keeps its state in the instance
+    # __dict__. The decoders build instances which share their dict keys instead.
+    #
     class ThoughtSpotVisitor(ast.NodeVisitor):
         # EXCEPTION RULES:
         # - rewrite Format.*Config dataclasses to have camelCase attributes
@@ -187,12 +191,38 @@ def _clean_scriptability():  # noqa: C901
 
             self.generic_visit(node)
 
+    class ReservedWordVisitor(ast.NodeVisitor):
+        # python-betterproto appends a trailing sunder to fields which are python reserved
+        # words (eg. `with` -> `with_`). TML documents must use the original key, so we
+        # record every rename in a table which the (de)serializers consult.
+
+        def __init__(self):
+            self.aliases = {}
+
+        def visit_ClassDef(self, node: ast.ClassDef) -> None:
+            for attr in node.body:
+                if not isinstance(attr, ast.AnnAssign):
+                    continue
+
+                name = attr.target.id
+
+                if name.endswith("_") and keyword.iskeyword(name[:-1]):
+                    self.aliases.setdefault(node.name, {})[name] = name[:-1]
+
+            self.generic_visit(node)
+
     text = SCRIPTABILITY_PY.read_text()
     warning, plugin, code = text.partition("# plugin: python-betterproto")
     tree = ast.parse(code, filename=SCRIPTABILITY_PY)
     ThoughtSpotVisitor().visit(tree)
     BetterProtoVisitor().visit(tree)
+    reserved = ReservedWordVisitor()
+    reserved.visit(tree)
     text = ast.unparse(tree)
+    text += (
+        "\n\n# TML keys which are python reserved words, mapped from their python-betterproto field name."
+        f"\nRESERVED_WORD_KEY_ALIASES = {reserved.aliases!r}\n"
+    )
 
     SCRIPTABILITY_PY.write_text("\n".join([warning + plugin, text]))
     _subprocess_run("black", SCRIPTABILITY_PY.as_posix(), "-v")
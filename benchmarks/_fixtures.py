@@ -0,0 +1,41 @@
+"""
+Synthetic, scaled-up TML documents built from the test fixtures.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+import copy
+import pathlib
+
+from thoughtspot_tml import _yaml
+
+HERE = pathlib.Path(__file__).parent
+DATA_DIR = HERE.parent / "tests" / "data"
+
+
+def _scaled(path: pathlib.Path, *keys: str, n: int) -> Dict[str, Any]:
+    document = _yaml.load(path.read_text(encoding="utf-8"))
+    parent = document
+
+    for key in keys[:-1]:
+        parent = parent[key]
+
+    items = parent[keys[-1]]
+    parent[keys[-1]] = [copy.deepcopy(items[i % len(items)]) for i in range(n)]
+    return document
+
+
+def liveboard(n_visualizations: int = 500) -> Dict[str, Any]:
+    """A Liveboard with many PinnedVisualizations."""
+    return _scaled(DATA_DIR / "DUMMY.liveboard.tml", "liveboard", "visualizations", n=n_visualizations)
+
+
+def worksheet(n_columns: int = 2000) -> Dict[str, Any]:
+    """A Worksheet with many columns."""
+    return _scaled(DATA_DIR / "DUMMY.worksheet.tml", "worksheet", "worksheet_columns", n=n_columns)
+
+
+def model(n_columns: int = 2000) -> Dict[str, Any]:
+    """A Worksheet V2 (Model) with many columns."""
+    return _scaled(DATA_DIR / "DUMMY_MODEL.worksheet.tml", "worksheet", "worksheet_columns", n=n_columns)
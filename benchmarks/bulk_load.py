@@ -0,0 +1,57 @@
+"""
+Compare loading a directory of TML one file at a time against thoughtspot_tml.bulk.
+
+    python benchmarks/bulk_load.py --files 200 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import tempfile
+import timeit
+
+from thoughtspot_tml import Liveboard, Worksheet, bulk
+from thoughtspot_tml.utils import determine_tml_type
+import _fixtures
+
+
+def _load_sequentially(directory: pathlib.Path) -> None:
+    for path in sorted(directory.iterdir()):
+        determine_tml_type(path=path).load(path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200, help="number of TML files of each type")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="size of the worker pool")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = pathlib.Path(tmp)
+        liveboard = Liveboard(**_fixtures.liveboard(50)).dumps()
+        worksheet = Worksheet(**_fixtures.worksheet(200)).dumps()
+
+        for i in range(args.files):
+            directory.joinpath(f"{i}.liveboard.tml").write_text(liveboard, encoding="utf-8")
+            directory.joinpath(f"{i}.worksheet.tml").write_text(worksheet, encoding="utf-8")
+
+        print(f"Directory ({args.files * 2} files, {args.workers} workers)")
+
+        cases = {
+            "sequential": lambda: _load_sequentially(directory),
+            "bulk, process": lambda: list(bulk.load_directory(directory, workers=args.workers)),
+            "bulk, thread": lambda: list(bulk.load_directory(directory, workers=args.workers, executor="thread")),
+        }
+
+        for label, fn in cases.items():
+            best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+            print(f"  {label:<22} {best:8.3f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
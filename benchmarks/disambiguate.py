@@ -0,0 +1,71 @@
+"""
+Compare finding the Identity fields of many TML objects with a full tree walk, against
+the schema-derived walk used by disambiguate, and remapping a whole SpotApp at once.
+
+    python benchmarks/disambiguate.py --objects 10000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import tempfile
+import timeit
+
+from thoughtspot_tml import Liveboard, SpotApp, SpotAppWriter, Worksheet, _scriptability
+from thoughtspot_tml.utils import _find_instances, _recursive_scan, disambiguate
+import _fixtures
+
+
+def _is_identity(attr: object) -> bool:
+    return isinstance(attr, _scriptability.Identity)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=10_000, help="number of TML objects to remap")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="size of the worker pool")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    templates = [
+        Liveboard(**_fixtures.liveboard(5)).dumps(),
+        Worksheet(**_fixtures.worksheet(20)).dumps(),
+    ]
+    objects = [(Liveboard, Worksheet)[i % 2].loads(templates[i % 2]) for i in range(args.objects)]
+    identities = [identity for tml in objects[:2] for identity in _find_instances(tml, _scriptability.Identity)]
+    mapping = {identity.name: identity.name for identity in identities}
+    spotapp = SpotApp(tml=objects)
+
+    print(f"SpotApp ({args.objects:,} objects)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, "spot_app.zip")
+
+        with SpotAppWriter(path) as writer:
+            for i, tml in enumerate(objects):
+                writer.write(tml, filename=f"{i}.{tml.tml_type_name}.tml")
+
+        cases = {
+            "full scan": lambda: [_recursive_scan(tml, check=_is_identity) for tml in objects],
+            "schema scan": lambda: [_find_instances(tml, _scriptability.Identity) for tml in objects],
+            "disambiguate": lambda: [disambiguate(tml, guid_mapping=mapping) for tml in objects],
+            "SpotApp": lambda: spotapp.disambiguate(mapping),
+            f"  .. {args.workers} workers": lambda: spotapp.disambiguate(mapping, workers=args.workers),
+            "SpotApp, lazy": lambda: SpotApp.read(path, lazy=True).disambiguate(mapping),
+            f"  .. {args.workers} workers ": lambda: SpotApp.read(path, lazy=True).disambiguate(
+                mapping,
+                workers=args.workers,
+            ),
+        }
+
+        for label, fn in cases.items():
+            best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+            print(f"  {label:<22} {best:8.3f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
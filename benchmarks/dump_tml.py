@@ -0,0 +1,70 @@
+"""
+Compare the single-pass serializer against the historical asdict() + remove null walk.
+
+    python benchmarks/dump_tml.py
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from dataclasses import asdict
+import timeit
+import tracemalloc
+
+from thoughtspot_tml import Liveboard, Worksheet
+import _fixtures
+
+
+def _legacy_remove_null(mapping):
+    # thoughtspot_tml <= 2.0.14, _tml._recursive_remove_null
+    new = {}
+
+    for k, v in mapping.items():
+        if isinstance(v, dict):
+            v = _legacy_remove_null(v)
+
+        if isinstance(v, list):
+            v = [_legacy_remove_null(e) if isinstance(e, dict) else e for e in v if e is not None]
+
+        if k in ("value", "client_state") and v == "":
+            new[k] = v
+            continue
+
+        if v is None or v == "" or (isinstance(v, Collection) and not isinstance(v, str) and not v):
+            continue
+
+        new[k] = v
+
+    return new
+
+
+def _peak_memory(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main() -> int:
+    cases = {
+        "Liveboard (500 visualizations)": Liveboard(**_fixtures.liveboard(500)),
+        "Worksheet (2000 columns)": Worksheet(**_fixtures.worksheet(2000)),
+    }
+
+    for name, tml in cases.items():
+        legacy = lambda tml=tml: _legacy_remove_null(asdict(tml))  # noqa: E731
+        current = lambda tml=tml: tml._to_dict(drop_empty=True)  # noqa: E731
+        assert legacy() == current()
+
+        print(name)
+
+        for label, fn in (("asdict + remove null", legacy), ("single pass", current)):
+            best = min(timeit.repeat(fn, number=1, repeat=5))
+            print(f"  {label:<22} {best:8.3f}s  peak {_peak_memory(fn):7.2f} MB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""
+Compare the size and speed of serializing TML as YAML, JSON, protobuf, and MessagePack.
+
+    python benchmarks/formats.py --visualizations 50 --columns 200
+
+MessagePack is skipped when msgpack isn't installed.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+import argparse
+import functools
+import json
+import timeit
+
+from thoughtspot_tml import Liveboard, Worksheet, _tml
+import _fixtures
+
+
+def _from_json(tml_cls: Any, document: str) -> Any:
+    # JSON is a subset of YAML, so loads() would parse it the slow way
+    return tml_cls._from_document(json.loads(document))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--visualizations", type=int, default=50, help="number of Liveboard visualizations")
+    parser.add_argument("--columns", type=int, default=200, help="number of Worksheet columns")
+    parser.add_argument("--number", type=int, default=20, help="number of round trips per run")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    objects = [
+        Liveboard(**_fixtures.liveboard(args.visualizations)),
+        Worksheet(**_fixtures.worksheet(args.columns)),
+    ]
+
+    for tml in objects:
+        tml_cls = type(tml)
+        formats = ("YAML", "JSON", "PROTOBUF") if _tml.msgpack is None else ("YAML", "JSON", "PROTOBUF", "MSGPACK")
+        documents = {fmt: tml.dumps(format_type=fmt) for fmt in formats}
+
+        cases = {
+            "YAML": (functools.partial(tml.dumps, "YAML"), functools.partial(tml_cls.loads, documents["YAML"])),
+            "JSON": (functools.partial(tml.dumps, "JSON"), functools.partial(_from_json, tml_cls, documents["JSON"])),
+            "PROTOBUF": (tml.to_bytes, functools.partial(tml_cls.from_bytes, documents["PROTOBUF"])),
+        }
+
+        if "MSGPACK" in documents:
+            cases["MSGPACK"] = (
+                functools.partial(tml.dumps, "MSGPACK"),
+                functools.partial(tml_cls.loads, documents["MSGPACK"], format_type="MSGPACK"),
+            )
+
+        print(f"{tml_cls.__name__} ({args.number} round trips)")
+
+        for fmt, (dump, load) in cases.items():
+            dumps = min(timeit.repeat(dump, number=args.number, repeat=args.repeat))
+            loads = min(timeit.repeat(load, number=args.number, repeat=args.repeat))
+            size = len(documents[fmt].encode() if isinstance(documents[fmt], str) else documents[fmt])
+            print(f"  {fmt:<9} {size / 1024:8.1f}KB  dumps {dumps:7.3f}s  loads {loads:7.3f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""
+Build a large EnvironmentGUIDMapper across DEV, TEST, and PROD.
+
+    python benchmarks/guid_mapper.py --entries 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools as it
+import pathlib
+import tempfile
+import time
+import uuid
+import warnings
+
+from thoughtspot_tml.utils import EnvironmentGUIDMapper, MappedEnvironmentGUIDMapper
+
+
+def _timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<22} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=200_000, help="number of objects in the mapping")
+    args = parser.parse_args()
+
+    guids = [tuple(str(uuid.uuid4()) for _ in range(3)) for _ in range(args.entries)]
+
+    def build() -> EnvironmentGUIDMapper:
+        mapper = EnvironmentGUIDMapper()
+
+        for dev, test, prod in guids:
+            mapper[dev] = ("DEV", dev)
+            mapper[dev] = ("TEST", test)
+            mapper[test] = ("PROD", prod)
+
+        return mapper
+
+    def lookup() -> None:
+        for dev, _, prod in guids:
+            assert prod in mapper
+            assert mapper[dev]["PROD"] == prod
+
+    print(f"EnvironmentGUIDMapper ({args.entries} entries, 3 environments)")
+    mapper = _timed("build", build)
+    _timed("lookup", lookup)
+    _timed("generate_mapping", lambda: mapper.generate_mapping("DEV", "PROD"))
+
+    # every other object is never promoted to UAT, so half of the entries are incomplete
+    for dev, _, _ in guids[::2]:
+        mapper[dev] = ("UAT", str(uuid.uuid4()))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        _timed("generate_mapping, 50%", lambda: mapper.generate_mapping("DEV", "UAT"))
+
+    index = _timed("build_index", mapper.build_index)
+
+    def repeated(index=None) -> None:
+        for from_envt, to_envt in it.permutations(("DEV", "TEST", "PROD", "UAT"), 2):
+            for _ in mapper.iter_mapping(from_envt, to_envt, index=index):
+                pass
+
+    _timed("iter_mapping x12", repeated)
+    _timed("iter_mapping x12, index", lambda: repeated(index))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = pathlib.Path(tmp, "mapping.json")
+        binary_path = pathlib.Path(tmp, "mapping.bin")
+        _timed("save, JSON", lambda: mapper.save(json_path))
+        _timed("save, BINARY", lambda: mapper.save(binary_path, format_type="BINARY"))
+        _timed("read, JSON", lambda: EnvironmentGUIDMapper.read(json_path))
+        _timed("read, BINARY", lambda: EnvironmentGUIDMapper.read(binary_path))
+        print(f"  {'size, JSON':<22} {json_path.stat().st_size / 1e6:8.1f}MB")
+        print(f"  {'size, BINARY':<22} {binary_path.stat().st_size / 1e6:8.1f}MB")
+
+        mapped = _timed("open, memory-mapped", lambda: MappedEnvironmentGUIDMapper(binary_path))
+        sample = guids[:: max(1, len(guids) // 10_000)]
+
+        def mapped_lookup() -> None:
+            for dev, _, prod in sample:
+                assert mapped[dev]["PROD"] == prod
+
+        _timed(f"lookup x{len(sample)}, mapped", mapped_lookup)
+        _timed("generate_mapping, mapped", lambda: mapped.generate_mapping("DEV", "PROD"))
+        mapped.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
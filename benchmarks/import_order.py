@@ -0,0 +1,67 @@
+"""
+Time ordering the import of many Tables and Worksheets, to check it scales with the graph.
+
+Each Table JOINs to the next, and every 10th Table JOINs back to the first of its group,
+so there are plenty of cycles to break.
+
+    python benchmarks/import_order.py --tables 10000
+"""
+
+from __future__ import annotations
+
+from typing import List
+import argparse
+import functools
+import logging
+import timeit
+import uuid
+
+from thoughtspot_tml import Table, Worksheet, _scriptability
+from thoughtspot_tml.utils import _import_sort_order
+
+CONNECTION_GUID = str(uuid.UUID(int=0, version=4))
+
+
+def _objects(n_tables: int) -> List[object]:
+    guids = [str(uuid.uuid4()) for _ in range(n_tables)]
+    objects: List[object] = []
+
+    for i, guid in enumerate(guids):
+        join_to = guids[i - 9] if i % 10 == 9 else guids[(i + 1) % n_tables]
+        table = _scriptability.LogicalTableEDocProto(
+            name=f"table_{i}",
+            connection=_scriptability.Identity(name="connection", fqn=CONNECTION_GUID),
+            joins_with=[_scriptability.RelationEDocProto(destination=_scriptability.Identity(fqn=join_to))],
+        )
+        objects.append(Table(guid=guid, table=table))
+
+    for i in range(0, n_tables, 3):
+        tables = [_scriptability.Identity(name=f"table_{j}", fqn=guids[j]) for j in range(i, min(i + 3, n_tables))]
+        worksheet = _scriptability.WorksheetEDocProto(name=f"worksheet_{i}", tables=tables)
+        objects.append(Worksheet(guid=str(uuid.uuid4()), worksheet=worksheet))
+
+    return objects
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, default=10_000, help="number of Tables, at the largest size")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    # every cycle is reported, which isn't what's being timed
+    logging.getLogger("thoughtspot_tml").setLevel(logging.ERROR)
+
+    print("Import order (Tables + Worksheets)")
+
+    for n_tables in (args.tables // 4, args.tables // 2, args.tables):
+        objects = _objects(n_tables)
+        fn = functools.partial(_import_sort_order, objects)
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"  {len(objects):>8,} objects {best:8.3f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""
+Compare an estate of Liveboards and Worksheets loaded with and without an InternPool, by
+the memory it holds and how quickly it's indexed and disambiguated.
+
+    python benchmarks/interning.py --liveboards 1000 --worksheets 250
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, List, Optional
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from thoughtspot_tml import Liveboard, SpotApp, Worksheet, _scriptability
+from thoughtspot_tml.interning import InternPool
+from thoughtspot_tml.references import ReferenceIndex
+from thoughtspot_tml.utils import _find_instances, disambiguate
+import _fixtures
+
+
+def _retained(fn: Callable[[], Any]) -> Any:
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def _load_all(documents: List[Any], pool: Optional[InternPool]) -> List[Any]:
+    estate = [tml_cls.loads(document, intern=pool) for tml_cls, document in documents]
+
+    for i, tml in enumerate(estate):
+        tml.guid = f"{i:08d}-0000-4000-8000-000000000000"
+
+    return estate
+
+
+def _measure(label: str, documents: List[Any], pool: Optional[InternPool], *, repeat: int) -> None:
+    estate, retained = _retained(lambda: _load_all(documents, pool))
+    spotapp = SpotApp(tml=estate)
+    identities = [identity for tml in estate[-2:] for identity in _find_instances(tml, _scriptability.Identity)]
+    mapping = {identity.name: identity.name for identity in identities}
+
+    print(f"  {label}")
+    print(f"    {'retained':<22} {retained / 1024 / 1024:8.1f}MB")
+
+    if pool is not None:
+        print(f"    {'hit rate':<22} {pool.hit_rate:8.1%}  ({len(pool):,} strings)")
+
+    cases = {
+        "loads": lambda: _load_all(documents, pool),
+        "build ReferenceIndex": lambda: ReferenceIndex.from_spotapp(spotapp),
+        "disambiguate": lambda: [disambiguate(tml, guid_mapping=mapping) for tml in estate],
+    }
+
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        print(f"    {name:<22} {best:8.3f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--liveboards", type=int, default=1000, help="number of Liveboards in the estate")
+    parser.add_argument("--worksheets", type=int, default=250, help="number of Worksheets in the estate")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    documents = [
+        *[(Liveboard, Liveboard(**_fixtures.liveboard(10)).dumps())] * args.liveboards,
+        *[(Worksheet, Worksheet(**_fixtures.worksheet(50)).dumps())] * args.worksheets,
+    ]
+
+    print(f"Estate ({args.liveboards:,} Liveboards, {args.worksheets:,} Worksheets)")
+    _measure("no pool", documents, None, repeat=args.repeat)
+    _measure("InternPool", documents, InternPool(), repeat=args.repeat)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
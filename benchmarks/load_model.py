@@ -0,0 +1,56 @@
+"""
+Compare the historical full-text reserved word replacement against key-aware decoding.
+
+    python benchmarks/load_model.py --columns 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import tracemalloc
+
+from thoughtspot_tml import Worksheet, _yaml
+import _fixtures
+
+
+def _legacy_parse(document: str):
+    # thoughtspot_tml <= 2.0.14, Worksheet._loads
+    if "with:" in document:
+        document = document.replace("- with:", "- with_:")
+
+    return _yaml.load(document)
+
+
+def _peak_memory(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--columns", type=int, default=20_000, help="number of model columns")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    document = Worksheet(**_fixtures.model(args.columns)).dumps()
+    print(f"Model ({args.columns} columns, {len(document.encode()) / 1024 / 1024:.1f} MB)")
+
+    cases = {
+        "text replace + parse": lambda: _legacy_parse(document),
+        "parse": lambda: _yaml.load(document),
+        "Worksheet.loads": lambda: Worksheet.loads(document),
+    }
+
+    for label, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"  {label:<22} {best:8.3f}s  peak {_peak_memory(fn):7.2f} MB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
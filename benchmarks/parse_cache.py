@@ -0,0 +1,68 @@
+"""
+Compare loading a directory of TML from scratch, against a cold and a warm ParseCache.
+
+    python benchmarks/parse_cache.py --objects 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import tempfile
+import timeit
+
+from thoughtspot_tml import Liveboard, Worksheet
+from thoughtspot_tml.cache import ParseCache
+from thoughtspot_tml.utils import load_any
+import _fixtures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=500, help="number of TML files to load")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    templates = [Liveboard(**_fixtures.liveboard(5)), Worksheet(**_fixtures.worksheet(20))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+
+        for i in range(args.objects):
+            # every file has a unique guid, so each one is its own cache entry
+            tml = templates[i % 2]
+            tml.guid = f"{i:08d}-0000-4000-8000-000000000000"
+            path = pathlib.Path(tmp, f"{tml.guid}.{tml.tml_type_name}.tml")
+            tml.dump(path)
+            files.append(path)
+
+        def load(cache=None):
+            return [load_any(path, cache=cache) for path in files]
+
+        def cold():
+            cache = ParseCache(pathlib.Path(tmp, "cache"))
+            cache.clear()
+            return load(cache)
+
+        warm = ParseCache(pathlib.Path(tmp, "cache"))
+        load(warm)
+
+        print(f"Load {args.objects:,} TML files")
+
+        cases = {
+            "no cache": load,
+            "cold cache": cold,
+            "warm cache": lambda: load(warm),
+        }
+
+        for label, fn in cases.items():
+            best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+            print(f"  {label:<12} {best:8.3f}s")
+
+        print(f"  {len(warm):,} entries, {warm.size / 1024 / 1024:.1f}MB on disk")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+"""
+Compare answering "who refers to this Table?" by scanning every object per question, against
+building a ReferenceIndex once.
+
+    python benchmarks/reference_index.py --objects 2000 --questions 100
+"""
+
+from __future__ import annotations
+
+from typing import Any, List
+import argparse
+import timeit
+
+from thoughtspot_tml import Liveboard, SpotApp, Worksheet, _scriptability
+from thoughtspot_tml.references import ReferenceIndex
+from thoughtspot_tml.utils import _recursive_scan
+import _fixtures
+
+
+def _scan(objects: List[Any], name: str) -> List[Any]:
+    is_identity = lambda x: isinstance(x, _scriptability.Identity)  # noqa: E731
+    return [tml.guid for tml in objects if any(i.name == name for i in _recursive_scan(tml, check=is_identity))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=2000, help="number of TML objects to index")
+    parser.add_argument("--questions", type=int, default=100, help="number of reverse-dependency queries")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    templates = [
+        Liveboard(**_fixtures.liveboard(5)).dumps(),
+        Worksheet(**_fixtures.worksheet(20)).dumps(),
+    ]
+    objects = []
+
+    for i in range(args.objects):
+        tml = (Liveboard, Worksheet)[i % 2].loads(templates[i % 2])
+        tml.guid = f"{i:08d}-0000-4000-8000-000000000000"
+        objects.append(tml)
+
+    names = ["dim_retapp_products", "(Sample) Retail - Apparel"] * (args.questions // 2)
+    spotapp = SpotApp(tml=objects)
+    index = ReferenceIndex.from_spotapp(spotapp)
+    worksheet = objects[1]
+
+    print(f"Reverse dependencies ({args.objects:,} objects, {len(names)} questions)")
+
+    cases = {
+        "scan per question": lambda: [_scan(objects, name) for name in names],
+        "build index": lambda: ReferenceIndex.from_spotapp(spotapp),
+        "query index": lambda: [index.referrers(name) for name in names],
+        "update one object": lambda: index.add(worksheet),
+    }
+
+    for label, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"  {label:<22} {best:8.4f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+"""
+Measure the memory held by a loaded estate of Liveboards and Worksheets.
+
+    python benchmarks/resident_memory.py --liveboards 1000 --worksheets 250
+"""
+
+from __future__ import annotations
+
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Callable, List
+import argparse
+import gc
+import pickle
+import tracemalloc
+
+from thoughtspot_tml import Liveboard, Worksheet, _reduction
+import _fixtures
+import betterproto
+
+
+def _retained(fn: Callable[[], Any]) -> Any:
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--liveboards", type=int, default=1000, help="number of Liveboards in the estate")
+    parser.add_argument("--worksheets", type=int, default=250, help="number of Worksheets in the estate")
+    args = parser.parse_args()
+
+    documents = [
+        *[(Liveboard, Liveboard(**_fixtures.liveboard(10)).dumps())] * args.liveboards,
+        *[(Worksheet, Worksheet(**_fixtures.worksheet(50)).dumps())] * args.worksheets,
+    ]
+
+    estate: List[Any]
+    estate, loaded = _retained(lambda: [tml_cls.loads(document) for tml_cls, document in documents])
+    n_messages = sum(isinstance(o, betterproto.Message) for o in gc.get_objects())
+
+    def dump_all() -> None:
+        for tml in estate:
+            tml.dumps()
+
+    # serializing reads every message's __dict__, which CPython may then keep around
+    _, dumped = _retained(dump_all)
+
+    # the bulk loader and ParseCache rebuild objects from their pickled state
+    _reduction.register()
+    pickled = bytes(ForkingPickler.dumps(estate, protocol=pickle.HIGHEST_PROTOCOL))
+    _, restored = _retained(lambda: pickle.loads(pickled))
+
+    print(f"Estate ({args.liveboards:,} Liveboards, {args.worksheets:,} Worksheets, {n_messages:,} messages)")
+    print(f"  after loads   {loaded / 1024 / 1024:8.1f}MB  {loaded / n_messages:6.0f}B per message")
+    print(f"  after dumps  +{dumped / 1024 / 1024:8.1f}MB")
+    print(f"  unpickled     {restored / 1024 / 1024:8.1f}MB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""
+Compare fully loading each TML file against scanning only its header.
+
+    python benchmarks/scan_headers.py --files 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import tempfile
+import timeit
+
+from thoughtspot_tml import Liveboard, Worksheet
+from thoughtspot_tml.utils import determine_tml_type, scan_headers
+import _fixtures
+
+
+def _load_all(directory: pathlib.Path) -> None:
+    for path in sorted(directory.iterdir()):
+        tml = determine_tml_type(path=path).load(path)
+        _ = tml.guid, tml.name
+
+
+def _scan_all(directory: pathlib.Path) -> None:
+    for header in scan_headers(directory):
+        _ = header.guid, header.name
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200, help="number of TML files of each type")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = pathlib.Path(tmp)
+        liveboard = Liveboard(**_fixtures.liveboard(50)).dumps()
+        worksheet = Worksheet(**_fixtures.worksheet(200)).dumps()
+
+        for i in range(args.files):
+            directory.joinpath(f"{i}.liveboard.tml").write_text(liveboard, encoding="utf-8")
+            directory.joinpath(f"{i}.worksheet.tml").write_text(worksheet, encoding="utf-8")
+
+        print(f"Directory ({args.files * 2} files)")
+
+        for label, fn in (("load", _load_all), ("scan_headers", _scan_all)):
+            best = min(timeit.repeat(lambda fn=fn: fn(directory), number=1, repeat=args.repeat))
+            print(f"  {label:<22} {best:8.3f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+"""
+Compare the ways of reading a large SpotApp archive.
+
+    python benchmarks/spotapp_read.py --members 5000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import tempfile
+import timeit
+import zipfile
+
+from thoughtspot_tml import SpotApp, Table
+import _fixtures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=5000, help="number of TML in the archive")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="size of the worker pool")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N runs")
+    args = parser.parse_args()
+
+    table = Table.load(_fixtures.DATA_DIR / "DUMMY.table.tml")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "spot_app.zip"
+
+        with zipfile.ZipFile(path, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for i in range(args.members):
+                table.table.name = f"table_{i}"
+                archive.writestr(f"table_{i}.table.tml", table.dumps())
+
+        print(f"SpotApp ({args.members} members, {path.stat().st_size / 1e6:.1f}MB)")
+
+        cases = {
+            "eager": lambda: SpotApp.read(path),
+            f"eager, {args.workers} workers": lambda: SpotApp.read(path, workers=args.workers),
+            "lazy, open": lambda: SpotApp.read(path, lazy=True),
+            "lazy, open + 1 TML": lambda: SpotApp.read(path, lazy=True).tml[-1],
+        }
+
+        for label, fn in cases.items():
+            best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+            print(f"  {label:<22} {best:8.3f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+"""
+Compare the peak memory of writing a large SpotApp all at once, against streaming it.
+
+    python benchmarks/spotapp_write.py --members 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+from thoughtspot_tml import SpotApp, SpotAppWriter, Table
+import _fixtures
+
+
+def _tables(n: int):
+    template = _fixtures.DATA_DIR / "DUMMY.table.tml"
+
+    for i in range(n):
+        table = Table.load(template)
+        table.guid = None
+        table.table.name = f"table_{i}"
+        yield table
+
+
+def _measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<22} {elapsed:8.3f}s {peak / 1e6:10.1f}MB peak")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=5000, help="number of TML in the archive")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"SpotApp ({args.members} members)")
+
+        def save() -> None:
+            spotapp = SpotApp(tml=list(_tables(args.members)))
+            spotapp.save(pathlib.Path(tmp, "saved.zip"), compression="deflate", manifest=True)
+
+        def stream() -> None:
+            with SpotAppWriter(pathlib.Path(tmp, "streamed.zip")) as writer:
+                for table in _tables(args.members):
+                    writer.write(table)
+
+        _measure("SpotApp.save", save)
+        _measure("SpotAppWriter", stream)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
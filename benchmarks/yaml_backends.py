@@ -0,0 +1,63 @@
+"""
+Compare the libyaml and pure-python YAML backends on the test fixtures, scaled up.
+
+    python benchmarks/yaml_backends.py --scale 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import timeit
+
+from thoughtspot_tml import _yaml
+import yaml
+
+HERE = pathlib.Path(__file__).parent
+DATA_DIR = HERE.parent / "tests" / "data"
+
+
+class PurePythonLoader(yaml.SafeLoader):
+    yaml_implicit_resolvers = _yaml._IMPLICIT_RESOLVERS
+
+
+def _dump_pure_python(document):
+    return yaml.dump(
+        document,
+        Dumper=_yaml._PurePythonTMLDumper,
+        width=_yaml.INFINITY,
+        default_flow_style=False,
+        sort_keys=False,
+        allow_unicode=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=25, help="copies of each fixture (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions (default: %(default)s)")
+    args = parser.parse_args()
+
+    fixtures = [p for p in sorted(DATA_DIR.glob("*.tml")) if not p.name.startswith("BAD_")]
+    texts = [p.read_text(encoding="utf-8") for p in fixtures] * args.scale
+    documents = [_yaml.load(text) for text in texts]
+
+    print(f"active backend: {_yaml.BACKEND}")
+    print(f"corpus size: {sum(map(len, texts)) / 1024 / 1024:.2f} MB ({len(fixtures)} fixtures x {args.scale})")
+
+    cases = {
+        "load (libyaml)": lambda: [_yaml.load(text) for text in texts],
+        "load (python)": lambda: [yaml.load(text, Loader=PurePythonLoader) for text in texts],
+        "dump (libyaml)": lambda: [_yaml.dump(document) for document in documents],
+        "dump (python)": lambda: [_dump_pure_python(document) for document in documents],
+    }
+
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"{name:<16} {best:8.3f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -28,17 +28,18 @@ def parse_tml_file(filename, directory=None):
         else:
             file_path = directory + "/" + filename
 
-        tml_cls = determine_tml_type(path=file_path)
         try:
-            tml_obj = tml_cls.load(path=file_path)
+            # Only the guid and name are needed, so there's no need to load the whole file
+            header = scan_header(path=file_path)
 
-            guid = tml_obj.guid
-            content_name = tml_obj.name
+            guid = header.guid
+            content_name = header.name
 
-            # You could get additional details here from tml_obj and then print them:
+            # You could load the full TML object for additional details and then print them:
+            # tml_obj = header.tml_cls.load(path=file_path)
 
             output_lines.append("{} | {} | {}".format(filename, content_name, guid))
-        except TMLDecodeError as e:
+        except TMLError as e:
 
             print("Skipping {} due to error:".format(file_path))
             print(e)
@@ -3,7 +3,7 @@ from thoughtspot_tml._version import __version__
 from thoughtspot_tml.tml import Connection
 from thoughtspot_tml.tml import Table, View, SQLView, Worksheet
 from thoughtspot_tml.tml import Answer, Liveboard, Pinboard
-from thoughtspot_tml.spotapp import SpotApp
+from thoughtspot_tml.spotapp import SpotApp, SpotAppWriter
 
 # aliases
 from thoughtspot_tml.tml import Connection as EmbraceConnection
@@ -23,6 +23,7 @@ __all__ = (
     "Liveboard",
     "Pinboard",
     "SpotApp",
+    "SpotAppWriter",
     "EmbraceConnection",
     "ThoughtSpotView",
     "SavedAnswer",
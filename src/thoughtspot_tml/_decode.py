@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+import betterproto
+
+from thoughtspot_tml import _schema
+from thoughtspot_tml._schema import FieldKind
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type
+
+    Decoder = Callable[[Dict[str, Any]], Any]
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# DEV NOTE:
+#   The historical decoder constructed each betterproto.Message from its raw dict, then
+#   walked every field with getattr() to replace nested dicts with their dataclasses. Both
+#   the Message constructor and getattr() are expensive on betterproto classes, and the
+#   walk re-discovered the type of each field on every object.
+#
+#   These decoders are compiled once per class from the _schema and build the object graph
+#   bottom-up in a single pass. The resulting objects are indistinguishable from ones built
+#   the historical way, including betterproto's private bookkeeping attributes.
+#
+#   Fields are read from the document by their TML key, so python reserved words which
+#   python-betterproto renamed (eg. `with` -> `with_`) are mapped back at any depth. The
+#   python spelling is accepted too, documents written by older versions may use it.
+#
+#   A loaded estate holds millions of small messages, so their memory layout matters.
+#   betterproto keeps all of a message's state in its instance __dict__, which rules out
+#   __slots__. Instead, attributes are set one at a time in the order the betterproto
+#   constructor sets them. Every instance of a class then shares a single copy of its
+#   dict keys (PEP 412), and only stores its own values.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_DECODERS: Dict[type, Decoder] = {}
+_BETTERPROTO_STATE = frozenset(("_serialized_on_wire", "_unknown_fields", "_group_current"))
+_PLACEHOLDER = betterproto.PLACEHOLDER
+_new_object = object.__new__
+_get_object_attr = object.__getattribute__
+_set_object_attr = object.__setattr__
+_STATE_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+# Messages without a oneof never write to their _group_current, so they all share one. It's
+# read-only, should betterproto ever try to write to it.
+_NO_GROUPS: Mapping[str, Optional[str]] = MappingProxyType({})
+
+
+def _raise_unexpected_keyword(cls: type, data: Dict[str, Any], known: frozenset) -> None:
+    # Mirror the dataclass __init__ error, it's how TMLDecodeError learns about bad input.
+    for key in data:
+        if not isinstance(key, str):
+            raise TypeError("keywords must be strings")
+
+        if key not in known:
+            raise TypeError(f"{cls.__qualname__}.__init__() got an unexpected keyword argument '{key}'")
+
+
+def _can_assemble_directly(schema: _schema.ClassSchema) -> bool:
+    """
+    Determine if we can skip the betterproto constructor for this message.
+
+    Oneofs and custom __post_init__ hooks (eg. deprecation warnings) need the real thing.
+    We also guard against betterproto changing its private state between versions.
+    """
+    if schema.has_oneof or schema.has_custom_post_init:
+        return False
+
+    try:
+        probe = schema.cls()
+    except Exception:  # pragma: no cover
+        return False
+
+    return set(vars(probe)) == {*schema.field_names, *_BETTERPROTO_STATE}
+
+
+def _decode_list(items: Any, item_cls: Optional[type]) -> List[Any]:
+    if item_cls is None:
+        return list(items)
+
+    decoded = []
+    decode_item = decoder_for(item_cls)
+
+    for item in items:
+        if isinstance(item, dict):
+            item = decode_item(item)
+        else:
+            convert_fields(item)
+
+        decoded.append(item)
+
+    return decoded
+
+
+def _compile(cls: Type[Any]) -> Decoder:
+    schema = _schema.schema_of(cls)
+    known = schema.field_keys | schema.field_names
+    assemble_directly = _can_assemble_directly(schema)
+
+    # fmt: off
+    steps = tuple(
+        (
+            field.name,
+            field.key,
+            # python reserved words may also appear under their python-betterproto name
+            field.name if field.name != field.key else None,
+            field.kind,
+            field.type,
+            field.default,
+            field.default_factory,
+            field.optional,
+            # betterproto flags empty messages as "on the wire" when assigned to a parent
+            field.type is not None and field.kind is FieldKind.MESSAGE and not _schema.schema_of(field.type).fields,
+        )
+        for field in schema.fields
+    )
+    # fmt: on
+
+    def decode(data: Dict[str, Any]) -> Any:
+        if not known.issuperset(data):
+            _raise_unexpected_keyword(cls, data, known)
+
+        values = {}
+        on_wire = False
+
+        for name, key, alias, kind, item_cls, default, default_factory, optional, is_empty_message in steps:
+            value = data.get(key, default)
+
+            if alias is not None and key not in data:
+                value = data.get(alias, default)
+
+            if value is _PLACEHOLDER:
+                value = default_factory()  # type: ignore[misc]
+            elif not (optional and value is None):
+                on_wire = True
+
+            if value is None:
+                pass
+
+            elif kind is FieldKind.MESSAGE:
+                if isinstance(value, dict):
+                    value = decoder_for(item_cls)(value)  # type: ignore[arg-type]
+
+                if is_empty_message and isinstance(value, betterproto.Message):
+                    value.__dict__["_serialized_on_wire"] = True
+
+            elif kind is FieldKind.LIST:
+                value = _decode_list(value, item_cls)
+                on_wire = True
+
+            # python-betterproto doesn't support optional map_fields
+            elif kind is FieldKind.MAP and value == {}:
+                value = None
+                on_wire = True
+
+            values[name] = value
+
+        if not assemble_directly:
+            return cls(**values)
+
+        instance = _new_object(cls)
+        _set_object_attr(instance, "_serialized_on_wire", on_wire)
+
+        for name, value in values.items():
+            _set_object_attr(instance, name, value)
+
+        _set_object_attr(instance, "_unknown_fields", b"")
+        _set_object_attr(instance, "_group_current", _NO_GROUPS)
+        return instance
+
+    return decode
+
+
+def decoder_for(cls: Type[Any]) -> Decoder:
+    """
+    Fetch the compiled decoder for a _scriptability dataclass.
+
+    The decoder accepts the parsed YAML/JSON mapping and returns the fully built object.
+    """
+    try:
+        return _DECODERS[cls]
+    except KeyError:
+        decoder = _DECODERS[cls] = _compile(cls)
+        return decoder
+
+
+def state_of(instance: Any) -> Dict[str, Any]:
+    """
+    Copy the instance __dict__ of a message.
+
+    Reading __dict__ makes CPython build a real dict for an instance which shares its keys,
+    and then keep it around. The attributes are read one at a time instead.
+
+    The oneof bookkeeping is copied into a plain dict, so the state can be pickled and never
+    aliases the original.
+    """
+    cls = type(instance)
+
+    try:
+        names = _STATE_NAMES[cls]
+    except KeyError:
+        field_names = [field.name for field in _schema.schema_of(cls).fields]
+        names = _STATE_NAMES[cls] = ("_serialized_on_wire", *field_names, "_unknown_fields", "_group_current")
+
+    state = {name: _get_object_attr(instance, name) for name in names}
+    state["_group_current"] = dict(state["_group_current"])
+    return state
+
+
+def assemble(cls: Type[Any], state: Dict[str, Any]) -> Any:
+    """
+    Build a message from a copy of its instance __dict__, without calling its constructor.
+    """
+    instance = _new_object(cls)
+    has_oneof = _schema.schema_of(cls).has_oneof
+
+    for name, value in state.items():
+        if name == "_group_current":
+            value = _NO_GROUPS if not has_oneof else dict(value)
+
+        _set_object_attr(instance, name, value)
+
+    return instance
+
+
+def decode_field(field: _schema.FieldSchema, value: Any) -> Any:
+    """
+    Convert the raw value of a single message or list field into its dataclasses.
+    """
+    if value is None:
+        return value
+
+    if field.kind is FieldKind.MESSAGE and isinstance(value, dict):
+        value = decoder_for(field.type)(value)  # type: ignore[arg-type]
+
+        # betterproto flags empty messages as "on the wire" when assigned to a parent
+        if not _schema.schema_of(field.type).fields:  # type: ignore[arg-type]
+            value.__dict__["_serialized_on_wire"] = True
+
+    elif field.kind is FieldKind.LIST:
+        value = _decode_list(value, field.type)
+
+    return value
+
+
+def convert_fields(instance: Any) -> None:
+    """
+    Convert all dict-valued fields of a dataclass instance into their dataclasses.
+
+    This is used on the top-level TML objects, and any objects a user has built by hand.
+    """
+    schema = _schema.schema_of(type(instance))
+
+    for field in schema.fields:
+        try:
+            value = getattr(instance, field.name)
+        except AttributeError:
+            # an unselected oneof field
+            continue
+
+        # ignore nulls, they get dropped to support optionality
+        if value is None:
+            continue
+
+        if field.kind is FieldKind.MESSAGE and isinstance(value, dict):
+            new_value = decoder_for(field.type)(value)  # type: ignore[arg-type]
+
+        elif field.kind is FieldKind.LIST:
+            new_value = _decode_list(value, field.type)
+
+        # it's an empty mapping, python-betterproto doesn't support optional map_fields
+        elif field.kind is FieldKind.MAP and value == {}:
+            new_value = None
+
+        else:  # pragma: peephole optimizer
+            continue
+
+        setattr(instance, field.name, new_value)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from dataclasses import is_dataclass
+from typing import TYPE_CHECKING
+
+import betterproto
+
+from thoughtspot_tml import _lazy, _schema
+from thoughtspot_tml._schema import FieldKind
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Type
+
+    Encoder = Callable[[Any, bool], Dict[str, Any]]
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# DEV NOTE:
+#   Serialization used to be dataclasses.asdict() followed by a second walk to drop all
+#   the empty values. asdict() deep-copies the whole tree and calls betterproto's
+#   expensive __getattribute__ for every field, only for most of the result to be thrown
+#   away by the second walk.
+#
+#   These encoders are compiled once per class from the _schema and emit the native python
+#   representation in a single pass, skipping empty values as they go when asked to. Fields
+#   which python-betterproto renamed to avoid a reserved word are emitted under their TML key.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_ENCODERS: Dict[type, Encoder] = {}
+_ATOMIC_TYPES = frozenset((str, bool, int, float))
+_PLACEHOLDER = betterproto.PLACEHOLDER
+_object_getattribute = object.__getattribute__
+
+# EXCEPTION:
+# - don't remove connection.yaml empty password
+# - historical client_state attribute
+_KEEP_EMPTY_STRING = frozenset(("value", "client_state"))
+
+
+def _is_empty(value: Any) -> bool:
+    """Determine if a value is any form of EMPTY."""
+    if value is None or value == "":
+        return True
+
+    return isinstance(value, Collection) and not isinstance(value, str) and not value
+
+
+def _encode_dict(mapping: Dict[Any, Any], drop_empty: bool) -> Dict[Any, Any]:
+    data = {}
+
+    for key, value in mapping.items():
+        value = encode_value(value, drop_empty=drop_empty)
+
+        if drop_empty and not (key in _KEEP_EMPTY_STRING and value == "") and _is_empty(value):
+            continue
+
+        data[key] = value
+
+    return data
+
+
+def _encode_list(items: List[Any], item_cls: Optional[type], drop_empty: bool) -> List[Any]:
+    data = []
+    encode_item = None if item_cls is None else encoder_for(item_cls)
+
+    for item in items:
+        if drop_empty and item is None:
+            continue
+
+        if encode_item is not None and type(item) is item_cls:
+            item = encode_item(item, drop_empty)
+
+        elif type(item) not in _ATOMIC_TYPES:
+            # Only mappings are cleaned up when they're nested within a list.
+            item = encode_value(item, drop_empty=drop_empty and (isinstance(item, dict) or is_dataclass(item)))
+
+        data.append(item)
+
+    return data
+
+
+def _compile(cls: Type[Any]) -> Encoder:
+    schema = _schema.schema_of(cls)
+    is_message = schema.is_message
+
+    # fmt: off
+    steps = tuple(
+        (field.name, field.key, field.kind, field.type, field.default_factory, field.name in _KEEP_EMPTY_STRING)
+        for field in schema.fields
+    )
+    # fmt: on
+
+    def encode(instance: Any, drop_empty: bool) -> Dict[str, Any]:
+        # read betterproto's storage directly, __getattribute__ is expensive
+        read = _object_getattribute if is_message else getattr
+        data: Dict[str, Any] = {}
+
+        for name, key, kind, item_cls, default_factory, keep_empty_string in steps:
+            value = read(instance, name)
+
+            if value is _PLACEHOLDER:
+                value = default_factory()  # type: ignore[misc]
+
+            if value is None:
+                if not drop_empty:
+                    data[key] = None
+                continue
+
+            value_type = type(value)
+
+            if value_type in _ATOMIC_TYPES:
+                if drop_empty and value == "" and not keep_empty_string:
+                    continue
+
+                data[key] = value
+                continue
+
+            if kind is FieldKind.MESSAGE and value_type is item_cls:
+                value = encoder_for(value_type)(value, drop_empty)
+
+            elif kind is FieldKind.LIST and value_type is list:
+                value = _encode_list(value, item_cls, drop_empty)
+
+            else:
+                value = encode_value(value, drop_empty=drop_empty)
+
+            if drop_empty and not (keep_empty_string and value == "") and _is_empty(value):
+                continue
+
+            data[key] = value
+
+        return data
+
+    if _lazy.is_lazy_class(cls):
+
+        def encode_lazy(instance: Any, drop_empty: bool) -> Dict[str, Any]:
+            # untouched sub-trees are still raw TML, they only need converting to emit the empties
+            if not drop_empty:
+                _lazy.materialize(instance)
+
+            return encode(instance, drop_empty)
+
+        return encode_lazy
+
+    return encode
+
+
+def encoder_for(cls: Type[Any]) -> Encoder:
+    """
+    Fetch the compiled encoder for a TML or _scriptability dataclass.
+
+    The encoder accepts an instance and a flag to drop empty values, and returns a dict.
+    """
+    try:
+        return _ENCODERS[cls]
+    except KeyError:
+        encoder = _ENCODERS[cls] = _compile(cls)
+        return encoder
+
+
+def encode_value(value: Any, *, drop_empty: bool = False) -> Any:
+    """
+    Convert a value into native python data types.
+
+    This is equivalent to dataclasses.asdict(), but optionally drops all keys with empty
+    values from every mapping it emits, they're optional.
+    """
+    if type(value) in _ATOMIC_TYPES or value is None:
+        return value
+
+    if is_dataclass(value) and not isinstance(value, type):
+        return encoder_for(type(value))(value, drop_empty)
+
+    if isinstance(value, list):
+        items = _encode_list(value, None, drop_empty)
+        return items if type(value) is list else type(value)(items)
+
+    if isinstance(value, dict):
+        return _encode_dict(value, drop_empty)
+
+    if isinstance(value, tuple):
+        return type(value)(encode_value(item) for item in value)
+
+    return value
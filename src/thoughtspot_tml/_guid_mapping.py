@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import mmap
+import pathlib
+import re
+import struct
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterator, List, Optional, Tuple
+
+    from thoughtspot_tml.types import GUID
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# DEV NOTE:
+#   The binary mapping file stores each guid as its 16 raw UUID bytes, laid out so that it
+#   can be memory-mapped and searched without parsing the whole file. All integers are
+#   unsigned 32-bit little-endian.
+#
+#     HEADER        magic, version, number of environments (E), number of entries (N)
+#     ENVIRONMENTS  E x (byte length, UTF-8 name)
+#     GUIDS         N x E x 16 bytes, the guid of each entry in each environment
+#     ORDER         N x E x 1 byte, the environment indices of each entry in mapping order
+#     INDEX         E x (count, count x 16 bytes of sorted guids, count x entry number)
+#
+#   A missing guid is stored as 16 zero bytes, and unused ORDER slots hold 0xFF.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+MAGIC = b"TMLGUIDS"
+VERSION = 1
+_HEADER = struct.Struct("<8sIII")
+_U32 = struct.Struct("<I")
+_GUID_SIZE = 16
+_MISSING = bytes(_GUID_SIZE)
+_NIL_GUID = "00000000-0000-0000-0000-000000000000"
+_UNUSED = 0xFF
+_CANONICAL_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def is_binary_mapping(path: pathlib.Path) -> bool:
+    """Determine if a file holds a binary guid mapping."""
+    with pathlib.Path(path).open(mode="rb") as stream:
+        return stream.read(len(MAGIC)) == MAGIC
+
+
+def _guid_to_bytes(guid: GUID) -> bytes:
+    # only canonical guids survive the round trip to bytes and back unchanged
+    if not isinstance(guid, str) or not _CANONICAL_UUID.fullmatch(guid) or guid == _NIL_GUID:
+        raise ValueError(f"the binary mapping format only supports lowercase, hyphenated UUIDs, got '{guid}'")
+
+    return bytes.fromhex(guid.replace("-", ""))
+
+
+def _hex_to_guid(h: str) -> GUID:
+    return f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+
+
+def write(mapping: Dict[str, Dict[str, GUID]], path: pathlib.Path) -> None:
+    """
+    Write a guid mapping to file in the binary format.
+
+    Raises
+    ------
+    ValueError, when a guid is not a UUID or there are too many environments
+    """
+    environments: Dict[str, int] = {}
+
+    for envts in mapping.values():
+        for environment in envts:
+            environments.setdefault(environment, len(environments))
+
+    n_envts = len(environments)
+    n_entries = len(mapping)
+
+    if n_envts >= _UNUSED:
+        raise ValueError(f"the binary mapping format supports at most {_UNUSED - 1} environments, got {n_envts}")
+
+    guids = bytearray(n_entries * n_envts * _GUID_SIZE)
+    order = bytearray([_UNUSED]) * (n_entries * n_envts)
+    index: List[List[Tuple[bytes, int]]] = [[] for _ in environments]
+
+    for entry, envts in enumerate(mapping.values()):
+        for position, (environment, guid) in enumerate(envts.items()):
+            column = environments[environment]
+            data = _guid_to_bytes(guid)
+            offset = (entry * n_envts + column) * _GUID_SIZE
+            guids[offset : offset + _GUID_SIZE] = data
+            order[entry * n_envts + position] = column
+            index[column].append((data, entry))
+
+    with pathlib.Path(path).open(mode="wb") as stream:
+        stream.write(_HEADER.pack(MAGIC, VERSION, n_envts, n_entries))
+
+        for environment in environments:
+            name = environment.encode("utf-8")
+            stream.write(_U32.pack(len(name)))
+            stream.write(name)
+
+        stream.write(guids)
+        stream.write(order)
+
+        for rows in index:
+            # ties sort by entry, so the first entry which holds a guid is found first
+            rows.sort()
+            stream.write(_U32.pack(len(rows)))
+            stream.write(b"".join(data for data, _ in rows))
+            stream.write(struct.pack(f"<{len(rows)}I", *(entry for _, entry in rows)))
+
+
+class MappedFile:
+    """
+    A read-only view of a binary guid mapping file.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+
+        with self.path.open(mode="rb") as stream:
+            self._mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._parse_layout()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _parse_layout(self) -> None:
+        buffer = self._mmap
+
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f"'{self.path}' is not a binary guid mapping file")
+
+        magic, version, n_envts, n_entries = _HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"'{self.path}' is not a binary guid mapping file")
+
+        if version != VERSION:
+            raise ValueError(f"'{self.path}' is binary guid mapping version {version}, expected {VERSION}")
+
+        offset = _HEADER.size
+        self.environments: List[str] = []
+
+        for _ in range(n_envts):
+            (length,) = _U32.unpack_from(buffer, offset)
+            offset += _U32.size
+            self.environments.append(bytes(buffer[offset : offset + length]).decode("utf-8"))
+            offset += length
+
+        self.n_envts = n_envts
+        self.n_entries = n_entries
+        self._guids_offset = offset
+        self._order_offset = offset + n_entries * n_envts * _GUID_SIZE
+        offset = self._order_offset + n_entries * n_envts
+
+        # (count, offset of the sorted guids, offset of their entry numbers), per environment
+        self._index: List[Tuple[int, int, int]] = []
+
+        for _ in range(n_envts):
+            (count,) = _U32.unpack_from(buffer, offset)
+            offset += _U32.size
+            self._index.append((count, offset, offset + count * _GUID_SIZE))
+            offset += count * (_GUID_SIZE + _U32.size)
+
+        if offset != len(buffer):
+            raise ValueError(f"'{self.path}' is a truncated or corrupt binary guid mapping file")
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def _search(self, column: int, data: bytes) -> Optional[int]:
+        count, guids_offset, entries_offset = self._index[column]
+        buffer = self._mmap
+        lo, hi = 0, count
+
+        # bisect_left over the sorted guids, without copying them out of the file
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = guids_offset + mid * _GUID_SIZE
+
+            if buffer[start : start + _GUID_SIZE] < data:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        start = guids_offset + lo * _GUID_SIZE
+
+        if lo == count or buffer[start : start + _GUID_SIZE] != data:
+            return None
+
+        (entry,) = _U32.unpack_from(buffer, entries_offset + lo * _U32.size)
+        return entry
+
+    def find(self, guid: GUID) -> Optional[int]:
+        """Find the first entry which holds a guid, in any environment."""
+        try:
+            data = _guid_to_bytes(guid)
+        except ValueError:
+            return None
+
+        entries = (self._search(column, data) for column in range(self.n_envts))
+        return min((entry for entry in entries if entry is not None), default=None)
+
+    def guid_at(self, entry: int, column: int) -> Optional[GUID]:
+        start = self._guids_offset + (entry * self.n_envts + column) * _GUID_SIZE
+        data = self._mmap[start : start + _GUID_SIZE]
+        return None if data == _MISSING else _hex_to_guid(data.hex())
+
+    def _entry(self, envts_hex: str, order: bytes) -> Dict[str, GUID]:
+        envts = {}
+
+        for column in order:
+            if column == _UNUSED:
+                break
+
+            envts[self.environments[column]] = _hex_to_guid(envts_hex[column * 32 : column * 32 + 32])
+
+        return envts
+
+    def entry(self, entry: int) -> Dict[str, GUID]:
+        """Fetch the environments and guids of an entry, in mapping order."""
+        start = self._guids_offset + entry * self.n_envts * _GUID_SIZE
+        envts_hex = self._mmap[start : start + self.n_envts * _GUID_SIZE].hex()
+        start = self._order_offset + entry * self.n_envts
+        return self._entry(envts_hex, self._mmap[start : start + self.n_envts])
+
+    def entries(self) -> Iterator[Dict[str, GUID]]:
+        """Iterate over every entry, in mapping order."""
+        row_size = self.n_envts * _GUID_SIZE
+
+        for entry in range(self.n_entries):
+            start = self._guids_offset + entry * row_size
+            order_start = self._order_offset + entry * self.n_envts
+            envts_hex = self._mmap[start : start + row_size].hex()
+            yield self._entry(envts_hex, self._mmap[order_start : order_start + self.n_envts])
+
+    def _column_guids(self, column: Optional[int]) -> Iterator[Optional[GUID]]:
+        if column is None:
+            yield from (None for _ in range(self.n_entries))
+            return
+
+        row_size = self.n_envts * _GUID_SIZE
+        start = self._guids_offset + column * _GUID_SIZE
+        buffer = self._mmap
+
+        for offset in range(start, start + self.n_entries * row_size, row_size):
+            data = buffer[offset : offset + _GUID_SIZE]
+            yield None if data == _MISSING else _hex_to_guid(data.hex())
+
+    def pairs(
+        self,
+        from_column: Optional[int],
+        to_column: Optional[int],
+    ) -> Iterator[Tuple[Optional[GUID], Optional[GUID]]]:
+        """Iterate over the guids of every entry in two environments."""
+        return zip(self._column_guids(from_column), self._column_guids(to_column))
+
+    def column(self, environment: str) -> Optional[int]:
+        try:
+            return self.environments.index(environment)
+        except ValueError:
+            return None
+
+
+def read(path: pathlib.Path) -> Dict[str, Dict[str, GUID]]:
+    """Read a binary guid mapping file into the JSON mapping structure."""
+    mapped = MappedFile(path)
+
+    try:
+        return {"__".join(envts.values()): envts for envts in mapped.entries()}
+    finally:
+        mapped.close()
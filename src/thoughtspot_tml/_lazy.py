@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import betterproto
+
+from thoughtspot_tml import _decode, _schema
+from thoughtspot_tml._schema import FieldKind
+from thoughtspot_tml.exceptions import TMLDecodeError
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Set, Type
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# DEV NOTE:
+#   A lazily loaded edoc (eg. the `liveboard` of a Liveboard) decodes its basic fields up
+#   front, but keeps each nested message and list of messages as the raw TML it was parsed
+#   from. The raw sub-tree is converted the first time its attribute is read.
+#
+#   To intercept attribute access without altering the generated classes, the edoc is an
+#   instance of a thin subclass which overrides __getattribute__. Once every deferred field
+#   has been converted, the instance is switched back to the real _scriptability class.
+#
+#   Untouched sub-trees are already valid TML, so dumps() emits them as-is.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_LAZY_CLASSES: Dict[type, type] = {}
+_LAZY_BASES: Dict[type, type] = {}
+_DEFERRED = "_lazy_deferred_fields"
+_message_getattribute = betterproto.Message.__getattribute__
+_message_setattr = betterproto.Message.__setattr__
+
+# Attributes which betterproto reads on itself, these never cause a sub-tree to convert.
+_BOOKKEEPING = frozenset(
+    (
+        "__class__",
+        "__dict__",
+        "_betterproto",
+        "_betterproto_meta",
+        "_serialized_on_wire",
+        "_unknown_fields",
+        "_group_current",
+        "_get_field_default",
+    ),
+)
+
+
+def _materialize_field(instance: Any, state: Dict[str, Any], deferred: Set[str], name: str) -> None:
+    lazy_cls = type(instance)
+    field = lazy_cls._lazy_fields[name]
+
+    try:
+        state[name] = _decode.decode_field(field, state[name])
+    except TypeError as e:
+        raise TMLDecodeError(lazy_cls._lazy_base, message=str(e)) from None
+
+    deferred.discard(name)
+
+    if not deferred:
+        del state[_DEFERRED]
+        object.__setattr__(instance, "__class__", lazy_cls._lazy_base)
+
+
+def materialize(instance: Any) -> None:
+    """
+    Convert all the remaining raw sub-trees of a lazily loaded object.
+
+    This is a no-op for fully loaded objects.
+    """
+    state = object.__getattribute__(instance, "__dict__")
+
+    for name in list(state.get(_DEFERRED, ())):
+        _materialize_field(instance, state, state[_DEFERRED], name)
+
+
+def is_lazy(instance: Any) -> bool:
+    """Determine if an object still holds any raw sub-trees."""
+    return type(instance) in _LAZY_BASES
+
+
+def is_lazy_class(cls: type) -> bool:
+    """Determine if a class is the lazy variant of a _scriptability message."""
+    return cls in _LAZY_BASES
+
+
+def base_class(cls: type) -> type:
+    """Fetch the _scriptability message class, for either it or its lazy variant."""
+    return _LAZY_BASES.get(cls, cls)
+
+
+def _getattribute(self: Any, name: str) -> Any:
+    state = object.__getattribute__(self, "__dict__")
+    deferred = state.get(_DEFERRED)
+
+    if deferred:
+        if name in deferred:
+            _materialize_field(self, state, deferred, name)
+
+        # any method may read the whole message (eg. to_dict, SerializeToString)
+        elif name not in _BOOKKEEPING and name not in type(self)._lazy_fields:
+            materialize(self)
+
+    return _message_getattribute(self, name)
+
+
+def _setattr(self: Any, name: str, value: Any) -> None:
+    _message_setattr(self, name, value)
+
+    state = object.__getattribute__(self, "__dict__")
+    deferred = state.get(_DEFERRED)
+
+    # the user replaced a sub-tree without reading it
+    if deferred and name in deferred:
+        deferred.discard(name)
+
+        if not deferred:
+            del state[_DEFERRED]
+            object.__setattr__(self, "__class__", type(self)._lazy_base)
+
+
+def _materializing(method_name: str) -> Any:
+    def method(self: Any, *args: Any) -> Any:
+        materialize(self)
+        return getattr(self, method_name)(*args)
+
+    method.__name__ = method_name
+    return method
+
+
+# Implicit special method lookups bypass __getattribute__, so these must convert explicitly.
+_SPECIAL_METHODS = (
+    "__eq__",
+    "__repr__",
+    "__bool__",
+    "__bytes__",
+    "__len__",
+    "__copy__",
+    "__deepcopy__",
+    "__getstate__",
+    "__reduce__",
+)
+
+
+def lazy_class_for(cls: Type[Any]) -> type:
+    """
+    Fetch the lazy variant of a _scriptability message class.
+
+    The variant shares the name, fields, memory layout, and betterproto metadata of the
+    original. It's a direct subclass, so instances can switch between the two.
+    """
+    try:
+        return _LAZY_CLASSES[cls]
+    except KeyError:
+        pass
+
+    # betterproto builds its metadata from the module which defines the class, share it.
+    cls._betterproto  # noqa: B018
+
+    namespace = {
+        "__slots__": (),
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+        "__doc__": cls.__doc__,
+        "__getattribute__": _getattribute,
+        "__setattr__": _setattr,
+        "__hash__": None,
+        **{method_name: _materializing(method_name) for method_name in _SPECIAL_METHODS},
+        "_lazy_base": cls,
+        "_lazy_fields": _schema.schema_of(cls).field_by_name,
+    }
+
+    lazy_cls = _LAZY_CLASSES[cls] = type(cls.__name__, (cls,), namespace)
+    _LAZY_BASES[lazy_cls] = cls
+    return lazy_cls
+
+
+def _is_deferrable(field: _schema.FieldSchema) -> bool:
+    # oneof fields are tracked by betterproto as they're set, so they're always converted
+    return field.type is not None and field.kind in (FieldKind.MESSAGE, FieldKind.LIST) and field.group is None
+
+
+def decode(cls: Type[Any], data: Dict[str, Any]) -> Any:
+    """
+    Decode a message, deferring all its nested messages until they're accessed.
+    """
+    schema = _schema.schema_of(cls)
+    deferred = {field.name: data[field.key] for field in schema.fields if _is_deferrable(field) and data.get(field.key)}
+
+    if not deferred:
+        return _decode.decoder_for(cls)(data)
+
+    deferred_keys = {schema.field_by_name[name].key for name in deferred}
+    instance = _decode.decoder_for(cls)({k: v for k, v in data.items() if k not in deferred_keys})
+
+    state = instance.__dict__
+    state.update(deferred)
+    state["_serialized_on_wire"] = True
+    state[_DEFERRED] = set(deferred)
+    object.__setattr__(instance, "__class__", lazy_class_for(cls))
+    return instance
+
+
+def defer(tml_cls: Type[Any], document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Lazily decode the edoc(s) of a TML document, before it's passed to the TML class.
+    """
+    document = dict(document)
+
+    for field in _schema.schema_of(tml_cls).fields:
+        value = document.get(field.key)
+
+        if field.kind is FieldKind.MESSAGE and field.type is not None and isinstance(value, dict):
+            document[field.key] = decode(field.type, value)
+
+    return document
@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import struct
+
+import betterproto
+
+from thoughtspot_tml import _schema
+from thoughtspot_tml._schema import FieldKind
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+    Writer = Callable[[bytearray, Any], None]
+    Reader = Callable[[memoryview, int, int], Tuple[Any, int]]
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# DEV NOTE:
+#   betterproto can already produce the wire format with bytes(message), but it can't be
+#   used on TML as-is..
+#
+#     - enums are held as their TML names (eg. "NUMBER"), betterproto expects their value
+#     - repeated fields are generated with optional=True, so Message.parse() keeps only the
+#       last item of every list
+#     - lazily loaded objects hold their untouched sub-trees as raw TML
+#
+#   These codecs are compiled once per class from the _schema and the betterproto field
+#   metadata. Messages are decoded into the same native document that _yaml.load() would
+#   produce, so the TML object is then built by the regular decoders (lazily, if asked).
+#
+#   The TML classes themselves (eg. Worksheet) aren't messages, they're encoded as an
+#   envelope which numbers their fields in declaration order, `guid` is always field 1.
+#
+#   Like YAML, empty lists aren't written, proto3 can't tell them apart from a missing list.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_LENGTH_DELIMITED = 2
+_WIRE_FIXED32 = 5
+
+_UINT64_MASK = (1 << 64) - 1
+_PLACEHOLDER = betterproto.PLACEHOLDER
+_object_getattribute = object.__getattribute__
+_DOUBLE = struct.Struct("<d")
+
+_ENCODERS: Dict[type, Callable[[bytearray, Any], None]] = {}
+_DECODERS: Dict[type, Callable[[memoryview], Dict[str, Any]]] = {}
+
+
+class ProtobufDecodeError(ValueError):
+    """
+    Raised when bytes are not a valid protobuf encoding of a message.
+    """
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    value &= _UINT64_MASK
+
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    out.append(value)
+
+
+def _read_varint(data: memoryview, offset: int, end: int) -> Tuple[int, int]:
+    value = shift = 0
+
+    while True:
+        if offset >= end:
+            raise ProtobufDecodeError("truncated varint")
+
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+
+        if not byte & 0x80:
+            return value, offset
+
+        shift += 7
+
+        if shift >= 70:
+            raise ProtobufDecodeError("varint is too long")
+
+
+def _tag(number: int, wire_type: int) -> bytes:
+    out = bytearray()
+    _write_varint(out, number << 3 | wire_type)
+    return bytes(out)
+
+
+# ~~~ Scalars ~~~
+
+
+def _write_string(out: bytearray, value: str) -> None:
+    encoded = value.encode("utf-8")
+    _write_varint(out, len(encoded))
+    out += encoded
+
+
+def _write_int(out: bytearray, value: int) -> None:
+    _write_varint(out, int(value))
+
+
+def _write_double(out: bytearray, value: float) -> None:
+    out += _DOUBLE.pack(value)
+
+
+def _read_string(data: memoryview, offset: int, end: int) -> Tuple[str, int]:
+    # most lengths fit in a single byte
+    if offset < end and data[offset] < 0x80:
+        size, offset = data[offset], offset + 1
+    else:
+        size, offset = _read_varint(data, offset, end)
+
+    if offset + size > end:
+        raise ProtobufDecodeError("truncated string")
+
+    return str(data[offset : offset + size], "utf-8"), offset + size
+
+
+def _read_int(data: memoryview, offset: int, end: int) -> Tuple[int, int]:
+    value, offset = _read_varint(data, offset, end)
+    return value - (1 << 64) if value >> 63 else value, offset
+
+
+def _read_bool(data: memoryview, offset: int, end: int) -> Tuple[bool, int]:
+    value, offset = _read_varint(data, offset, end)
+    return bool(value), offset
+
+
+def _read_double(data: memoryview, offset: int, end: int) -> Tuple[float, int]:
+    if offset + 8 > end:
+        raise ProtobufDecodeError("truncated double")
+
+    return _DOUBLE.unpack_from(data, offset)[0], offset + 8
+
+
+# proto_type -> (wire type, writer, reader)
+_SCALARS: Dict[str, Tuple[int, Writer, Reader]] = {
+    betterproto.TYPE_STRING: (_WIRE_LENGTH_DELIMITED, _write_string, _read_string),
+    betterproto.TYPE_BOOL: (_WIRE_VARINT, _write_int, _read_bool),
+    betterproto.TYPE_INT32: (_WIRE_VARINT, _write_int, _read_int),
+    betterproto.TYPE_INT64: (_WIRE_VARINT, _write_int, _read_int),
+    betterproto.TYPE_DOUBLE: (_WIRE_FIXED64, _write_double, _read_double),
+}
+
+
+def _enum_codec(enum_cls: Type[betterproto.Enum]) -> Tuple[int, Writer, Reader]:
+    by_name = {member.name: member.value for member in enum_cls}
+    by_value = {member.value: member.name for member in enum_cls}
+
+    def write(out: bytearray, value: Any) -> None:
+        if isinstance(value, str):
+            try:
+                value = by_name[value]
+            except KeyError:
+                raise ValueError(f"'{value}' is not a valid {enum_cls.__name__}") from None
+
+        _write_varint(out, int(value))
+
+    def read(data: memoryview, offset: int, end: int) -> Tuple[Any, int]:
+        value, offset = _read_int(data, offset, end)
+        return by_value.get(value, value), offset
+
+    return _WIRE_VARINT, write, read
+
+
+def _message_codec(cls: Type[Any]) -> Tuple[int, Writer, Reader]:
+    def write(out: bytearray, value: Any) -> None:
+        body = bytearray()
+        encoder_for(cls)(body, value)
+        _write_varint(out, len(body))
+        out += body
+
+    def read(data: memoryview, offset: int, end: int) -> Tuple[Dict[str, Any], int]:
+        size, offset = _read_varint(data, offset, end)
+
+        if offset + size > end:
+            raise ProtobufDecodeError(f"truncated {cls.__name__}")
+
+        return decoder_for(cls)(data[offset : offset + size]), offset + size
+
+    return _WIRE_LENGTH_DELIMITED, write, read
+
+
+def _map_codec(cls: Type[Any], name: str, meta: betterproto.FieldMetadata) -> Tuple[int, Writer, Reader]:
+    key_type, value_type = meta.map_types  # type: ignore[misc]
+    _, write_key, read_key = _SCALARS[key_type]
+    key_tag = _tag(1, _SCALARS[key_type][0])
+
+    if value_type == betterproto.TYPE_MESSAGE:
+        value_cls = _schema.schema_of(cls).field_by_name[name].type
+        value_wire_type, write_value, read_value = _message_codec(value_cls)  # type: ignore[arg-type]
+    else:
+        value_wire_type, write_value, read_value = _SCALARS[value_type]
+
+    value_tag = _tag(2, value_wire_type)
+
+    def write(out: bytearray, entry: Tuple[Any, Any]) -> None:
+        body = bytearray(key_tag)
+        write_key(body, entry[0])
+        body += value_tag
+        write_value(body, entry[1])
+        _write_varint(out, len(body))
+        out += body
+
+    def read(data: memoryview, offset: int, end: int) -> Tuple[Tuple[Any, Any], int]:
+        size, offset = _read_varint(data, offset, end)
+        entry_end = offset + size
+        key = value = None
+
+        if entry_end > end:
+            raise ProtobufDecodeError(f"truncated {name} entry")
+
+        while offset < entry_end:
+            tag, offset = _read_varint(data, offset, entry_end)
+
+            if tag >> 3 == 1:
+                key, offset = read_key(data, offset, entry_end)
+            elif tag >> 3 == 2:
+                value, offset = read_value(data, offset, entry_end)
+            else:
+                offset = _skip(data, offset, entry_end, tag & 0x7)
+
+        return (key, value), entry_end
+
+    return _WIRE_LENGTH_DELIMITED, write, read
+
+
+def _skip(data: memoryview, offset: int, end: int, wire_type: int) -> int:
+    """Move past a field we don't know about."""
+    if wire_type == _WIRE_VARINT:
+        _, offset = _read_varint(data, offset, end)
+    elif wire_type == _WIRE_FIXED64:
+        offset += 8
+    elif wire_type == _WIRE_LENGTH_DELIMITED:
+        size, offset = _read_varint(data, offset, end)
+        offset += size
+    elif wire_type == _WIRE_FIXED32:
+        offset += 4
+    else:
+        raise ProtobufDecodeError(f"unsupported wire type {wire_type}")
+
+    if offset > end:
+        raise ProtobufDecodeError("truncated field")
+
+    return offset
+
+
+# ~~~ Messages ~~~
+
+
+def _field_codecs(cls: Type[Any]) -> Tuple[Tuple[str, str, int, FieldKind, int, Writer, Reader], ...]:
+    codecs = []
+    betterproto_meta = cls._betterproto if _schema.schema_of(cls).is_message else None
+
+    for number, field in enumerate(_schema.schema_of(cls).fields, start=1):
+        meta = field.meta
+
+        if meta is None:
+            # the TML envelope, eg. Worksheet(guid, worksheet)
+            number_ = number
+            codec = _message_codec(field.type) if field.type is not None else _SCALARS[betterproto.TYPE_STRING]
+
+        elif meta.proto_type == betterproto.TYPE_MAP:
+            number_ = meta.number
+            codec = _map_codec(cls, field.name, meta)
+
+        elif meta.proto_type == betterproto.TYPE_MESSAGE:
+            number_ = meta.number
+            codec = _message_codec(field.type)  # type: ignore[arg-type]
+
+        elif meta.proto_type == betterproto.TYPE_ENUM:
+            number_ = meta.number
+            codec = _enum_codec(betterproto_meta.cls_by_field[field.name])  # type: ignore[union-attr]
+
+        else:
+            number_ = meta.number
+            codec = _SCALARS[meta.proto_type]
+
+        wire_type, write, read = codec
+        codecs.append((field.name, field.key, number_, field.kind, wire_type, write, read))
+
+    return tuple(codecs)
+
+
+def _compile_encoder(cls: Type[Any]) -> Callable[[bytearray, Any], None]:
+    steps = tuple(
+        (name, key, _tag(number, wire_type), kind, write)
+        for name, key, number, kind, wire_type, write, _ in _field_codecs(cls)
+    )
+    is_message = _schema.schema_of(cls).is_message
+
+    def encode(out: bytearray, instance: Any) -> None:
+        # lazily loaded sub-trees are still raw TML, keyed by their TML key rather than name
+        if isinstance(instance, dict):
+            values = [(instance.get(key), tag, kind, write) for name, key, tag, kind, write in steps]
+        elif is_message:
+            # read betterproto's storage directly, __getattribute__ is expensive
+            values = [(_object_getattribute(instance, name), tag, kind, write) for name, key, tag, kind, write in steps]
+        else:
+            values = [(getattr(instance, name), tag, kind, write) for name, key, tag, kind, write in steps]
+
+        for value, tag, kind, write in values:
+            if value is None or value is _PLACEHOLDER:
+                continue
+
+            if kind is FieldKind.LIST:
+                for item in value:
+                    if item is not None:
+                        out += tag
+                        write(out, item)
+
+            elif kind is FieldKind.MAP:
+                for entry in value.items():
+                    out += tag
+                    write(out, entry)
+
+            else:
+                out += tag
+                write(out, value)
+
+    return encode
+
+
+def _compile_decoder(cls: Type[Any]) -> Callable[[memoryview], Dict[str, Any]]:
+    steps: Dict[int, Tuple[str, FieldKind, int, Reader]] = {
+        number: (key, kind, wire_type, read) for _, key, number, kind, wire_type, _, read in _field_codecs(cls)
+    }
+    # the TML envelope has no defaults, a Connection may not have a guid
+    envelope_keys = () if _schema.schema_of(cls).is_message else tuple(key for key, *_ in steps.values())
+
+    def decode(data: memoryview) -> Dict[str, Any]:
+        document: Dict[str, Any] = {}
+        offset, end = 0, len(data)
+
+        while offset < end:
+            # field numbers below 16 fit in a single byte
+            tag = data[offset]
+
+            if tag < 0x80:
+                offset += 1
+            else:
+                tag, offset = _read_varint(data, offset, end)
+
+            number, wire_type = tag >> 3, tag & 0x7
+
+            try:
+                key, kind, expected_wire_type, read = steps[number]
+            except KeyError:
+                offset = _skip(data, offset, end, wire_type)
+                continue
+
+            if kind is FieldKind.LIST and wire_type == _WIRE_LENGTH_DELIMITED and expected_wire_type != wire_type:
+                # packed repeated scalars, as written by other protobuf implementations
+                size, offset = _read_varint(data, offset, end)
+                packed_end = offset + size
+                items = document.setdefault(key, [])
+
+                while offset < packed_end:
+                    value, offset = read(data, offset, packed_end)
+                    items.append(value)
+
+                continue
+
+            if wire_type != expected_wire_type:
+                message = f"{cls.__name__}.{key} has wire type {wire_type}, expected {expected_wire_type}"
+                raise ProtobufDecodeError(message)
+
+            value, offset = read(data, offset, end)
+
+            if kind is FieldKind.LIST:
+                document.setdefault(key, []).append(value)
+            elif kind is FieldKind.MAP:
+                document.setdefault(key, {})[value[0]] = value[1]
+            else:
+                document[key] = value
+
+        if offset != end:
+            raise ProtobufDecodeError(f"truncated {cls.__name__}")
+
+        for key in envelope_keys:
+            document.setdefault(key, None)
+
+        return document
+
+    return decode
+
+
+def encoder_for(cls: Type[Any]) -> Callable[[bytearray, Any], None]:
+    """
+    Fetch the compiled wire format encoder for a TML or _scriptability dataclass.
+
+    The encoder appends the fields of an instance (or its raw TML) to a bytearray.
+    """
+    try:
+        return _ENCODERS[cls]
+    except KeyError:
+        encoder = _ENCODERS[cls] = _compile_encoder(cls)
+        return encoder
+
+
+def decoder_for(cls: Type[Any]) -> Callable[[memoryview], Dict[str, Any]]:
+    """
+    Fetch the compiled wire format decoder for a TML or _scriptability dataclass.
+
+    The decoder returns the native TML document, keyed by TML keys.
+    """
+    try:
+        return _DECODERS[cls]
+    except KeyError:
+        decoder = _DECODERS[cls] = _compile_decoder(cls)
+        return decoder
+
+
+def encode(instance: Any, *, cls: Optional[Type[Any]] = None) -> bytes:
+    """Serialize a TML object to the protobuf wire format."""
+    out = bytearray()
+    encoder_for(cls or type(instance))(out, instance)
+    return bytes(out)
+
+
+def decode(cls: Type[Any], data: bytes) -> Dict[str, Any]:
+    """Deserialize the protobuf wire format to a native TML document."""
+    return decoder_for(cls)(memoryview(data))
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from multiprocessing.reduction import ForkingPickler
+from typing import TYPE_CHECKING
+
+import betterproto
+
+from thoughtspot_tml import _decode, _lazy, _schema, _scriptability, utils
+from thoughtspot_tml._schema import FieldKind
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Tuple, Type
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# DEV NOTE:
+#   betterproto pickles a message as its protobuf bytes, which the TML spec can't always
+#   produce (eg. enums are held as their names). Between processes, and in the ParseCache,
+#   we copy the message state instead.
+#
+#   The reducers only apply to multiprocessing's ForkingPickler, and are only registered
+#   once something in the package needs them. Importing thoughtspot_tml never changes how
+#   the rest of the process pickles. Call register() before handing TML to a worker, and at
+#   the top of every function which runs in one, since a spawned worker starts fresh.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_REGISTERED = False
+
+
+def _restore_message(cls: Type[betterproto.Message], lazy: bool, state: Dict[str, Any]) -> betterproto.Message:
+    return _decode.assemble(_lazy.lazy_class_for(cls) if lazy else cls, state)
+
+
+def _reduce_message(message: betterproto.Message) -> Tuple[Any, ...]:
+    # a lazy variant shares its name with the _scriptability class, so it's sent as the original
+    cls = type(message)
+
+    # a lazy variant also holds its deferred fields
+    if _lazy.is_lazy_class(cls):
+        state = dict(message.__dict__)
+        state["_group_current"] = dict(state["_group_current"])
+        return (_restore_message, (_lazy.base_class(cls), True, state))
+
+    return (_restore_message, (cls, False, _decode.state_of(message)))
+
+
+def register() -> None:
+    """
+    Teach ForkingPickler to copy the state of every _scriptability message.
+
+    Safe to call any number of times, the reducers are only registered once per process.
+    """
+    global _REGISTERED
+
+    if _REGISTERED:
+        return
+
+    for cls in vars(_scriptability).values():
+        if isinstance(cls, type) and issubclass(cls, betterproto.Message):
+            ForkingPickler.register(cls, _reduce_message)
+
+    # Only the edocs of a TML object are lazily loaded, their lazy variants are registered too.
+    for tml_cls in set(utils._TML_TYPES.values()):
+        for field in _schema.schema_of(tml_cls).fields:
+            if field.kind is FieldKind.MESSAGE and field.type is not None:
+                ForkingPickler.register(_lazy.lazy_class_for(field.type), _reduce_message)
+
+    _REGISTERED = True
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+from dataclasses import MISSING, dataclass, fields, is_dataclass
+from typing import TYPE_CHECKING, ForwardRef
+import enum
+
+import betterproto
+
+from thoughtspot_tml import _scriptability
+from thoughtspot_tml._compat import get_args, get_origin
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, FrozenSet, Optional, Set, Tuple, Type
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# DEV NOTE:
+#   Resolving a field's annotation (eg. List[ForwardRef("Identity")]) is expensive, so it's
+#   done once per class here and shared by every traversal in the package.. the decoders,
+#   encoders, protobuf codecs, lazy variants, interning, and the scans in utils.
+#
+#   Reach for schema_of() rather than dataclasses.fields(), and for fields_to() when only
+#   the branches which may hold a given class need to be visited.
+#
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+class FieldKind(enum.Enum):
+    SCALAR = "scalar"
+    MESSAGE = "message"
+    LIST = "list"
+    MAP = "map"
+
+
+@dataclass(frozen=True)
+class FieldSchema:
+    """
+    Everything a traversal needs to know about a single dataclass field.
+
+    Attributes
+    ----------
+    name : str
+      attribute name on the dataclass
+
+    key : str
+      the key used in the TML document, differs from name only for python reserved words
+
+    kind : FieldKind
+      whether the field holds a basic type, a single message, or a container
+
+    type : type, optional
+      the dataclass held by this field (or its container), None for basic types
+
+    default : Any
+      the dataclass default, either None or betterproto.PLACEHOLDER for messages
+
+    default_factory : Callable[[], Any], optional
+      the betterproto zero-value generator, for messages only
+
+    optional : bool
+      whether the field was declared with proto3 field presence
+
+    group : str, optional
+      the name of the oneof group this field belongs to
+
+    meta : betterproto.FieldMetadata, optional
+      the protobuf field number and wire type, None for the fields of a TML object
+    """
+
+    name: str
+    key: str
+    kind: FieldKind
+    type: Optional[Type[Any]]
+    default: Any
+    default_factory: Optional[Callable[[], Any]]
+    optional: bool
+    group: Optional[str]
+    meta: Optional[betterproto.FieldMetadata]
+
+
+@dataclass(frozen=True)
+class ClassSchema:
+    """
+    Precomputed field metadata for a TML or _scriptability dataclass.
+
+    Attributes
+    ----------
+    cls : type
+      the dataclass this schema describes
+
+    fields : Tuple[FieldSchema, ...]
+      the dataclass fields, in declaration order
+
+    field_names : FrozenSet[str]
+      the names of all fields, for fast membership checks
+
+    field_keys : FrozenSet[str]
+      the TML keys of all fields, for fast membership checks
+
+    field_by_name : Dict[str, FieldSchema]
+      the fields, keyed by their attribute name
+
+    is_message : bool
+      whether the dataclass is a betterproto.Message
+
+    has_oneof : bool
+      whether any field belongs to a oneof group
+
+    has_custom_post_init : bool
+      whether the message overrides betterproto.Message.__post_init__
+    """
+
+    cls: type
+    fields: Tuple[FieldSchema, ...]
+    field_names: FrozenSet[str]
+    field_keys: FrozenSet[str]
+    field_by_name: Dict[str, FieldSchema]
+    is_message: bool
+    has_oneof: bool
+    has_custom_post_init: bool
+
+
+_REGISTRY: Dict[type, ClassSchema] = {}
+_CAN_CONTAIN: Dict[type, Dict[type, bool]] = {}
+_FIELDS_TO: Dict[Tuple[type, type], Tuple[FieldSchema, ...]] = {}
+_FIELDS_TO_ANY: Dict[Tuple[type, Tuple[type, ...]], Tuple[FieldSchema, ...]] = {}
+
+
+def _resolve(annotation: Any) -> Any:
+    """
+    Resolve a field annotation into a real type, if we're able to.
+
+    Annotations are one of..
+      - a type (str, bool, or a dataclass)
+      - a str, eg. "Identity" or "_scriptability.Identity" from the TML classes
+      - a ForwardRef, as found in List["Identity"]
+    """
+    if isinstance(annotation, ForwardRef):
+        annotation = annotation.__forward_arg__
+
+    if isinstance(annotation, str):
+        _, _, name = annotation.rpartition("_scriptability.")
+        return getattr(_scriptability, name, None)
+
+    return annotation
+
+
+def _as_dataclass(annotation: Any) -> Optional[Type[Any]]:
+    return annotation if isinstance(annotation, type) and is_dataclass(annotation) else None
+
+
+def _field_schema(cls: Type[Any], field: Any) -> FieldSchema:
+    origin = get_origin(field.type)
+    meta = field.metadata.get("betterproto", None)
+
+    if origin is list:
+        kind = FieldKind.LIST
+        type_ = _as_dataclass(_resolve(get_args(field.type)[0]))
+
+    elif origin is dict:
+        kind = FieldKind.MAP
+        type_ = _as_dataclass(_resolve(get_args(field.type)[1]))
+
+    else:
+        type_ = _as_dataclass(_resolve(field.type))
+        kind = FieldKind.SCALAR if type_ is None else FieldKind.MESSAGE
+
+    if meta is None:
+        default_factory = None
+    else:
+        default_factory = cls._betterproto.default_gen[field.name]
+
+    aliases = _scriptability.RESERVED_WORD_KEY_ALIASES.get(cls.__name__, {})
+
+    return FieldSchema(
+        name=field.name,
+        key=aliases.get(field.name, field.name),
+        kind=kind,
+        type=type_,
+        default=None if field.default is MISSING else field.default,
+        default_factory=default_factory,
+        optional=False if meta is None else meta.optional,
+        group=None if meta is None else meta.group,
+        meta=meta,
+    )
+
+
+def schema_of(cls: Type[Any]) -> ClassSchema:
+    """
+    Fetch the precomputed field metadata for a dataclass.
+
+    The schema is built on first access and cached for the life of the process.
+    """
+    try:
+        return _REGISTRY[cls]
+    except KeyError:
+        pass
+
+    field_schemas = tuple(_field_schema(cls, field) for field in fields(cls))
+    is_message = issubclass(cls, betterproto.Message)
+
+    schema = ClassSchema(
+        cls=cls,
+        fields=field_schemas,
+        field_names=frozenset(f.name for f in field_schemas),
+        field_keys=frozenset(f.key for f in field_schemas),
+        field_by_name={f.name: f for f in field_schemas},
+        is_message=is_message,
+        has_oneof=any(f.group is not None for f in field_schemas),
+        has_custom_post_init=is_message and cls.__post_init__ is not betterproto.Message.__post_init__,
+    )
+
+    _REGISTRY[cls] = schema
+    return schema
+
+
+def _nested_types(cls: Type[Any]) -> Set[type]:
+    return {field.type for field in schema_of(cls).fields if field.type is not None}
+
+
+def can_contain(cls: Type[Any], target: Type[Any]) -> bool:
+    """
+    Determine if an instance of a dataclass may hold an instance of target, at any depth.
+
+    The answer is computed from the schema once, for cls and every class nested within it.
+    """
+    known = _CAN_CONTAIN.setdefault(target, {})
+
+    try:
+        return known[cls]
+    except KeyError:
+        pass
+
+    # Discover every class reachable from cls which we don't yet have an answer for.
+    graph: Dict[type, Set[type]] = {}
+    stack = [cls]
+
+    while stack:
+        node = stack.pop()
+
+        if node in graph or node in known:
+            continue
+
+        graph[node] = _nested_types(node)
+        stack.extend(graph[node])
+
+    # Then walk backwards from target, messages can be recursive so iterate to a fixed point.
+    reaches = {node for node, nested in graph.items() if target in nested or any(known.get(n) for n in nested)}
+    changed = True
+
+    while changed:
+        changed = False
+
+        for node, nested in graph.items():
+            if node not in reaches and not reaches.isdisjoint(nested):
+                reaches.add(node)
+                changed = True
+
+    for node in graph:
+        known[node] = node in reaches
+
+    return known[cls]
+
+
+def fields_to(cls: Type[Any], target: Type[Any]) -> Tuple[FieldSchema, ...]:
+    """
+    Fetch the fields of a dataclass which hold, or may contain, an instance of target.
+    """
+    try:
+        return _FIELDS_TO[cls, target]
+    except KeyError:
+        pass
+
+    # fmt: off
+    found = _FIELDS_TO[cls, target] = tuple(
+        field
+        for field in schema_of(cls).fields
+        if field.type is not None
+        if field.type is target or can_contain(field.type, target)
+    )
+    # fmt: on
+    return found
+
+
+def fields_to_any(cls: Type[Any], targets: Tuple[Type[Any], ...]) -> Tuple[FieldSchema, ...]:
+    """
+    Fetch the fields of a dataclass which hold, or may contain, an instance of any target.
+
+    Fields are in declaration order.
+    """
+    try:
+        return _FIELDS_TO_ANY[cls, targets]
+    except KeyError:
+        pass
+
+    wanted = {field.name for target in targets for field in fields_to(cls, target)}
+    found = _FIELDS_TO_ANY[cls, targets] = tuple(field for field in schema_of(cls).fields if field.name in wanted)
+    return found
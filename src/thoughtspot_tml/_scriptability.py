@@ -909,3 +909,7 @@ class MonitorAlertEDocProtoPersonalisedViewInfo(betterproto.Message):
     tables: List["Identity"] = betterproto.message_field(1, optional=True)
     filters: List["Filter"] = betterproto.message_field(2, optional=True)
     parameter_overrides: List["PinboardParameterOverrideEDoc"] = betterproto.message_field(3, optional=True)
+
+
+# TML keys which are python reserved words, mapped from their python-betterproto field name.
+RESERVED_WORD_KEY_ALIASES = {"SchemaInPlaceJoin": {"with_": "with"}}
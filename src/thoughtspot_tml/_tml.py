@@ -1,120 +1,36 @@
 from __future__ import annotations
 
-from collections.abc import Collection
-from dataclasses import asdict, dataclass, fields, is_dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, overload
 import json
 import pathlib
 import re
-import typing
 import warnings
 
 import yaml
 
-from thoughtspot_tml import _scriptability, _yaml
-from thoughtspot_tml._compat import get_args, get_origin
-from thoughtspot_tml.exceptions import TMLDecodeError, TMLExtensionWarning
+from thoughtspot_tml import _decode, _encode, _lazy, _proto, _yaml
+from thoughtspot_tml.exceptions import TMLDecodeError, TMLError, TMLExtensionWarning
 
-if TYPE_CHECKING:
-    from typing import Any, Dict
-
-
-RE_CAMEL_CASE = re.compile(r"[A-Z]?[a-z]+|[A-Z]{2,}(?=[A-Z][a-z]|\d|\W|$)|\d+")
-
-
-def recursive_complex_attrs_to_dataclasses(instance: Any) -> None:
-    """
-    Convert all fields of type `dataclass` into an instance of the
-    specified dataclass if the current value is a dict.
-
-    Types will always be one of:
-      - dataclass
-      - basic type
-      - dataclass annotation (aka, a str) - to be gathered from _scriptability
-      - list of basic types
-      - list of dataclass annotation
-    """
-    cls = type(instance)
-
-    for field in fields(cls):
-        value = getattr(instance, field.name)
-
-        # ignore nulls, they get dropped to support optionality
-        if value is None:
-            continue
-
-        # it's a dataclass
-        if is_dataclass(field.type) and isinstance(value, dict):
-            new_value = field.type(**value)
-            recursive_complex_attrs_to_dataclasses(new_value)
-
-        # it's an _scriptability dataclass Annotation that needs resolution
-        elif isinstance(field.type, str) and isinstance(value, dict):
-            if field.type.startswith("_scriptability"):
-                _, _, field_type = field.type.partition(".")
-            else:
-                field_type = field.type
-
-            type_ = getattr(_scriptability, field_type)
-            new_value = type_(**value)
-            recursive_complex_attrs_to_dataclasses(new_value)
-
-        # it's a List of basic types or ForwardRefs
-        elif get_origin(field.type) is list:
-            new_value = []  # type: ignore[assignment]
-            args = get_args(field.type)
-            field_type = args[0].__forward_value__ if isinstance(args[0], typing.ForwardRef) else args[0]
-
-            for item in value:
-                if is_dataclass(field_type) and isinstance(item, dict):
-                    item = field_type(**item)
-
-                new_value.append(item)  # type: ignore[attr-defined]
-
-                if is_dataclass(field_type):
-                    recursive_complex_attrs_to_dataclasses(item)
+# MessagePack is an optional dependency, pip install thoughtspot_tml[msgpack]
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
 
-        # it's an empty mapping, python-betterproto doesn't support optional map_fields
-        elif get_origin(field.type) is dict and value == {}:
-            new_value = None
-
-        else:  # pragma: peephole optimizer
-            continue
-
-        setattr(instance, field.name, new_value)
-
-
-def _recursive_remove_null(mapping: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Drop all keys with null values, they're optional.
-    """
-    new = {}
-
-    for k, v in mapping.items():
-        if isinstance(v, dict):
-            v = _recursive_remove_null(v)
-
-        if isinstance(v, list):
-            v = [_recursive_remove_null(e) if isinstance(e, dict) else e for e in v if e is not None]
+if TYPE_CHECKING:
+    from typing import Any, Dict, Literal, Optional, Union
 
-        # EXCEPTION:
-        # - don't remove connection.yaml empty password
-        # - historical client_state attribute
-        if k in ("value", "client_state") and v == "":
-            new[k] = v
-            continue
+    from thoughtspot_tml.cache import ParseCache
+    from thoughtspot_tml.interning import InternPool
 
-        # If v is any form of EMPTY
-        is_none = v is None
-        is_empty_string = v == ""
-        is_empty_collection = isinstance(v, Collection) and not isinstance(v, str) and not v
 
-        if is_none or is_empty_string or is_empty_collection:  # pragma: peephole optimizer
-            continue
+RE_CAMEL_CASE = re.compile(r"[A-Z]?[a-z]+|[A-Z]{2,}(?=[A-Z][a-z]|\d|\W|$)|\d+")
 
-        new[k] = v
 
-    return new
+def _require_msgpack() -> None:
+    if msgpack is None:
+        raise TMLError("format_type='MSGPACK' requires msgpack, pip install thoughtspot_tml[msgpack]")
 
 
 @dataclass
@@ -132,39 +48,84 @@ class TML:
         return snakes.lower()
 
     def __post_init__(self):
-        recursive_complex_attrs_to_dataclasses(self)
+        _decode.convert_fields(self)
 
     @classmethod
-    def _loads(cls, tml_document: str) -> Dict[str, Any]:
+    def _loads(cls, tml_document: Union[str, bytes], *, format_type: str = "YAML") -> Dict[str, Any]:
         # @boonhapus note: do not override this!!
         #   These exist to handle backwards compatible changes between TML versions.
-        return _yaml.load(tml_document)
+        if format_type.upper() == "MSGPACK":
+            _require_msgpack()
+            return msgpack.unpackb(tml_document, raw=False)
+
+        return _yaml.load(tml_document)  # type: ignore[arg-type]
 
-    def _to_dict(self) -> Dict[str, Any]:
+    def _to_dict(self, *, drop_empty: bool = False) -> Dict[str, Any]:
         # @boonhapus note: do not override this!!
         #   These exist to handle backwards compatible changes between TML versions.
-        return asdict(self)
+        return _encode.encode_value(self, drop_empty=drop_empty)
 
     @classmethod
-    def loads(cls, tml_document: str) -> TML:
+    def loads(
+        cls,
+        tml_document: Union[str, bytes],
+        *,
+        lazy: bool = False,
+        format_type: str = "YAML",
+        intern: Optional[InternPool] = None,
+    ) -> TML:
         """
         Deserialize a TML document to a Python object.
 
         Parameters
         ----------
-        tml_document : str
-          text to parse into a TML object
+        tml_document : str or bytes
+          text to parse into a TML object, or bytes when format_type is 'MSGPACK'
+
+        lazy : bool, default False
+          whether to defer building nested objects until they're first accessed
+
+        format_type : str, default 'YAML'
+          data format of the document .. one of, 'YAML', 'JSON', or 'MSGPACK'
+
+        intern : InternPool, default None
+          a pool to share identifiers (names, ids, fqns, ..) with every other document loaded
 
         Raises
         ------
         TMLDecodeError, when the document string cannot be parsed or receives extra data
         """
+        if format_type.upper() not in ("YAML", "JSON", "MSGPACK"):
+            raise ValueError(f"format_type must be either 'YAML', 'JSON', or 'MSGPACK' .. got, '{format_type}'")
+
         try:
-            document = cls._loads(tml_document)
+            document = cls._loads(tml_document, format_type=format_type)
         except (yaml.scanner.ScannerError, yaml.parser.ParserError) as e:
             raise TMLDecodeError(cls, problem_mark=e.problem_mark) from None  # type: ignore[arg-type]
+        except (ValueError, TypeError) as e:
+            if format_type.upper() != "MSGPACK":
+                raise
+
+            raise TMLDecodeError(cls, message=f"invalid msgpack data, {e}") from None  # type: ignore[arg-type]
+
+        return cls._from_document(document, lazy=lazy, intern=intern)
+
+    @classmethod
+    def _from_document(
+        cls,
+        document: Dict[str, Any],
+        *,
+        lazy: bool = False,
+        intern: Optional[InternPool] = None,
+    ) -> TML:
+        # Build the TML object from a document which has already been through _loads().
+        if intern is not None and isinstance(document, dict):
+            intern.intern_document(cls, document)
 
         try:
+            if lazy:
+                document = _lazy.defer(cls, document)
+
             instance = cls(**document)
         except TypeError as e:
             raise TMLDecodeError(cls, data=document, message=str(e)) from None  # type: ignore[arg-type]
@@ -172,7 +133,14 @@ class TML:
         return instance
 
     @classmethod
-    def load(cls, path: pathlib.Path) -> TML:
+    def load(
+        cls,
+        path: pathlib.Path,
+        *,
+        lazy: bool = False,
+        cache: Optional[ParseCache] = None,
+        intern: Optional[InternPool] = None,
+    ) -> TML:
         """
         Deserialize a TML document located at filepath to a Python object.
 
@@ -181,6 +149,16 @@ class TML:
         path : PathLike
           filepath to load the TML document from
 
+        lazy : bool, default False
+          whether to defer building nested objects until they're first accessed
+
+        cache : ParseCache, default None
+          an on-disk cache of parsed TML, documents which haven't changed aren't parsed again
+
+        intern : InternPool, default None
+          a pool to share identifiers (names, ids, fqns, ..) with every other document loaded,
+          objects served from the cache are not interned
+
         Raises
         ------
         TMLDecodeError, when the document string cannot be parsed or receives extra data
@@ -188,33 +166,100 @@ class TML:
         if isinstance(path, str):
             path = pathlib.Path(path)
 
+        tml_document = path.read_text(encoding="utf-8")
+
+        if cache is not None:
+            key = cache.key(cls, tml_document, lazy=lazy)
+            cached = cache.get(key)
+
+            if cached is not None:
+                return cached
+
         try:
-            instance = cls.loads(path.read_text(encoding="utf-8"))
+            instance = cls.loads(tml_document, lazy=lazy, intern=intern)
         except TMLDecodeError as e:
             e.path = path
             raise e from None
 
+        if cache is not None:
+            cache.put(key, instance)
+
         return instance
 
+    @classmethod
+    def from_bytes(cls, data: bytes, *, lazy: bool = False, intern: Optional[InternPool] = None) -> TML:
+        """
+        Deserialize a TML object from the protobuf wire format.
+
+        Parameters
+        ----------
+        data : bytes
+          the output of to_bytes()
+
+        lazy : bool, default False
+          whether to defer building nested objects until they're first accessed
+
+        intern : InternPool, default None
+          a pool to share identifiers (names, ids, fqns, ..) with every other document loaded
+
+        Raises
+        ------
+        TMLDecodeError, when the data is not a valid encoding of this TML type
+        """
+        try:
+            document = _proto.decode(cls, data)
+        except (_proto.ProtobufDecodeError, UnicodeDecodeError) as e:
+            raise TMLDecodeError(cls, message=f"invalid protobuf data, {e}") from None  # type: ignore[arg-type]
+
+        return cls._from_document(document, lazy=lazy, intern=intern)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize this object to the protobuf wire format.
+
+        The guid is written as field 1, followed by the TML document as field 2. Empty lists
+        are dropped, as they are from dumps().
+        """
+        return _proto.encode(self)
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Serialize this object to native python data types.
         """
         return self._to_dict()
 
-    def dumps(self, format_type: str = "YAML") -> str:
+    @overload
+    def dumps(  # type: ignore[overload-overlap]
+        self,
+        format_type: Literal["PROTOBUF", "protobuf", "MSGPACK", "msgpack"],
+    ) -> bytes: ...
+
+    @overload
+    def dumps(self, format_type: str = "YAML") -> str: ...
+
+    def dumps(self, format_type: str = "YAML") -> Union[str, bytes]:
         """
-        Serialize this object as a YAML- or JSON-formatted str.
+        Serialize this object as a YAML- or JSON-formatted str, or as protobuf or MessagePack bytes.
 
         Parameters
         ----------
         format_type : str
-          data format to save in .. one of, 'YAML' or 'JSON'
+          data format to save in .. one of, 'YAML', 'JSON', 'PROTOBUF', or 'MSGPACK'
         """
-        if format_type.upper() not in ("YAML", "JSON"):
-            raise ValueError(f"format_type must be either 'YAML' or 'JSON' .. got, '{format_type}'")
+        if format_type.upper() not in ("YAML", "JSON", "PROTOBUF", "MSGPACK"):
+            raise ValueError(
+                f"format_type must be either 'YAML', 'JSON', 'PROTOBUF', or 'MSGPACK' .. got, '{format_type}'",
+            )
+
+        if format_type.upper() == "PROTOBUF":
+            return self.to_bytes()
+
+        # drop all keys with null values, they're optional
+        data = self._to_dict(drop_empty=True)
 
-        data = _recursive_remove_null(self.to_dict())
+        if format_type.upper() == "MSGPACK":
+            _require_msgpack()
+            return msgpack.packb(data, use_bin_type=True)
 
         if format_type.upper() == "YAML":
             document = _yaml.dump(data)
@@ -1,11 +1,29 @@
 from __future__ import annotations
 
 from math import inf as INFINITY
-from typing import Any, Dict
+from typing import Any, BinaryIO, Dict, Optional
 import re
 
+from yaml.resolver import Resolver
 import yaml
 
+# libyaml is an optional C extension of PyYAML, it's roughly an order of magnitude faster
+# than the pure-python scanner and emitter. Fall back gracefully if it's not compiled in.
+try:
+    from yaml import (
+        CDumper as _Dumper,
+        CSafeLoader as _SafeLoader,
+    )
+
+    BACKEND = "libyaml"
+except ImportError:  # pragma: no cover
+    from yaml import (
+        Dumper as _Dumper,
+        SafeLoader as _SafeLoader,
+    )
+
+    BACKEND = "python"
+
 # TML column ids typically take the form..
 #
 #   LOGICAL_TABLE_NAME_#::LOGICAL_COLUMN_NAME
@@ -36,6 +54,16 @@ _RESERVED_WORDS = (
 )
 # fmt: on
 
+# libyaml considers all characters outside of the Basic Multilingual Plane (eg. emoji) to
+# be unprintable, and will escape them even when allow_unicode=True.
+_ASTRAL_PLANE_CHARACTERS = re.compile("[\U00010000-\U0010ffff]")
+
+
+class _LibYAMLEmitterLimitation(Exception):
+    """
+    Raised when a document cannot be faithfully emitted by libyaml.
+    """
+
 
 def _double_quote_when_special_char(dumper: yaml.Dumper, data: str) -> yaml.ScalarNode:
     """
@@ -59,20 +87,48 @@ def _double_quote_when_special_char(dumper: yaml.Dumper, data: str) -> yaml.Scal
     return dumper.represent_scalar("tag:yaml.org,2002:str", data, style=style)
 
 
-yaml.add_representer(str, _double_quote_when_special_char)
+def _double_quote_when_special_char_libyaml(dumper: yaml.Dumper, data: str) -> yaml.ScalarNode:
+    """
+    Same as above, but bail out on strings which libyaml would escape.
+    """
+    if _ASTRAL_PLANE_CHARACTERS.search(data):
+        raise _LibYAMLEmitterLimitation(data)
+
+    return _double_quote_when_special_char(dumper, data)
+
 
 # BUG: pyyaml #89 ==> resolved by #635
-yaml.Loader.yaml_implicit_resolvers.pop("=")
+_IMPLICIT_RESOLVERS = {k: v for k, v in Resolver.yaml_implicit_resolvers.items() if k != "="}
+
+
+class TMLLoader(_SafeLoader):
+    yaml_implicit_resolvers = _IMPLICIT_RESOLVERS
+
+
+class TMLDumper(_Dumper):
+    yaml_implicit_resolvers = _IMPLICIT_RESOLVERS
+
+
+class _PurePythonTMLDumper(yaml.Dumper):
+    yaml_implicit_resolvers = _IMPLICIT_RESOLVERS
+
+
+_PurePythonTMLDumper.add_representer(str, _double_quote_when_special_char)
+
+if BACKEND == "libyaml":
+    TMLDumper.add_representer(str, _double_quote_when_special_char_libyaml)
+else:  # pragma: no cover
+    TMLDumper.add_representer(str, _double_quote_when_special_char)
 
 
 def load(document: str) -> Dict[str, Any]:
     """
     Load a TML object.
     """
-    return yaml.load(document, Loader=yaml.SafeLoader)
+    return yaml.load(document, Loader=TMLLoader)
 
 
-def dump(document: Dict[str, Any]) -> str:
+def _dump(document: Dict[str, Any], stream: Optional[BinaryIO]) -> Any:
     """
     Dump a TML object as YAML.
 
@@ -86,4 +142,31 @@ def dump(document: Dict[str, Any]) -> str:
 
     We'll attempt to reproduce them in Python.
     """
-    return yaml.dump(document, width=INFINITY, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    options: Dict[str, Any] = {"default_flow_style": False, "sort_keys": False, "allow_unicode": True}
+
+    if stream is not None:
+        options["encoding"] = "utf-8"
+
+    if BACKEND == "libyaml":
+        try:
+            # libyaml treats any negative width as "do not split lines"
+            return yaml.dump(document, stream, Dumper=TMLDumper, width=-1, **options)
+        except _LibYAMLEmitterLimitation:
+            # the whole document is represented before it's emitted, nothing was written yet
+            pass
+
+    return yaml.dump(document, stream, Dumper=_PurePythonTMLDumper, width=INFINITY, **options)
+
+
+def dump(document: Dict[str, Any]) -> str:
+    """
+    Dump a TML object as YAML.
+    """
+    return _dump(document, stream=None)
+
+
+def dump_to_stream(document: Dict[str, Any], stream: BinaryIO) -> None:
+    """
+    Dump a TML object as YAML, writing it to a binary stream as UTF-8 while it's emitted.
+    """
+    _dump(document, stream=stream)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import concurrent.futures as cf
+import itertools as it
+import os
+import pathlib
+
+import yaml
+
+from thoughtspot_tml import _reduction, utils
+from thoughtspot_tml.exceptions import TMLDecodeError, TMLError
+from thoughtspot_tml.tml import Connection
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
+
+    from yaml.error import Mark
+
+    from thoughtspot_tml._tml import TML
+    from thoughtspot_tml.interning import InternPool
+
+    # path, TML class, parsed document, error message, YAML syntax error
+    ParsedFile = Tuple[pathlib.Path, Optional[Type[TML]], Optional[Dict[str, Any]], Optional[str], Optional[Mark]]
+    LoadedFile = Tuple[pathlib.Path, Union[TML, TMLError]]
+    T = TypeVar("T")
+
+
+def _parse_file(path: pathlib.Path) -> ParsedFile:
+    """
+    Read and parse a single TML file into python native types.
+
+    Errors are returned as data, so that they can be attached to the path they came from.
+    """
+    # the file is only read once, even when its type must be sniffed from the document
+    try:
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        return (path, None, None, f"could not read '{path}', {e}", None)
+
+    try:
+        tml_cls = utils._tml_type_of_document(path, text)
+    except TMLError as e:
+        return (path, None, None, str(e), None)
+
+    return _parse_text(path, tml_cls, text)
+
+
+def _parse_text(path: pathlib.Path, tml_cls: Type[TML], text: str) -> ParsedFile:
+    try:
+        document = tml_cls._loads(text)
+    except (yaml.scanner.ScannerError, yaml.parser.ParserError) as e:
+        return (path, tml_cls, None, None, e.problem_mark)
+    except yaml.YAMLError as e:
+        # eg. a ComposerError, from an undefined alias
+        return (path, tml_cls, None, str(e), None)
+
+    return (path, tml_cls, document, None, None)
+
+
+def _build(parsed: ParsedFile, *, lazy: bool, intern: Optional[InternPool] = None) -> LoadedFile:
+    path, tml_cls, document, message, problem_mark = parsed
+
+    if tml_cls is None:
+        return (path, TMLError(message))
+
+    if document is None:
+        return (path, TMLDecodeError(tml_cls, message=message, path=path, problem_mark=problem_mark))  # type: ignore[arg-type]
+
+    try:
+        tml = tml_cls._from_document(document, lazy=lazy, intern=intern)
+    except TMLDecodeError as e:
+        e.path = path
+        return (path, e)
+
+    # Connections do not offer a TML component, the guid may come from the filename.
+    if isinstance(tml, Connection):
+        tml.guid = utils._guid_from_filename(path) or tml.guid
+
+    return (path, tml)
+
+
+def _load_files(paths: List[pathlib.Path], *, build: bool) -> Union[List[ParsedFile], List[LoadedFile]]:
+    # This runs in the worker, its results are sent back with the package's reducers.
+    _reduction.register()
+
+    # Otherwise, objects are finished in the main process.
+    if not build:
+        return [_parse_file(path) for path in paths]
+
+    return [_build(_parse_file(path), lazy=False) for path in paths]
+
+
+def _batched(items: List[T], size: int) -> Iterable[List[T]]:
+    iterator = iter(items)
+    batch = list(it.islice(iterator, size))
+
+    while batch:
+        yield batch
+        batch = list(it.islice(iterator, size))
+
+
+def load_directory(
+    path: pathlib.Path,
+    *,
+    workers: Optional[int] = None,
+    executor: str = "process",
+    ordered: bool = False,
+    recursive: bool = True,
+    lazy: bool = False,
+    batch_size: int = 16,
+    intern: Optional[InternPool] = None,
+) -> Iterator[Tuple[pathlib.Path, Union[TML, TMLError]]]:
+    """
+    Load all the TML files in a directory in parallel.
+
+    TML files are those which end with .tml, as well as any connection.yaml. Files are
+    read, parsed, and built into TML objects by a pool of workers.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+      directory to load TML files from
+
+    workers : int, default os.cpu_count()
+      number of workers to parse files with
+
+    executor : str, default 'process'
+      kind of worker pool to use .. one of, 'process' or 'thread'
+
+    ordered : bool, default False
+      whether to yield results in filepath order, rather than as soon as they're ready
+
+    recursive : bool, default True
+      whether to load all subdirectories as well
+
+    lazy : bool, default False
+      whether to defer building nested objects until they're first accessed
+
+    batch_size : int, default 16
+      number of files each worker parses per task, to amortize the cost of communication
+
+    intern : InternPool, default None
+      a pool to share identifiers (names, ids, fqns, ..) across every document loaded, since
+      the pool lives in this process, workers only parse files and objects are built here
+
+    Yields
+    ------
+    (path, TML object) for each file, or (path, TMLError) when a file could not be loaded
+    """
+    if executor not in ("process", "thread"):
+        raise ValueError(f"executor must be either 'process' or 'thread' .. got, '{executor}'")
+
+    workers = workers or os.cpu_count() or 1
+    pool_cls = cf.ProcessPoolExecutor if executor == "process" else cf.ThreadPoolExecutor
+    paths = utils._find_tml_files(pathlib.Path(path), recursive=recursive)
+
+    _reduction.register()
+
+    # Lazy objects are only partially built, and the intern pool can't be shared with workers.
+    build_in_worker = not lazy and intern is None
+
+    with pool_cls(max_workers=workers) as pool:
+        futures = [pool.submit(_load_files, batch, build=build_in_worker) for batch in _batched(paths, batch_size)]
+
+        try:
+            for future in futures if ordered else cf.as_completed(futures):
+                for result in future.result():
+                    if build_in_worker:
+                        yield result  # type: ignore[misc]
+                    else:
+                        yield _build(result, lazy=lazy, intern=intern)  # type: ignore[arg-type]
+        finally:
+            # the caller stopped iterating early, don't parse the rest
+            for future in futures:
+                future.cancel()
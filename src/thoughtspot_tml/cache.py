@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from multiprocessing.reduction import ForkingPickler
+from typing import TYPE_CHECKING
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+
+from thoughtspot_tml import _reduction
+from thoughtspot_tml._version import __version__
+
+if TYPE_CHECKING:
+    from typing import Optional, Type
+
+    from thoughtspot_tml._tml import TML
+
+
+_SUFFIX = ".pickle"
+
+
+class ParseCache:
+    """
+    An on-disk cache of parsed TML objects, keyed by the content of each TML document.
+
+    Objects are stored with pickle, so they're rebuilt without parsing any YAML or converting
+    any fields. Only point the cache at a directory you trust.
+
+    Once the cache grows beyond max_bytes, the least recently used entries are evicted.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+      where to store the cached objects, it's created if it doesn't exist
+
+    max_bytes : int, default 256MB
+      the most space the cached objects may take up on disk
+    """
+
+    def __init__(self, directory: pathlib.Path, *, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # key -> size in bytes, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+
+        # The modified time of an entry is bumped when it's used, so LRU order survives restarts.
+        stats = [(path.stat(), path.name[: -len(_SUFFIX)]) for path in self.directory.glob(f"*{_SUFFIX}")]
+
+        for stat, key in sorted(stats, key=lambda pair: pair[0].st_mtime_ns):
+            self._entries[key] = stat.st_size
+            self._size += stat.st_size
+
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Number of bytes the cached objects take up on disk."""
+        return self._size
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def key(self, tml_cls: Type[TML], tml_document: str, *, lazy: bool = False) -> str:
+        """Identify a TML document, as parsed by a given version of thoughtspot_tml."""
+        digest = hashlib.sha256(f"{__version__}:{tml_cls.__module__}.{tml_cls.__qualname__}:{lazy}:".encode())
+        digest.update(tml_document.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[TML]:
+        """Fetch a copy of a cached object, or None if it's not in the cache."""
+        try:
+            data = self._path(key).read_bytes()
+            tml = pickle.loads(data)
+        except FileNotFoundError:
+            # another process may have evicted it
+            self._forget(key)
+            self.misses += 1
+            return None
+        except Exception:
+            # a corrupt entry, the document will be parsed again
+            self.discard(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._size += len(data) - self._entries.pop(key, 0)
+        self._entries[key] = len(data)
+        os.utime(self._path(key))
+        return tml
+
+    def put(self, key: str, tml: TML) -> None:
+        """Add an object to the cache, evicting the least recently used if it's full."""
+        # betterproto can't always pickle TML, see _reduction
+        _reduction.register()
+        data = ForkingPickler.dumps(tml, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if len(data) > self.max_bytes:
+            return
+
+        # Write to a temporary file first, so a reader never sees a partial entry.
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+
+        with os.fdopen(fd, mode="wb") as stream:
+            stream.write(data)
+
+        os.replace(temp, self._path(key))
+
+        self._forget(key)
+        self._entries[key] = len(data)
+        self._size += len(data)
+        self._evict()
+
+    def discard(self, key: str) -> None:
+        """Remove an object from the cache, if it's there."""
+        self._forget(key)
+
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every object from the cache."""
+        for key in list(self._entries):
+            self.discard(key)
+
+    def _forget(self, key: str) -> None:
+        self._size -= self._entries.pop(key, 0)
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self.discard(key)
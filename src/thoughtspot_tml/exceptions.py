@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, Optional, Type
-import dataclasses
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Type
+import functools
+
+from thoughtspot_tml import _schema
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -50,6 +52,18 @@ class TMLDecodeError(TMLError):
         self.path = path
         self.problem_mark = problem_mark
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # all arguments are keyword-only, so the default Exception pickling can't rebuild it
+        rebuild = functools.partial(
+            type(self),
+            self.tml_cls,
+            message=self.message,
+            data=self.data,
+            path=self.path,
+            problem_mark=self.problem_mark,
+        )
+        return (rebuild, ())
+
     def __str__(self) -> str:
         lines = []
         class_name = self.tml_cls.__name__
@@ -59,11 +73,11 @@ class TMLDecodeError(TMLError):
 
         if self.data is not None:
             lines.append(f"supplied data does not produce a valid TML ({class_name}) document")
-            fields = {f.name for f in dataclasses.fields(self.tml_cls)}
             data = set(self.data)
+            extra_data = data.difference(_schema.schema_of(self.tml_cls).field_names)
 
-            if data.difference(fields):
-                extra = ", ".join([f"'{arg}'" for arg in data.difference(fields)])
+            if extra_data:
+                extra = ", ".join([f"'{arg}'" for arg in extra_data])
                 lines.append(f"\ngot extra data: {extra}")
 
         if self.path is not None:
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import betterproto
+
+from thoughtspot_tml import _schema
+from thoughtspot_tml._schema import FieldKind
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+    Interner = Callable[["InternPool", Dict[str, Any]], None]
+
+
+# Every string field in the schema is interned, enums included since TML holds them by name.
+# Identifiers (eg. column ids, Identity.name and fqn) repeat across many documents, but long
+# strings are usually free text (eg. descriptions, SQL, chart configs) which rarely repeat.
+_INTERNED_PROTO_TYPES = frozenset((betterproto.TYPE_STRING, betterproto.TYPE_ENUM))
+_MAX_INTERNED_LENGTH = 128
+
+_INTERNERS: Dict[type, Optional[Interner]] = {}
+
+
+def _is_identifier(field: _schema.FieldSchema) -> bool:
+    if field.type is not None or field.kind not in (FieldKind.SCALAR, FieldKind.LIST):
+        return False
+
+    # the fields of a TML object itself aren't protobuf fields, its only scalar is the guid
+    if field.meta is None:
+        return True
+
+    return field.meta.proto_type in _INTERNED_PROTO_TYPES
+
+
+def _intern_short(pool: InternPool, value: Any) -> Any:
+    if type(value) is str and len(value) <= _MAX_INTERNED_LENGTH:
+        return pool.intern(value)
+
+    return value
+
+
+def _interner_for(cls: Type[Any]) -> Optional[Interner]:
+    """
+    Fetch the compiled interner for a TML or _scriptability dataclass.
+
+    The interner replaces the short strings of a raw TML document in place. Classes which
+    can't hold a string at any depth have no interner.
+    """
+    try:
+        return _INTERNERS[cls]
+    except KeyError:
+        pass
+
+    # messages can be recursive, assume there's nothing to do until we find out otherwise
+    _INTERNERS[cls] = None
+
+    identifiers: List[Tuple[str, FieldKind]] = []
+    nested: List[Tuple[str, FieldKind, type]] = []
+
+    for field in _schema.schema_of(cls).fields:
+        if _is_identifier(field):
+            identifiers.append((field.key, field.kind))
+
+            # python reserved words may also appear under their python-betterproto name
+            if field.name != field.key:
+                identifiers.append((field.name, field.kind))
+
+        elif field.type is not None and field.kind in (FieldKind.MESSAGE, FieldKind.LIST):
+            nested.append((field.key, field.kind, field.type))
+
+    def intern_document(pool: InternPool, data: Dict[str, Any]) -> None:
+        for key, kind in identifiers:
+            value = data.get(key)
+
+            if type(value) is str:
+                if len(value) <= _MAX_INTERNED_LENGTH:
+                    data[key] = pool.intern(value)
+
+            elif kind is FieldKind.LIST and type(value) is list:
+                data[key] = [_intern_short(pool, item) for item in value]
+
+        for key, kind, item_cls in nested:
+            value = data.get(key)
+
+            if not value:
+                continue
+
+            intern_nested = _INTERNERS.get(item_cls)
+
+            if intern_nested is None:
+                continue
+
+            if kind is FieldKind.MESSAGE and type(value) is dict:
+                intern_nested(pool, value)
+
+            elif kind is FieldKind.LIST and type(value) is list:
+                for item in value:
+                    if type(item) is dict:
+                        intern_nested(pool, item)
+
+    for _, _, item_cls in nested:
+        _interner_for(item_cls)
+
+    if identifiers or any(_INTERNERS.get(item_cls) is not None for _, _, item_cls in nested):
+        _INTERNERS[cls] = intern_document
+        return intern_document
+
+    return None
+
+
+class InternPool:
+    """
+    Share a single copy of each repeated identifier across every TML document loaded.
+
+    Column ids, names, fqns, and other identifiers repeat heavily across an estate of TML.
+    Once interned, equal identifiers are the same object. They're only stored once, and
+    compare (and hash) faster in dictionaries and sets.
+
+    The pool holds on to every string it has interned, until it's cleared.
+    """
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of strings which were already in the pool."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def intern(self, value: str) -> str:
+        """Fetch the pool's copy of a string, adding it if it's new."""
+        try:
+            pooled = self._strings[value]
+        except KeyError:
+            pooled = self._strings[value] = value
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return pooled
+
+    def intern_document(self, tml_cls: Type[Any], document: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the identifiers of a raw TML document with the pool's copies, in place."""
+        interner = _interner_for(tml_cls)
+
+        if interner is not None:
+            interner(self, document)
+
+        return document
+
+    def clear(self) -> None:
+        """Forget every interned string, and reset the statistics."""
+        self._strings.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+import pathlib
+
+from thoughtspot_tml import _scriptability, bulk
+from thoughtspot_tml.exceptions import TMLError
+from thoughtspot_tml.utils import _find_instances_with_paths
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Optional, Set, Union
+
+    from thoughtspot_tml.spotapp import SpotApp
+    from thoughtspot_tml.types import GUID, TMLObject
+
+    # the file a TML object was read from, or else its guid
+    Source = Union[pathlib.Path, GUID]
+
+
+_REFERRING_TYPES = (
+    _scriptability.Identity,
+    _scriptability.PinnedVisualization,
+    _scriptability.Filter,
+    _scriptability.TablePath,
+)
+
+
+@dataclass(frozen=True)
+class Reference:
+    """
+    A single place where a TML object refers to another object, or to part of one.
+
+    Attributes
+    ----------
+    key : str
+      the guid or name being referred to
+
+    guid : GUID
+      the guid of the referring TML object
+
+    tml_type : str
+      the type of the referring TML object, eg. worksheet
+
+    field_path : str
+      where the reference is held within the referring TML object, eg. worksheet.tables[0]
+
+    file : pathlib.Path
+      the file the referring TML object was read from, if any
+    """
+
+    key: str
+    guid: Optional[GUID]
+    tml_type: str
+    field_path: str
+    file: Optional[pathlib.Path] = None
+
+
+def _references_of(tml: TMLObject, *, file: Optional[pathlib.Path] = None) -> List[Reference]:
+    references: List[Reference] = []
+
+    for path, element in _find_instances_with_paths(tml, _REFERRING_TYPES):
+        if isinstance(element, _scriptability.Identity):
+            # an Identity may be referred to by both name and guid
+            keys = [(key, path) for key in dict.fromkeys((element.fqn, element.name))]
+
+        elif isinstance(element, _scriptability.PinnedVisualization):
+            keys = [(element.viz_guid, f"{path}.viz_guid")]
+
+        elif isinstance(element, _scriptability.Filter):
+            keys = [(column, f"{path}.column[{i}]") for i, column in enumerate(element.column or ())]
+
+        else:
+            keys = [(element.table, f"{path}.table")]
+
+        references.extend(Reference(k, tml.guid, tml.tml_type_name, p, file) for k, p in keys if k)
+
+    return references
+
+
+class ReferenceIndex:
+    """
+    Find which TML objects refer to a guid or name, across a whole collection of TML.
+
+    References are found on Identity (by fqn and name), PinnedVisualization.viz_guid,
+    Filter.column, and TablePath.table.
+
+    Each TML object is indexed under its source, the file it was read from or else its guid.
+    Indexing a source again replaces all of its references, so single files can be updated
+    as they change.
+    """
+
+    def __init__(self) -> None:
+        self._by_key: Dict[str, Dict[Source, List[Reference]]] = {}
+        self._by_source: Dict[Source, List[Reference]] = {}
+
+    @classmethod
+    def from_directory(
+        cls,
+        path: pathlib.Path,
+        *,
+        recursive: bool = True,
+        workers: Optional[int] = None,
+    ) -> ReferenceIndex:
+        """
+        Index all the TML files in a directory.
+
+        Parameters
+        ----------
+        path : pathlib.Path
+          directory to load TML files from
+
+        recursive : bool, default True
+          whether to load all subdirectories as well
+
+        workers : int, default os.cpu_count()
+          number of workers to parse files with
+
+        Raises
+        ------
+        TMLError, when a file could not be loaded
+        """
+        index = cls()
+
+        # Loaded lazily, only the fields which may hold a reference are ever built.
+        for file, tml in bulk.load_directory(path, workers=workers, ordered=True, recursive=recursive, lazy=True):
+            if isinstance(tml, TMLError):
+                raise tml
+
+            index.add(tml, file=file)  # type: ignore[arg-type]
+
+        return index
+
+    @classmethod
+    def from_spotapp(cls, spotapp: SpotApp) -> ReferenceIndex:
+        """Index all the TML in a SpotApp."""
+        index = cls()
+
+        for tml in spotapp.tml:
+            index.add(tml)
+
+        return index
+
+    def __len__(self) -> int:
+        return len(self._by_source)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_key
+
+    def _source(self, source: Source) -> Source:
+        return pathlib.Path(source).resolve() if isinstance(source, pathlib.Path) else source
+
+    def add(self, tml: TMLObject, *, file: Optional[pathlib.Path] = None) -> None:
+        """
+        Index a TML object, replacing the references it was previously indexed with.
+
+        Parameters
+        ----------
+        tml : TMLObject
+          the object to index
+
+        file : pathlib.Path, default None
+          the file the object was read from, required when the object has no guid
+        """
+        if file is None and tml.guid is None:
+            raise ValueError(f"a {tml.tml_type_name} without a guid can only be indexed along with its file")
+
+        if file is not None:
+            file = pathlib.Path(file).resolve()
+
+        source = tml.guid if file is None else file
+        self.remove(source)
+
+        references = self._by_source[source] = _references_of(tml, file=file)
+
+        for reference in references:
+            self._by_key.setdefault(reference.key, {}).setdefault(source, []).append(reference)
+
+    def remove(self, source: Source) -> None:
+        """Forget all the references of a TML object, by its file or guid."""
+        source = self._source(source)
+
+        for key in {reference.key for reference in self._by_source.pop(source, ())}:
+            referrers = self._by_key[key]
+            del referrers[source]
+
+            if not referrers:
+                del self._by_key[key]
+
+    def update(self, file: pathlib.Path) -> None:
+        """
+        Index a single TML file again after it has changed, or forget it once it's deleted.
+
+        Raises
+        ------
+        TMLError, when the file could not be loaded
+        """
+        file = pathlib.Path(file)
+
+        if not file.exists():
+            self.remove(file)
+            return
+
+        # Loaded lazily, only the fields which may hold a reference are ever built.
+        _, tml = bulk._build(bulk._parse_file(file), lazy=True)
+
+        if isinstance(tml, TMLError):
+            raise tml
+
+        self.add(tml, file=file)  # type: ignore[arg-type]
+
+    def references_to(self, *keys: str) -> List[Reference]:
+        """Fetch every reference to any of the guids or names."""
+        return [
+            reference for key in keys for references in self._by_key.get(key, {}).values() for reference in references
+        ]
+
+    def references_from(self, source: Source) -> List[Reference]:
+        """Fetch every reference a TML object makes, by its file or guid."""
+        return list(self._by_source.get(self._source(source), ()))
+
+    def referrers(self, *keys: str) -> Set[GUID]:
+        """Fetch the guids of the TML objects which refer to any of the guids or names."""
+        return {
+            reference.guid
+            for key in keys
+            for references in self._by_key.get(key, {}).values()
+            for reference in references[:1]
+            if reference.guid is not None
+        }
@@ -1,18 +1,40 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Dict, List, Optional
+import concurrent.futures as cf
 import json
+import os
 import pathlib
+import shutil
+import tempfile
+import time
 import zipfile
 
-from thoughtspot_tml import _yaml
-from thoughtspot_tml._compat import ZipPath
+from thoughtspot_tml import _reduction, _yaml, bulk
+from thoughtspot_tml.exceptions import TMLError
 from thoughtspot_tml.tml import Answer, Liveboard, SQLView, Table, View, Worksheet
-from thoughtspot_tml.utils import determine_tml_type
+from thoughtspot_tml.utils import DisambiguationReport, determine_tml_type, disambiguate
 
 if TYPE_CHECKING:
-    from thoughtspot_tml.types import EDocExportResponses, SpotAppInfo, TMLDocInfo, TMLObject
+    from types import TracebackType
+    from typing import Any, Iterator, Tuple, Type, TypeVar, Union
+
+    from thoughtspot_tml._tml import TML
+    from thoughtspot_tml.types import GUID, EDocExportResponses, SpotAppInfo, TMLDocInfo, TMLObject
+
+    T = TypeVar("T")
+
+
+_MANIFEST = "Manifest.yaml"
+_DISAMBIGUATE_OPTIONS: Dict[str, Any] = {}
+_COMPRESSION = {
+    "stored": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    # AVAILABLE IN PYTHON 3.14
+    "zstd": getattr(zipfile, "ZIP_ZSTANDARD", None),
+}
 
 
 @dataclass
@@ -20,6 +42,200 @@ class Manifest:
     object: List[TMLDocInfo]
 
 
+def _read_member(archive: zipfile.ZipFile, filename: str) -> str:
+    try:
+        return archive.read(filename).decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise TMLError(f"could not read '{filename}' from the SpotApp, {e}") from None
+
+
+def _load_member(archive: zipfile.ZipFile, filename: str, *, lazy: bool = False) -> TML:
+    member_path = pathlib.Path(filename)
+    tml_cls = determine_tml_type(path=member_path)
+    parsed = bulk._parse_text(member_path, tml_cls, _read_member(archive, filename))
+    _, tml = bulk._build(parsed, lazy=lazy)
+
+    if isinstance(tml, TMLError):
+        raise tml
+
+    return tml
+
+
+def _load_members(path: pathlib.Path, filenames: List[str]) -> List[TML]:
+    # This runs in the worker, each worker opens its own handle to the archive.
+    _reduction.register()
+
+    with zipfile.ZipFile(path, mode="r") as archive:
+        return [_load_member(archive, filename) for filename in filenames]
+
+
+def _init_disambiguate_worker(options: Dict[str, Any]) -> None:
+    # The mapping is sent once to each worker, rather than with every batch.
+    _DISAMBIGUATE_OPTIONS.update(options)
+
+
+def _disambiguate_batch(
+    path: Optional[pathlib.Path],
+    batch: List[Union[TMLObject, str]],
+) -> List[Tuple[TMLObject, DisambiguationReport]]:
+    # This runs in the worker, unread TML of a lazy SpotApp arrive as their filename.
+    _reduction.register()
+    results = []
+    archive = None if path is None else zipfile.ZipFile(path, mode="r")
+
+    try:
+        for item in batch:
+            tml = _load_member(archive, item, lazy=True) if isinstance(item, str) else item  # type: ignore[arg-type]
+            report = DisambiguationReport()
+            disambiguate(tml, report=report, **_DISAMBIGUATE_OPTIONS)  # type: ignore[arg-type]
+            results.append((tml, report))
+    finally:
+        if archive is not None:
+            archive.close()
+
+    return results  # type: ignore[return-value]
+
+
+def _copy_without_manifest(path: pathlib.Path) -> List[TMLDocInfo]:
+    """
+    Rewrite an archive without its Manifest, returning the Manifest's entries.
+
+    The archive is left untouched if it has no Manifest.
+    """
+    with zipfile.ZipFile(path, mode="r") as archive:
+        infos = archive.infolist()
+
+        if not any(info.filename == _MANIFEST for info in infos):
+            return []
+
+        # an archive written by another tool may hold older copies of the Manifest, the last one wins
+        entries = _yaml.load(_read_member(archive, _MANIFEST))["object"]
+        fd, temp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, mode="wb") as stream, zipfile.ZipFile(stream, mode="w") as rewritten:
+                for info in infos:
+                    if info.filename == _MANIFEST:
+                        continue
+
+                    copied = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                    copied.compress_type = info.compress_type
+                    copied.external_attr = info.external_attr
+                    copied.comment = info.comment
+
+                    with archive.open(info, mode="r") as source, rewritten.open(copied, mode="w") as target:
+                        shutil.copyfileobj(source, target)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    os.replace(temp, path)
+    return entries
+
+
+class LazyTML(Sequence):
+    """
+    The TML of a SpotApp archive, which are only read from file as they're accessed.
+
+    Each TML document's type, guid, and name are answered from the archive's Manifest
+    without reading the document itself, when the Manifest is available.
+    """
+
+    def __init__(self, path: pathlib.Path, filenames: List[str], manifest: Optional[Manifest] = None):
+        self.path = path
+        self.filenames = filenames
+        self._info: Dict[str, TMLDocInfo] = {} if manifest is None else {i["filename"]: i for i in manifest.object}
+        self._loaded: Dict[int, TMLObject] = {}
+        self._archive: Optional[zipfile.ZipFile] = None
+
+    def __len__(self) -> int:
+        return len(self.filenames)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        index = self._check_index(index)
+
+        try:
+            return self._loaded[index]
+        except KeyError:
+            pass
+
+        if self._archive is None:
+            self._archive = zipfile.ZipFile(self.path, mode="r")
+
+        filename = self.filenames[index]
+        text = _read_member(self._archive, filename)
+        tml = self._loaded[index] = self.tml_type(index).loads(text, lazy=True)  # type: ignore[assignment]
+        return tml
+
+    def __iter__(self) -> Iterator[TMLObject]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (list, LazyTML)):
+            return NotImplemented
+
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"<LazyTML '{self.path}' loaded {len(self._loaded)} of {len(self)} TML>"
+
+    def _check_index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("LazyTML index out of range")
+
+        return index
+
+    def tml_type(self, index: int) -> Type[TMLObject]:
+        """Get the TML class of a document, without reading it."""
+        filename = self.filenames[self._check_index(index)]
+
+        if filename in self._info:
+            return determine_tml_type(info=self._info[filename])  # type: ignore[return-value]
+
+        return determine_tml_type(path=pathlib.Path(filename))  # type: ignore[return-value]
+
+    def guid(self, index: int) -> Optional[GUID]:
+        """Get the guid of a document, reading it only if the Manifest doesn't have it."""
+        filename = self.filenames[self._check_index(index)]
+
+        if filename in self._info:
+            return self._info[filename]["id"]
+
+        return self[index].guid
+
+    def name(self, index: int) -> str:
+        """Get the name of a document, reading it only if the Manifest doesn't have it."""
+        filename = self.filenames[self._check_index(index)]
+
+        if filename in self._info:
+            return self._info[filename]["name"]
+
+        return self[index].name
+
+    def is_loaded(self, index: int) -> bool:
+        """Determine if a document has already been read from file."""
+        return self._check_index(index) in self._loaded
+
+    def of_type(self, tml_cls: Type[T]) -> List[T]:
+        """Read only the documents of a given TML type."""
+        return [self[i] for i in range(len(self)) if issubclass(self.tml_type(i), tml_cls)]
+
+    def close(self) -> None:
+        """Close the archive, it's re-opened if any unread TML is accessed."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+
 @dataclass
 class SpotApp:
     """
@@ -31,29 +247,56 @@ class SpotApp:
     tml: List[TMLObject]
     manifest: Optional[Manifest] = None
 
+    def _of_type(self, tml_cls: Type[T]) -> List[T]:
+        if isinstance(self.tml, LazyTML):
+            return self.tml.of_type(tml_cls)
+
+        return [tml for tml in self.tml if isinstance(tml, tml_cls)]
+
+    def __enter__(self) -> SpotApp:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the archive handle held by a lazily read SpotApp.
+
+        TML which has already been read stays available, and any unread TML which is accessed
+        later re-opens the archive. SpotApps which aren't lazy hold no handle.
+        """
+        if isinstance(self.tml, LazyTML):
+            self.tml.close()
+
     @property
     def tables(self) -> List[Table]:
-        return [tml for tml in self.tml if isinstance(tml, Table)]
+        return self._of_type(Table)
 
     @property
     def views(self) -> List[View]:
-        return [tml for tml in self.tml if isinstance(tml, View)]
+        return self._of_type(View)
 
     @property
     def sql_views(self) -> List[SQLView]:
-        return [tml for tml in self.tml if isinstance(tml, SQLView)]
+        return self._of_type(SQLView)
 
     @property
     def worksheets(self) -> List[Worksheet]:
-        return [tml for tml in self.tml if isinstance(tml, Worksheet)]
+        return self._of_type(Worksheet)
 
     @property
     def answers(self) -> List[Answer]:
-        return [tml for tml in self.tml if isinstance(tml, Answer)]
+        return self._of_type(Answer)
 
     @property
     def liveboards(self) -> List[Liveboard]:
-        return [tml for tml in self.tml if isinstance(tml, Liveboard)]
+        return self._of_type(Liveboard)
 
     @classmethod
     def from_api(cls, payload: EDocExportResponses) -> SpotApp:
@@ -82,7 +325,14 @@ class SpotApp:
         return cls(**info)
 
     @classmethod
-    def read(cls, path: pathlib.Path) -> SpotApp:
+    def read(
+        cls,
+        path: pathlib.Path,
+        *,
+        lazy: bool = False,
+        workers: Optional[int] = None,
+        batch_size: int = 16,
+    ) -> SpotApp:
         """
         Load the SpotApp from file.
 
@@ -90,25 +340,127 @@ class SpotApp:
         ----------
         path : pathlib.Path
           filepath to read the SpotApp from
+
+        lazy : bool, default False
+          whether to defer reading each TML until it's first accessed, and then building its
+          nested objects until they're first accessed
+
+        workers : int, default None
+          number of worker processes to read the TML with, by default they're read one at a time
+
+        batch_size : int, default 16
+          number of TML each worker reads per task, ignored without workers
         """
         info: SpotAppInfo = {"tml": [], "manifest": None}
 
         with zipfile.ZipFile(path, mode="r") as archive:
-            for member in archive.infolist():
-                path = ZipPath(archive, at=member.filename)
+            filenames = [member.filename for member in archive.infolist() if not member.is_dir()]
+
+            if _MANIFEST in filenames:
+                # an appended archive may hold older copies of the Manifest, the last one wins
+                filenames = [filename for filename in filenames if filename != _MANIFEST]
+                document = _yaml.load(_read_member(archive, _MANIFEST))
+                info["manifest"] = Manifest(**document)
+
+            if lazy:
+                info["tml"] = LazyTML(pathlib.Path(path), filenames, manifest=info["manifest"])  # type: ignore[typeddict-item]
+                return cls(**info)
+
+            if workers is None:
+                info["tml"] = [_load_member(archive, filename) for filename in filenames]  # type: ignore[misc]
+                return cls(**info)
+
+        _reduction.register()
 
-                if member.filename == "Manifest.yaml":
-                    document = _yaml.load(path.read_text())
-                    info["manifest"] = Manifest(**document)
-                    continue
+        with cf.ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = bulk._batched(filenames, batch_size)
+            futures = [pool.submit(_load_members, pathlib.Path(path), batch) for batch in batches]
 
-                tml_cls = determine_tml_type(path=pathlib.Path(member.filename))
-                tml = tml_cls.load(path)
-                info["tml"].append(tml)  # type: ignore[arg-type]
+            for future in futures:
+                info["tml"].extend(future.result())  # type: ignore[arg-type]
 
         return cls(**info)
 
-    def save(self, path: pathlib.Path) -> None:
+    def disambiguate(
+        self,
+        guid_mapping: Dict[str, GUID],
+        *,
+        remap_object_guid: bool = True,
+        delete_unmapped_guids: bool = False,
+        workers: Optional[int] = None,
+        batch_size: int = 16,
+    ) -> List[DisambiguationReport]:
+        """
+        Add FQNs to every TML in the SpotApp.
+
+        Parameters
+        ----------
+        guid_mapping : {str: GUID}
+          a mapping of names or guids, to the FQN to add to the object
+
+        remap_object_guid : bool = True
+          whether or not to remap each tml.guid
+
+        delete_unmapped_guids : bool = False
+          if a match could not be found, set the FQN and object guid to None
+
+        workers : int, default None
+          number of worker processes to disambiguate with, by default it's done one at a time
+          .. each TML is replaced by the remapped copy which comes back from its worker
+
+        batch_size : int, default 16
+          number of TML each worker disambiguates per task, ignored without workers
+
+        Returns
+        -------
+        a DisambiguationReport for each TML, in order
+        """
+        options = {
+            # a snapshot of the mapping, shared by every TML and sent once to each worker
+            "guid_mapping": dict(guid_mapping),
+            "remap_object_guid": remap_object_guid,
+            "delete_unmapped_guids": delete_unmapped_guids,
+        }
+
+        if workers is None:
+            reports = [DisambiguationReport() for _ in range(len(self.tml))]
+
+            for tml, report in zip(self.tml, reports):
+                disambiguate(tml, report=report, **options)  # type: ignore[arg-type]
+
+            return reports
+
+        path = None
+        items: List[Union[TMLObject, str]]
+
+        if isinstance(self.tml, LazyTML):
+            path = self.tml.path
+            items = [self.tml[i] if self.tml.is_loaded(i) else self.tml.filenames[i] for i in range(len(self.tml))]
+        else:
+            items = list(self.tml)
+
+        results: List[Tuple[TMLObject, DisambiguationReport]] = []
+        _reduction.register()
+
+        with cf.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_disambiguate_worker,
+            initargs=(options,),
+        ) as pool:
+            futures = [pool.submit(_disambiguate_batch, path, batch) for batch in bulk._batched(items, batch_size)]
+
+            for future in futures:
+                results.extend(future.result())
+
+        for index, (tml, _) in enumerate(results):
+            if isinstance(self.tml, LazyTML):
+                self.tml._loaded[index] = tml
+            else:
+                self.tml[index] = tml
+
+        return [report for _, report in results]
+
+    def save(self, path: pathlib.Path, *, compression: str = "stored", manifest: bool = False) -> None:
         """
         Save the SpotApp to file.
 
@@ -116,9 +468,139 @@ class SpotApp:
         ----------
         path : pathlib.Path
           filepath to save the zip file to
+
+        compression : str, default 'stored'
+          how to compress each TML .. one of, 'stored', 'deflate', or 'zstd' (python 3.14+)
+
+        manifest : bool, default False
+          whether to write a Manifest.yaml, built from this SpotApp's Manifest and its TML
         """
-        with zipfile.ZipFile(path, mode="w") as archive:
+        infos = {} if self.manifest is None else {info["id"]: info for info in self.manifest.object}
+
+        with SpotAppWriter(path, compression=compression, manifest=manifest) as writer:
             for edoc in self.tml:
-                edoc_type = type(edoc).__name__.lower()
-                document = edoc.dumps()
-                archive.writestr(f"{edoc.name}.{edoc_type}.tml", data=document)
+                filename = f"{edoc.name}.{type(edoc).__name__.lower()}.tml"
+                writer.write(edoc, filename=filename, info=infos.get(edoc.guid))
+
+
+class SpotAppWriter:
+    """
+    Write TML to a SpotApp zip file archive, one at a time.
+
+    Each TML is compressed as it's serialized, so only one TML is held in memory at once.
+    The Manifest is written when the writer is closed.
+
+    Members of a zip file can't be removed, so when appending to an archive which already
+    has a Manifest, its other members are first copied into a new archive without it.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+      filepath to write the zip file to
+
+    mode : str, default 'w'
+      'w' to write a new archive, or 'a' to add TML to an existing archive
+
+    compression : str, default 'deflate'
+      how to compress each TML .. one of, 'stored', 'deflate', or 'zstd' (python 3.14+)
+
+    compresslevel : int, default None
+      level of compression to use, the default of the compression method if not given
+
+    manifest : bool, default True
+      whether to write a Manifest.yaml when the writer is closed
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        *,
+        mode: str = "w",
+        compression: str = "deflate",
+        compresslevel: Optional[int] = None,
+        manifest: bool = True,
+    ):
+        if mode not in ("w", "a"):
+            raise ValueError(f"mode must be either 'w' or 'a' .. got, '{mode}'")
+
+        if compression not in _COMPRESSION:
+            raise ValueError(f"compression must be one of {', '.join(_COMPRESSION)} .. got, '{compression}'")
+
+        method = _COMPRESSION[compression]
+
+        if method is None:
+            raise ValueError(f"compression '{compression}' is not supported by this version of python")
+
+        self.path = path
+        self.manifest = Manifest(object=[])
+        self._write_manifest = manifest
+
+        if mode == "a" and zipfile.is_zipfile(path):
+            self.manifest.object.extend(_copy_without_manifest(pathlib.Path(path)))
+
+        self._archive = zipfile.ZipFile(path, mode=mode, compression=method, compresslevel=compresslevel)  # type: ignore[call-overload]
+
+    def __enter__(self) -> SpotAppWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def write(self, tml: TMLObject, *, filename: Optional[str] = None, info: Optional[TMLDocInfo] = None) -> str:
+        """
+        Serialize a TML object into the archive.
+
+        Parameters
+        ----------
+        tml : TMLObject
+          the TML object to write
+
+        filename : str, default '{name}.{type}.tml'
+          name of the file to write the TML to, within the archive
+
+        info : TMLDocInfo, default None
+          Manifest entry for the TML, it's built from the TML object if not given
+
+        Returns
+        -------
+        filename : str
+        """
+        if filename is None:
+            filename = f"{tml.name}.{tml.tml_type_name}.tml"
+
+        # match the permissions of ZipFile.writestr()
+        member_info = zipfile.ZipInfo(filename, date_time=time.localtime(time.time())[:6])
+        member_info.compress_type = self._archive.compression
+        member_info.external_attr = 0o600 << 16
+
+        with self._archive.open(member_info, mode="w") as member:
+            _yaml.dump_to_stream(tml._to_dict(drop_empty=True), member)
+
+        if info is None:
+            info = {  # type: ignore[assignment]
+                "name": tml.name,
+                "filename": filename,
+                "status": {"status_code": "OK"},
+                "type": tml.tml_type_name,
+                "id": tml.guid,
+            }
+
+        self.manifest.object.append({**info, "filename": filename})  # type: ignore[typeddict-item]
+        return filename
+
+    def close(self) -> None:
+        """Write the Manifest, and close the archive."""
+        if self._archive.fp is None:
+            return
+
+        try:
+            if self._write_manifest:
+                document = _yaml.dump({"object": self.manifest.object})
+                self._archive.writestr(_MANIFEST, document)
+        finally:
+            self._archive.close()
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
-from typing import TYPE_CHECKING, Any, Dict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 import copy
-import json
 import uuid
 
-from thoughtspot_tml import _scriptability, _tml, _yaml
+from thoughtspot_tml import _encode, _scriptability, _tml
 
 if TYPE_CHECKING:
     from typing import Optional
@@ -33,9 +32,9 @@ class Connection(_tml.TML):
         return self.connection.name
 
     @classmethod
-    def _loads(cls, tml_document):
+    def _loads(cls, tml_document, *, format_type="YAML"):
         # Handle backwards incompatible changes.
-        document = _yaml.load(tml_document)
+        document = super()._loads(tml_document, format_type=format_type)
 
         # DEV NOTE: @boonhapus, 2024/02/14
         # Connections do not offer a TML component, so we'll fake it.
@@ -46,9 +45,9 @@ class Connection(_tml.TML):
         return document
 
     @classmethod
-    def load(cls, path):
+    def load(cls, path, *, lazy=False, cache=None, intern=None):
         # Handle backwards incompatible changes.
-        instance = super().load(path)
+        instance = super().load(path, lazy=lazy, cache=cache, intern=intern)
 
         # DEV NOTE: @boonhapus, 2024/02/14
         # Connections do not offer a TML component, so we'll fake it.
@@ -61,14 +60,14 @@ class Connection(_tml.TML):
 
         return instance
 
-    def _to_dict(self):
+    def _to_dict(self, *, drop_empty=False):
         # Handle backwards incompatible changes.
 
         # DEV NOTE: @boonhapus, 2024/02/14
         # Connections do not offer a TML component, so we'll fake it.
 
-        data = asdict(self)
-        return data["connection"]
+        data = _encode.encode_value(self.connection, drop_empty=drop_empty)
+        return data
 
     def to_rest_api_v1_metadata(self) -> ConnectionMetadata:
         """
@@ -209,32 +208,6 @@ class Worksheet(_tml.TML):
         """
         return self.worksheet.schema is not None
 
-    @classmethod
-    def _loads(cls, tml_document: str) -> Dict[str, Any]:
-        # Handle backwards incompatible changes.
-
-        # DEV NOTE: @boonhapus, 2024/02/14
-        # The Worksheet V2 update include a python reserved word in the spec, which
-        # python-betterproto automatically adds a trailing sunder to. This reverses it.
-        if "with:" in tml_document:
-            tml_document = tml_document.replace("- with:", "- with_:")
-
-        return _yaml.load(tml_document)
-
-    def _to_dict(self) -> Dict[str, Any]:
-        # Handle backwards incompatible changes.
-        data = asdict(self)
-
-        # DEV NOTE: @boonhapus, 2024/02/14
-        # The Worksheet V2 update include a python reserved word in the spec, which
-        # python-betterproto automatically adds a trailing sunder to. This reverses it.
-        if self.is_model:
-            text = json.dumps(data)
-            text = text.replace('"with_"', '"with"')
-            data = json.loads(text)
-
-        return data
-
 
 @dataclass
 class Answer(_tml.TML):
@@ -264,9 +237,9 @@ class Liveboard(_tml.TML):
         return self.liveboard.name
 
     @classmethod
-    def _loads(cls, tml_document):
+    def _loads(cls, tml_document, *, format_type="YAML"):
         # Handle backwards incompatible changes.
-        document = _yaml.load(tml_document)
+        document = super()._loads(tml_document, format_type=format_type)
 
         # @boonhapus, 2022/11/25
         # SCAL-134095 - SpotApp export_associated uses `pinboard` for Liveboard edoc
@@ -293,8 +266,8 @@ class Pinboard(_tml.TML):
         return self.pinboard.name
 
     @classmethod
-    def _loads(cls, tml_document):
-        document = _yaml.load(tml_document)
+    def _loads(cls, tml_document, *, format_type="YAML"):
+        document = super()._loads(tml_document, format_type=format_type)
 
         # @boonhapus, 2022/11/25
         # SCAL-134095 - SpotApp export_associated uses `pinboard` for Liveboard edoc
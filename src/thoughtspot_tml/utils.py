@@ -1,37 +1,60 @@
 from __future__ import annotations
 
-from dataclasses import fields, is_dataclass
+from dataclasses import dataclass, is_dataclass
 from typing import TYPE_CHECKING
+import dataclasses
+import functools
+import io
+import itertools as it
 import json
 import logging
 import pathlib
+import uuid
 import warnings
 
-from thoughtspot_tml import _compat, _scriptability
-from thoughtspot_tml.exceptions import MissingGUIDMappedValueWarning, TMLDisambiguationError, TMLError
+import graphlib
+import yaml
+
+from thoughtspot_tml import _guid_mapping, _lazy, _schema, _scriptability, _yaml
+from thoughtspot_tml._schema import FieldKind
+from thoughtspot_tml.exceptions import MissingGUIDMappedValueWarning, TMLDecodeError, TMLDisambiguationError, TMLError
 from thoughtspot_tml.tml import Answer, Connection, Liveboard, Pinboard, SQLView, Table, View, Worksheet
 
 if TYPE_CHECKING:
-    from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type, Union
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, Union
 
+    from thoughtspot_tml.cache import ParseCache
+    from thoughtspot_tml.interning import InternPool
     from thoughtspot_tml.types import GUID, TMLDocInfo, TMLObject
 
 
 _UNDEFINED = object()
 log = logging.getLogger(__name__)
 
+_TML_TYPES = {
+    "connection": Connection,
+    "table": Table,
+    "view": View,
+    "sql_view": SQLView,
+    "sqlview": SQLView,
+    "worksheet": Worksheet,
+    "answer": Answer,
+    "liveboard": Liveboard,
+    "pinboard": Pinboard,
+}
+
 
 def _recursive_scan(scriptability_object: Any, *, check: Optional[Callable[[Any], bool]] = None) -> List[Any]:
     collect = []
-    is_container_type = lambda t: len(_compat.get_args(t)) > 0  # noqa: E731
 
-    for field in fields(scriptability_object):
+    for field in _schema.schema_of(_lazy.base_class(type(scriptability_object))).fields:
         child = getattr(scriptability_object, field.name)
 
         if child is None:
             continue
 
-        elements = child if is_container_type(field.type) else [child]
+        # a map is iterated like any other container, so only its keys are scanned
+        elements = child if field.kind in (FieldKind.LIST, FieldKind.MAP) else (child,)
 
         for element in elements:
             if is_dataclass(element):
@@ -43,6 +66,138 @@ def _recursive_scan(scriptability_object: Any, *, check: Optional[Callable[[Any]
     return collect
 
 
+def _collect_instances(instance: Any, target: type, found: List[Any]) -> None:
+    for field in _schema.fields_to(_lazy.base_class(type(instance)), target):
+        try:
+            value = getattr(instance, field.name)
+        except AttributeError:
+            # an unselected oneof field
+            continue
+
+        if value is None:
+            continue
+
+        if field.kind is FieldKind.LIST:
+            elements = value
+        elif field.kind is FieldKind.MAP:
+            elements = value.values()
+        else:
+            elements = (value,)
+
+        for element in elements:
+            if not is_dataclass(element):
+                continue
+
+            _collect_instances(element, target, found)
+
+            if isinstance(element, target):
+                found.append(element)
+
+
+def _find_instances(tml: Any, target: type) -> List[Any]:
+    """
+    Find all the instances of a _scriptability class, nested anywhere within the TML.
+
+    Only the branches which the schema says can contain the target are visited. Instances
+    are found in the same order as _recursive_scan(), though map values are also searched.
+    """
+    found: List[Any] = []
+    _collect_instances(tml, target, found)
+    return found
+
+
+def _collect_paths(instance: Any, targets: Tuple[type, ...], prefix: str, found: List[Tuple[str, Any]]) -> None:
+    for field in _schema.fields_to_any(_lazy.base_class(type(instance)), targets):
+        try:
+            value = getattr(instance, field.name)
+        except AttributeError:
+            # an unselected oneof field
+            continue
+
+        if value is None:
+            continue
+
+        elements: Iterable[Tuple[str, Any]]
+
+        if field.kind is FieldKind.LIST:
+            elements = ((f"{prefix}{field.key}[{i}]", element) for i, element in enumerate(value))
+        elif field.kind is FieldKind.MAP:
+            elements = ((f"{prefix}{field.key}[{key}]", element) for key, element in value.items())
+        else:
+            elements = ((f"{prefix}{field.key}", value),)
+
+        for path, element in elements:
+            if not is_dataclass(element):
+                continue
+
+            if isinstance(element, targets):
+                found.append((path, element))
+
+            _collect_paths(element, targets, f"{path}.", found)
+
+
+def _find_instances_with_paths(tml: Any, targets: Tuple[type, ...]) -> List[Tuple[str, Any]]:
+    """
+    Find all the instances of several _scriptability classes, along with their field path.
+
+    Paths use the TML keys, eg. worksheet.tables[0]. Outer instances are found before those
+    nested within them.
+    """
+    found: List[Tuple[str, Any]] = []
+    _collect_paths(tml, targets, "", found)
+    return found
+
+
+def _sniff_tml_type(lines: Iterable[str]) -> str:
+    """Find the TML type from the first top-level key in the YAML, which holds a collection."""
+    return next(
+        (
+            # 3. remove the trailing colon, unless it's a connection.yaml then remap
+            "connection" if line == "properties:" else line[:-1]
+            # 1. scan the file's text, stopping at the first match
+            for line in (line.rstrip("\r\n") for line in lines)
+            # 2. look for top-level keys in the YAML
+            if line.endswith(":")
+            if not line.startswith(" ")
+        ),
+        # 4. if no matches found (eg. StopIteration is raised), use the default value
+        "NOT_FOUND",
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _sniff_tml_type_from_file(path: str, mtime_ns: int, size: int) -> str:  # noqa: ARG001
+    # mtime_ns and size are unused, they're in the cache key so that edits to the file are picked up
+    with open(path, encoding="utf-8") as stream:
+        return _sniff_tml_type(stream)
+
+
+def _tml_type_from_filename(path: pathlib.Path) -> Optional[str]:
+    if path.name.endswith(".tml"):
+        name_and_type_suffix, _, _ = path.name.rpartition(".tml")
+        _, _, tml_type = name_and_type_suffix.rpartition(".")
+        return tml_type
+
+    if path.name.lower() == "connection.yaml":
+        return "connection"
+
+    return None
+
+
+def _find_tml_files(directory: pathlib.Path, *, recursive: bool = True) -> List[pathlib.Path]:
+    """Find all files which are named like TML, in filepath order."""
+    paths = directory.rglob("*") if recursive else directory.iterdir()
+    return sorted(path for path in paths if path.is_file() and _tml_type_from_filename(path) is not None)
+
+
+def _guid_from_filename(path: pathlib.Path) -> Optional[GUID]:
+    # Connections do not offer a TML component, so the guid may come from the filename.
+    try:
+        return str(uuid.UUID(path.name.partition(".")[0], version=4))
+    except ValueError:
+        return None
+
+
 def determine_tml_type(
     *,
     info: Optional[TMLDocInfo] = None,
@@ -66,40 +221,16 @@ def determine_tml_type(
     if info is None and path is None:
         raise TypeError("determine_tml_type() missing at least 1 required keyword-only argument: 'info' or 'path'")
 
-    types = {
-        "connection": Connection,
-        "table": Table,
-        "view": View,
-        "sql_view": SQLView,
-        "sqlview": SQLView,
-        "worksheet": Worksheet,
-        "answer": Answer,
-        "liveboard": Liveboard,
-        "pinboard": Pinboard,
-    }
+    types = _TML_TYPES
 
     if path is not None:
         path = pathlib.Path(path)
 
-        if path.name.endswith(".tml"):
-            name_and_type_suffix, _, _ = path.name.rpartition(".tml")
-            _, _, tml_type = name_and_type_suffix.rpartition(".")
-        elif path.name.lower() == "connection.yaml":
-            tml_type = "connection"
-        else:
-            tml_type = next(
-                (
-                    # 3. remove the trailing colon, unless it's a connection.yaml then remap
-                    "connection" if line == "properties:" else line[:-1]
-                    # 1. scan the file's text
-                    for line in path.read_text().split("\n")
-                    # 2. look for top-level keys in the YAML
-                    if line.endswith(":")
-                    if not line.startswith(" ")
-                ),
-                # 4. if no matches found (eg. StopIteration is raised), use the default value
-                "NOT_FOUND",
-            )
+        tml_type = _tml_type_from_filename(path)
+
+        if tml_type is None:
+            stat = path.stat()
+            tml_type = _sniff_tml_type_from_file(str(path), stat.st_mtime_ns, stat.st_size)
 
     if info is not None:
         tml_type = info.get("type", "NOT_FOUND")
@@ -118,7 +249,462 @@ def determine_tml_type(
     return types[tml_type]
 
 
-class EnvironmentGUIDMapper:
+def _tml_type_of_document(path: pathlib.Path, tml_document: str) -> type:
+    """
+    Get the TML class of a document which has already been read from path.
+
+    Like determine_tml_type(path=path), but the file isn't read again to sniff its type.
+    """
+    tml_type = _tml_type_from_filename(path) or _sniff_tml_type(io.StringIO(tml_document))
+
+    try:
+        return _TML_TYPES[tml_type]
+    except KeyError:
+        lines = [f"could not parse TML type from 'info' or 'path', got '{tml_type}'", f"from path, '{path}'"]
+        raise TMLError("\n".join(lines)) from None
+
+
+def load_any(
+    path: pathlib.Path,
+    *,
+    lazy: bool = False,
+    cache: Optional[ParseCache] = None,
+    intern: Optional[InternPool] = None,
+) -> Union[Connection, TMLObject]:
+    """
+    Deserialize a TML document of any type located at filepath to a Python object.
+
+    This is equivalent to determine_tml_type(path=path).load(path), but the file is only
+    read once.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+      filepath to load the TML document from
+
+    lazy : bool, default False
+      whether to defer building nested objects until they're first accessed
+
+    cache : ParseCache, default None
+      an on-disk cache of parsed TML, documents which haven't changed aren't parsed again
+
+    intern : InternPool, default None
+      a pool to share identifiers (names, ids, fqns, ..) with every other document loaded,
+      objects served from the cache are not interned
+
+    Raises
+    ------
+    TMLError, when a valid TML type could not be found based on input
+    TMLDecodeError, when the document string cannot be parsed or receives extra data
+    """
+    path = pathlib.Path(path)
+    tml_document = path.read_text(encoding="utf-8")
+    tml_cls = _tml_type_of_document(path, tml_document)
+    instance: Optional[Union[Connection, TMLObject]] = None
+
+    if cache is not None:
+        key = cache.key(tml_cls, tml_document, lazy=lazy)
+        instance = cache.get(key)  # type: ignore[assignment]
+
+    if instance is None:
+        try:
+            instance = tml_cls.loads(tml_document, lazy=lazy, intern=intern)  # type: ignore[attr-defined]
+        except TMLDecodeError as e:
+            e.path = path
+            raise e from None
+
+        if cache is not None:
+            cache.put(key, instance)
+
+    if isinstance(instance, Connection):
+        instance.guid = _guid_from_filename(path) or instance.guid
+
+    return instance
+
+
+@dataclass(frozen=True)
+class TMLHeader:
+    """
+    The identifying details of a TML file, as found by scan_header().
+
+    Attributes
+    ----------
+    path : pathlib.Path
+      the file which was scanned
+
+    tml_cls : Type[TMLObject]
+      the TML class which the file can be loaded with
+
+    guid : GUID, optional
+      the top-level guid, if the file has one
+
+    name : str, optional
+      the name of the TML document, if it has one
+    """
+
+    path: pathlib.Path
+    tml_cls: Union[Type[Connection], Type[TMLObject]]
+    guid: Optional[GUID]
+    name: Optional[str]
+
+
+def _skip_value(events: Iterator[yaml.Event], event: yaml.Event) -> None:
+    """Consume the events of a single YAML value, which began with event."""
+    depth = int(isinstance(event, yaml.CollectionStartEvent))
+
+    while depth:
+        event = next(events)
+
+        if isinstance(event, yaml.CollectionStartEvent):
+            depth += 1
+
+        if isinstance(event, yaml.CollectionEndEvent):
+            depth -= 1
+
+
+def _skip_rest_of_collection(events: Iterator[yaml.Event]) -> None:
+    """Consume the remaining events of the current YAML collection."""
+    _skip_value(events, yaml.CollectionStartEvent(anchor=None, tag=None, implicit=True))
+
+
+def _scan_document_name(events: Iterator[yaml.Event]) -> Optional[str]:
+    """Find the name in the edoc mapping, stopping as soon as it's found."""
+    for event in events:
+        if isinstance(event, yaml.MappingEndEvent):
+            break
+
+        key = event.value if isinstance(event, yaml.ScalarEvent) else None
+        event = next(events)
+
+        if key == "name" and isinstance(event, yaml.ScalarEvent):
+            return event.value
+
+        _skip_value(events, event)
+
+    return None
+
+
+def _scan_top_level(stream: Any) -> Tuple[Optional[str], Optional[GUID], Optional[str]]:
+    """
+    Find the TML type, guid, and name, reading only as far into the stream as needed.
+
+    The TML type is the first top-level key which holds a collection, just like the text
+    scan in determine_tml_type().
+    """
+    tml_type = guid = name = None
+    events = yaml.parse(stream, Loader=_yaml.TMLLoader)
+
+    try:
+        for event in events:
+            if isinstance(event, yaml.MappingStartEvent):
+                break
+
+        for event in events:
+            if isinstance(event, yaml.MappingEndEvent):
+                break
+
+            key = event.value if isinstance(event, yaml.ScalarEvent) else None
+            event = next(events)
+
+            if key == "guid" and isinstance(event, yaml.ScalarEvent):
+                guid = event.value
+
+            # Connections (connection.yaml) do not offer a TML component
+            elif key == "name" and isinstance(event, yaml.ScalarEvent):
+                name = event.value
+
+            elif key in _TML_TYPES and isinstance(event, yaml.MappingStartEvent):
+                tml_type = tml_type or key
+                name = _scan_document_name(events)
+
+                # the guid is typically first, but the spec does not guarantee it
+                if guid is None and name is not None:
+                    _skip_rest_of_collection(events)
+
+            else:
+                # scalars like obj_id are never the TML type
+                if isinstance(event, yaml.CollectionStartEvent):
+                    tml_type = tml_type or ("connection" if key == "properties" else key)
+
+                _skip_value(events, event)
+
+            # bare Connections never have a guid
+            if tml_type in _TML_TYPES and name is not None and (guid is not None or tml_type == "connection"):
+                break
+    finally:
+        events.close()
+
+    return tml_type, guid, name
+
+
+def scan_header(path: pathlib.Path) -> TMLHeader:
+    """
+    Get the type, guid, and name of a TML file without fully parsing it.
+
+    The file is read as a stream of YAML events, stopping as soon as all three are found.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+      filepath to scan
+
+    Raises
+    ------
+    TMLError, when a valid TML type could not be found in the file
+    TMLDecodeError, when the file is not valid YAML
+    """
+    path = pathlib.Path(path)
+    tml_cls = None
+
+    if _tml_type_from_filename(path) is not None:
+        tml_cls = determine_tml_type(path=path)
+
+    with path.open(mode="r", encoding="utf-8") as stream:
+        try:
+            tml_type, guid, name = _scan_top_level(stream)
+        except yaml.MarkedYAMLError as e:
+            if tml_cls is None:
+                raise TMLError(f"could not parse TML type from path, '{path}'") from None
+            raise TMLDecodeError(tml_cls, path=path, problem_mark=e.problem_mark) from None  # type: ignore[arg-type]
+
+    if tml_cls is None:
+        try:
+            tml_cls = _TML_TYPES[tml_type]  # type: ignore[index]
+        except KeyError:
+            raise TMLError(f"could not parse TML type from path, '{path}', got '{tml_type}'") from None
+
+    if tml_cls is Connection and guid is None:
+        guid = _guid_from_filename(path)
+
+    return TMLHeader(path=path, tml_cls=tml_cls, guid=guid, name=name)
+
+
+def scan_headers(directory: pathlib.Path, *, recursive: bool = True) -> Iterator[TMLHeader]:
+    """
+    Get the type, guid, and name of all the TML files in a directory.
+
+    TML files are those which end with .tml, as well as any connection.yaml.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+      directory to scan
+
+    recursive : bool, default True
+      whether to scan all subdirectories as well
+
+    Raises
+    ------
+    TMLError, when a valid TML type could not be found in a file
+    TMLDecodeError, when a file is not valid YAML
+    """
+    for path in _find_tml_files(pathlib.Path(directory), recursive=recursive):
+        yield scan_header(path)
+
+
+@dataclass
+class GUIDMappingReport:
+    """
+    A summary of the entries which could not be mapped between two environments.
+
+    Attributes
+    ----------
+    from_environment : str
+      the source environment of the mapping
+
+    to_environment : str
+      the target environment of the mapping
+
+    mapped : int
+      number of guid pairs which were mapped
+
+    missing_from : List[GUID]
+      guids in the target environment, which have no guid in the source environment
+
+    missing_to : List[GUID]
+      guids in the source environment, which have no guid in the target environment
+
+    missing_both : int
+      number of entries which have a guid in neither environment
+    """
+
+    from_environment: str = ""
+    to_environment: str = ""
+    mapped: int = 0
+    missing_from: List[GUID] = dataclasses.field(default_factory=list)
+    missing_to: List[GUID] = dataclasses.field(default_factory=list)
+    missing_both: int = 0
+
+    @property
+    def incomplete(self) -> int:
+        """Number of entries which could not be mapped."""
+        return len(self.missing_from) + len(self.missing_to) + self.missing_both
+
+    def __str__(self) -> str:
+        from_envt, to_envt = self.from_environment, self.to_environment
+        lines = [
+            f"an incomplete mapping has been detected between {from_envt} and {to_envt}, "
+            f"{self.incomplete} of {self.mapped + self.incomplete} entries could not be mapped",
+        ]
+
+        if self.missing_from:
+            n, example = len(self.missing_from), self.missing_from[0]
+            lines.append(f"no GUID found for '{from_envt}' on {n} entries, eg. ({to_envt}='{example}')")
+
+        if self.missing_to:
+            n, example = len(self.missing_to), self.missing_to[0]
+            lines.append(f"no GUID found for '{to_envt}' on {n} entries, eg. ({from_envt}='{example}')")
+
+        if self.missing_both:
+            lines.append(f"no GUID found for either '{from_envt}' or '{to_envt}' on {self.missing_both} entries")
+
+        return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class EnvironmentColumnIndex:
+    """
+    The guids of each environment in an EnvironmentGUIDMapper, as columns.
+
+    Each column is aligned on the mapper's entries, with None where an entry has no guid
+    in that environment. An index is only valid until the mapper is next changed.
+    """
+
+    columns: Dict[str, List[Optional[GUID]]]
+    n_entries: int
+    version: int
+
+    def column(self, environment: str) -> Iterable[Optional[GUID]]:
+        try:
+            return self.columns[environment]
+        except KeyError:
+            return it.repeat(None, self.n_entries)
+
+
+class _GUIDMapperQueries:
+    """
+    Mapping queries shared by the in-memory and memory-mapped mappers.
+    """
+
+    environment_transformer: Callable[[str], str]
+
+    def _pairs(
+        self,
+        from_environment: str,
+        to_environment: str,
+        index: Optional[EnvironmentColumnIndex],
+    ) -> Iterable[Tuple[Optional[GUID], Optional[GUID]]]:
+        raise NotImplementedError
+
+    def iter_mapping(
+        self,
+        from_environment: str,
+        to_environment: str,
+        *,
+        report: Optional[GUIDMappingReport] = None,
+        index: Optional[EnvironmentColumnIndex] = None,
+    ) -> Iterator[Tuple[GUID, GUID]]:
+        """
+        Iterate through all guid pairs between two environments.
+
+        Entries which are missing a guid in either environment are skipped, and recorded on
+        the report if one is given.
+
+        Parameters
+        ----------
+        from_environment : str
+          the source environment to map TML objects from
+
+        to_environment : str
+          the target environment to map TML objects to
+
+        report : GUIDMappingReport, default None
+          summary to record incomplete entries on, as they're found
+
+        index : EnvironmentColumnIndex, default None
+          precomputed columns to read guids from, see build_index()
+        """
+        from_environment = self.environment_transformer(from_environment)
+        to_environment = self.environment_transformer(to_environment)
+
+        if report is None:
+            report = GUIDMappingReport()
+
+        report.from_environment = from_environment
+        report.to_environment = to_environment
+
+        for envt_a, envt_b in self._pairs(from_environment, to_environment, index):
+            if envt_a is not None and envt_b is not None:
+                report.mapped += 1
+                yield envt_a, envt_b
+
+            elif envt_b is not None:
+                report.missing_from.append(envt_b)
+
+            elif envt_a is not None:
+                report.missing_to.append(envt_a)
+
+            else:
+                report.missing_both += 1
+
+    def generate_mapping(
+        self,
+        from_environment: str,
+        to_environment: str,
+        *,
+        index: Optional[EnvironmentColumnIndex] = None,
+    ) -> Dict[GUID, GUID]:
+        """
+        Create a mapping of GUIDs between two environments.
+
+        When any entries are incomplete, a single MissingGUIDMappedValueWarning summarizes them.
+
+        Parameters
+        ----------
+        from_environment : str
+          the source environment to map TML objects from
+
+        to_environment : str
+          the target environment to map TML objects to
+
+        index : EnvironmentColumnIndex, default None
+          precomputed columns to read guids from, see build_index()
+        """
+        report = GUIDMappingReport()
+        mapping = dict(self.iter_mapping(from_environment, to_environment, report=report, index=index))
+
+        if report.incomplete:
+            warnings.warn(str(report), MissingGUIDMappedValueWarning, stacklevel=2)
+
+        return mapping
+
+    def get_environment_guids(
+        self,
+        *,
+        source: str,
+        destination: str,
+        report: Optional[GUIDMappingReport] = None,
+    ) -> Iterator[Tuple[GUID, GUID]]:
+        """
+        Iterate through all guid pairs between source and destination.
+
+        Equivalent to iter_mapping(source, destination, report=report).
+
+        Parameters
+        ----------
+        source : str
+          name of the environment to fetch the source guid from
+
+        destination : str
+          name of the environment to fetch the mapped guid from
+
+        report : GUIDMappingReport, default None
+          summary to record incomplete entries on, as they're found
+        """
+        return self.iter_mapping(source, destination, report=report)
+
+
+class EnvironmentGUIDMapper(_GUIDMapperQueries):
     """
     A dict-like container which maps guids from one environment to another.
 
@@ -162,30 +748,60 @@ class EnvironmentGUIDMapper:
     def __init__(self, environment_transformer: Callable[[str], str] = str.upper):
         self.environment_transformer = environment_transformer
         self._mapping: Dict[str, Dict[str, GUID]] = {}
+        # reverse index of each guid to the keys of the mappings which hold it, in mapping order
+        self._guid_index: Dict[GUID, Dict[str, None]] = {}
+        # bumped on every change, so that an EnvironmentColumnIndex can tell it's stale
+        self._version = 0
+
+    def _index(self, key: str) -> None:
+        for guid in key.split("__"):
+            self._guid_index.setdefault(guid, {})[key] = None
+
+    def _unindex(self, key: str) -> None:
+        for guid in key.split("__"):
+            keys = self._guid_index.get(guid, {})
+            keys.pop(key, None)
+
+            if not keys:
+                self._guid_index.pop(guid, None)
+
+    def _key_of(self, guid: GUID) -> Optional[str]:
+        # the first mapping which holds a guid is the one which answers for it
+        keys = self._guid_index.get(guid)
+        return None if keys is None else next(iter(keys))
+
+    def _set_mapping(self, mapping: Dict[str, Dict[str, GUID]]) -> None:
+        self._mapping = mapping
+        self._guid_index = {}
+        self._version += 1
+
+        for key in mapping:
+            self._index(key)
 
     def __setitem__(self, guid: GUID, value: Tuple[str, GUID]) -> None:
         environment, guid_to_add = value
         environment = self.environment_transformer(environment)
+        old_key = self._key_of(guid)
 
-        try:
-            envts: Dict[str, GUID] = self[guid]
-        except KeyError:
+        if old_key is None:
             new_key = guid_to_add
             envts = {environment: guid_to_add}
         else:
-            old_key = "__".join(envts.values())
-            self._mapping.pop(old_key)
+            envts = self._mapping.pop(old_key)
+            self._unindex(old_key)
 
             envts[environment] = guid_to_add
-            new_key = "__".join(envts.values())  # type: ignore[assignment]
+            new_key = "__".join(envts.values())
 
         self._mapping.setdefault(new_key, {}).update(envts)
+        self._index(new_key)
+        self._version += 1
 
     def __getitem__(self, guid: GUID) -> Dict[str, GUID]:
-        for guids_across_envts, envts in self._mapping.items():
-            if guid in guids_across_envts.split("__"):
-                return envts
-        raise KeyError(f"no environment matches guid, got '{guid}'")
+        try:
+            return self._mapping[self._key_of(guid)]  # type: ignore[index]
+        except KeyError:
+            raise KeyError(f"no environment matches guid, got '{guid}'") from None
 
     def __contains__(self, guid: GUID) -> bool:
         return bool(self.get(guid, default=False))
@@ -219,47 +835,45 @@ class EnvironmentGUIDMapper:
 
         return retval
 
-    def generate_mapping(self, from_environment: str, to_environment: str) -> Dict[GUID, GUID]:
+    def build_index(self) -> EnvironmentColumnIndex:
         """
-        Create a mapping of GUIDs between two environments.
+        Precompute the guids of every environment as columns.
 
-        Parameters
-        ----------
-        from_environment : str
-          the source environment to map TML objects from
-
-        to_environment : str
-          the target environment to map TML objects to
+        This makes repeated iter_mapping() and generate_mapping() queries cheaper, until the
+        mapper is next changed.
         """
-        from_environment = self.environment_transformer(from_environment)
-        to_environment = self.environment_transformer(to_environment)
-        mapping: Dict[GUID, GUID] = {}
+        columns: Dict[str, List[Optional[GUID]]] = {}
 
-        for envts in self._mapping.values():
-            envt_a = envts.get(from_environment, None)
-            envt_b = envts.get(to_environment, None)
+        for entry, envts in enumerate(self._mapping.values()):
+            for environment, guid in envts.items():
+                if environment not in columns:
+                    columns[environment] = [None] * len(self._mapping)
 
-            if None in (envt_a, envt_b):
-                message = [f"an incomplete mapping has been detected between {from_environment} and {to_environment}"]
+                columns[environment][entry] = guid
 
-                if envt_a is None:
-                    message.append(f"no GUID found for '{from_environment}' ({to_environment}='{envt_b}')")
+        return EnvironmentColumnIndex(columns=columns, n_entries=len(self._mapping), version=self._version)
 
-                if envt_b is None:
-                    message.append(f"no GUID found for '{to_environment}' ({from_environment}='{envt_a}')")
+    def _pairs(
+        self,
+        from_environment: str,
+        to_environment: str,
+        index: Optional[EnvironmentColumnIndex],
+    ) -> Iterable[Tuple[Optional[GUID], Optional[GUID]]]:
+        if index is None:
+            return ((envts.get(from_environment), envts.get(to_environment)) for envts in self._mapping.values())
 
-                warnings.warn("\n".join(message), MissingGUIDMappedValueWarning, stacklevel=2)
-                continue
-
-            mapping[envt_a] = envt_b  # type: ignore[assignment, index]
+        if index.version != self._version:
+            raise ValueError("the EnvironmentColumnIndex is out of date, the mapper has changed since it was built")
 
-        return mapping
+        return zip(index.column(from_environment), index.column(to_environment))
 
     @classmethod
     def read(cls, path: pathlib.Path, environment_transformer: Callable[[str], str] = str.upper):
         """
         Load the guid mapping from file.
 
+        Both the JSON and BINARY mapping file formats are supported.
+
         Parameters
         ----------
         path : pathlib.Path
@@ -270,14 +884,18 @@ class EnvironmentGUIDMapper:
         """
         instance = cls(environment_transformer=environment_transformer)
 
+        if _guid_mapping.is_binary_mapping(path):
+            instance._set_mapping(_guid_mapping.read(path))
+            return instance
+
         with pathlib.Path(path).open(mode="r", encoding="UTF-8") as j:
             data = json.load(j)
 
         data.pop("__INFO_for_comments_only", None)
-        instance._mapping = data
+        instance._set_mapping(data)
         return instance
 
-    def save(self, path: pathlib.Path, *, info: Optional[Dict[str, Any]] = None) -> None:
+    def save(self, path: pathlib.Path, *, info: Optional[Dict[str, Any]] = None, format_type: str = "JSON") -> None:
         """
         Save the guid mapping to file.
 
@@ -285,7 +903,24 @@ class EnvironmentGUIDMapper:
         ----------
         path : pathlib.Path
           filepath to save the mapping to
+
+        info : dict, default None
+          extra information to store in the file, ignored by read() and the BINARY format
+
+        format_type : str, default 'JSON'
+          file format to save in .. one of, 'JSON' or 'BINARY'
+
+        Raises
+        ------
+        ValueError, when saving as BINARY and any guid is not a UUID
         """
+        if format_type.upper() not in ("JSON", "BINARY"):
+            raise ValueError(f"format_type must be either 'JSON' or 'BINARY' .. got, '{format_type}'")
+
+        if format_type.upper() == "BINARY":
+            _guid_mapping.write(self._mapping, path)
+            return
+
         data = {}
 
         if info is not None:
@@ -296,25 +931,120 @@ class EnvironmentGUIDMapper:
         with pathlib.Path(path).open(mode="w", encoding="UTF-8") as j:
             json.dump(data, j, indent=4)
 
-    def get_environment_guids(self, *, source: str, destination: str) -> Iterator[Tuple[GUID, GUID]]:
+    def __str__(self) -> str:
+        return json.dumps(self._mapping, indent=4)
+
+
+class MappedEnvironmentGUIDMapper(_GUIDMapperQueries):
+    """
+    A read-only EnvironmentGUIDMapper, backed by a memory-mapped BINARY mapping file.
+
+    Only the parts of the file which are needed to answer a lookup are read, so opening
+    even a very large mapping is instant.
+
+    Usage of this object is as simple as..
+
+    # convert an existing mapping file
+    EnvironmentGUIDMapper.read(path="mapping.json").save(path="mapping.bin", format_type="BINARY")
+
+    with MappedEnvironmentGUIDMapper(path="mapping.bin") as mapper:
+        mapper["guid1"]  # => {"DEV": "guid1", "PROD": "guid3"}
+
+    Attributes
+    ----------
+    environment_transformer : Callable(str) -> str
+      a function which transforms the ENV name before looking it up in the mapping
+    """
+
+    def __init__(self, path: pathlib.Path, environment_transformer: Callable[[str], str] = str.upper):
+        self.environment_transformer = environment_transformer
+        self._file = _guid_mapping.MappedFile(path)
+
+    def __enter__(self) -> MappedEnvironmentGUIDMapper:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory-mapped file."""
+        self._file.close()
+
+    @property
+    def environments(self) -> List[str]:
+        return list(self._file.environments)
+
+    def __len__(self) -> int:
+        return self._file.n_entries
+
+    def __getitem__(self, guid: GUID) -> Dict[str, GUID]:
+        entry = self._file.find(guid)
+
+        if entry is None:
+            raise KeyError(f"no environment matches guid, got '{guid}'")
+
+        return self._file.entry(entry)
+
+    def __contains__(self, guid: GUID) -> bool:
+        return self._file.find(guid) is not None
+
+    def get(self, guid: GUID, *, default: Any = _UNDEFINED) -> Dict[str, GUID]:
         """
-        Iterate through all guid pairs between source and destination.
+        Retrieve a GUID mapping.
 
-        Parameters
-        ----------
-        source : str
-          name of the environment to fetch the source guid from
+        Equivalent to..
 
-        destination : str
-          name of the environment to fetch the mapped guid from
+        d = MappedEnvironmentGUIDMapper(path=...)
+        d[src_guid]
         """
-        for _, environments in self._mapping.items():
-            guid_src = environments[source]
-            guid_dst = environments[destination]
-            yield guid_src, guid_dst
+        try:
+            retval = self[guid]
+        except KeyError as e:
+            if default is _UNDEFINED:
+                raise e from None
+            retval = default
 
-    def __str__(self) -> str:
-        return json.dumps(self._mapping, indent=4)
+        return retval
+
+    def _pairs(
+        self,
+        from_environment: str,
+        to_environment: str,
+        index: Optional[EnvironmentColumnIndex],  # noqa: ARG002
+    ) -> Iterable[Tuple[Optional[GUID], Optional[GUID]]]:
+        # the file is already laid out in columns, it's its own index
+        return self._file.pairs(self._file.column(from_environment), self._file.column(to_environment))
+
+
+@dataclass
+class DisambiguationReport:
+    """
+    A summary of the references which were remapped on a single TML object.
+
+    Attributes
+    ----------
+    guid : GUID
+      the guid of the TML object, before it was remapped
+
+    mapped : int
+      number of references which were found in the mapping
+
+    unmapped : List[str]
+      the fqn (or name, without one) of each reference not found in the mapping, left as-is
+
+    deleted : List[str]
+      the fqn (or name, without one) of each reference not found in the mapping, removed
+    """
+
+    guid: Optional[GUID] = None
+    mapped: int = 0
+    unmapped: List[str] = dataclasses.field(default_factory=list)
+    deleted: List[str] = dataclasses.field(default_factory=list)
+
+    @property
+    def references(self) -> int:
+        """Number of references found on the TML object."""
+        return self.mapped + len(self.unmapped) + len(self.deleted)
 
 
 def disambiguate(
@@ -323,6 +1053,7 @@ def disambiguate(
     guid_mapping: Dict[str, GUID],
     remap_object_guid: bool = True,
     delete_unmapped_guids: bool = False,
+    report: Optional[DisambiguationReport] = None,
 ) -> TMLObject:
     """
     Deep scan the TML looking for fields to add FQNs to.
@@ -343,16 +1074,29 @@ def disambiguate(
 
     delete_unmapped_guids : bool = False
       if a match could not be found, set the FQN and object guid to None
+
+    report : DisambiguationReport, default None
+      if provided, will be filled with the references which were mapped, unmapped, or deleted
     """
-    if remap_object_guid:
+    if report is None:
+        report = DisambiguationReport()
+
+    report.guid = tml.guid
+
+    if remap_object_guid and tml.guid is not None:
         if tml.guid in guid_mapping:
             tml.guid = guid_mapping[tml.guid]
+            report.mapped += 1
 
         elif delete_unmapped_guids:
+            report.deleted.append(tml.guid)
             tml.guid = None  # type: ignore[assignment]
 
+        else:
+            report.unmapped.append(tml.guid)
+
     # DEVNOTE: @boonhapus, might need to add another scan for PinnedVisualization.viz_guid
-    attrs = _recursive_scan(tml, check=lambda attr: isinstance(attr, _scriptability.Identity))
+    attrs = _find_instances(tml, _scriptability.Identity)
 
     if not attrs:
         log.debug(f"could not find any attributes to disambiguate on {tml}")
@@ -361,72 +1105,233 @@ def disambiguate(
         # NAME -> GUID
         if attribute.name in guid_mapping:
             attribute.fqn = guid_mapping[attribute.name]
+            report.mapped += 1
 
         # ENVT_A.GUID -> ENVT_B.GUID
         elif attribute.fqn in guid_mapping:
             attribute.fqn = guid_mapping[attribute.fqn]
+            report.mapped += 1
 
         elif delete_unmapped_guids:
+            report.deleted.append(attribute.fqn or attribute.name)
             attribute.fqn = None
 
+        else:
+            report.unmapped.append(attribute.fqn or attribute.name)
+
     return tml
 
 
+def _dependencies_of(tml: TMLObject) -> Tuple[List[Optional[GUID]], List[Optional[GUID]]]:
+    """
+    Find the FQNs of the objects a TML object depends on, and those it joins to.
+    """
+    relations = _find_instances(tml, _scriptability.RelationEDocProto)
+    join_ends = [identity for relation in relations for identity in (relation.source, relation.destination)]
+    join_end_ids = {id(identity) for identity in join_ends}
+
+    depends_on = [i.fqn for i in _find_instances(tml, _scriptability.Identity) if id(i) not in join_end_ids]
+    depends_on.extend(table.fqn for table in _find_instances(tml, _scriptability.SchemaSchemaTable))
+    joins_to = [identity.fqn for identity in join_ends if identity is not None]
+    return depends_on, joins_to
+
+
+def _strongly_connected(graph: Dict[GUID, Set[GUID]]) -> Dict[GUID, int]:
+    """
+    Label each node in the graph with the strongly connected component it belongs to.
+
+    This is Tarjan's algorithm, unrolled to avoid the recursion limit on deep graphs.
+    """
+    index: Dict[GUID, int] = {}
+    lowlink: Dict[GUID, int] = {}
+    component: Dict[GUID, int] = {}
+    stack: List[GUID] = []
+    on_stack: Set[GUID] = set()
+
+    for root in graph:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            node, edges = work[-1]
+
+            for child in edges:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph[child])))
+                    break
+
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+
+            else:
+                work.pop()
+
+                if work:
+                    parent, _ = work[-1]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    label = len(component)
+
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component[member] = label
+
+                        if member == node:
+                            break
+
+    return component
+
+
+def _reaches(graph: Dict[GUID, Set[GUID]], start: GUID, target: GUID) -> bool:
+    """Determine if there's a path from start to target in the graph."""
+    seen = {start}
+    stack = [start]
+
+    while stack:
+        node = stack.pop()
+
+        if node == target:
+            return True
+
+        for child in graph.get(node, ()):
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+
+    return False
+
+
+def _cyclical_joins(
+    graph: Dict[GUID, Set[GUID]],
+    joins_to: Dict[GUID, Set[GUID]],
+    component: Dict[GUID, int],
+) -> Dict[GUID, Set[GUID]]:
+    """
+    Find the fewest JOINs to defer, so that no cycles are left in the graph.
+
+    Within each strongly connected component, the dependencies are kept and then the JOINs
+    are added back one at a time. Only a JOIN which would close a cycle is deferred.
+    """
+    deferred: Dict[GUID, Set[GUID]] = {guid: set() for guid in graph}
+    kept: Dict[GUID, Set[GUID]] = {}
+    joins: List[Tuple[GUID, GUID]] = []
+
+    for guid, others in graph.items():
+        inside = {other for other in others if component[other] == component[guid]}
+        kept[guid] = inside - joins_to[guid]
+        joins.extend((guid, other) for other in sorted(inside & joins_to[guid]))
+
+    for guid, other in joins:
+        if _reaches(kept, other, guid):
+            deferred[guid].add(other)
+        else:
+            kept[guid].add(other)
+
+    return deferred
+
+
 def _import_sort_order(tmls: List[TMLObject], *, exclude_joins_on: Optional[Set[GUID]] = None) -> Dict[GUID, int]:
     """
     TopSort all of the objects found in tmls.
 
-    If a cycle is found in the TML object graph, attempt to remove JOINs from the
-    equation to create a proper DAG.
+    Each object is assigned an import level, starting from 1. Objects only depend on those
+    in earlier levels, so all the objects in a level may be imported in parallel. Objects
+    which are referenced, but not found in tmls, are assumed to already exist.
+
+    If a cycle is found in the TML object graph, the JOINs which close it are removed from
+    the equation to create a proper DAG. The guids of the objects whose JOINs were deferred
+    are added to exclude_joins_on, they must be imported again after the final level.
 
     The input TMLs must have their FQNs defined.
-    """
-    raise NotImplementedError
 
+    Parameters
+    ----------
+    tmls : List[TMLObject]
+      the objects to import
+
+    exclude_joins_on : Set[GUID], default None
+      guids of the objects whose JOINs should not be considered
+
+    Raises
+    ------
+    TMLDisambiguationError, when an object references another without an FQN
+    TMLError, when objects depend on each other without a JOIN to defer
+    """
     if exclude_joins_on is None:
         exclude_joins_on = set()
 
-    # Check that each TML defines the FQN property.
-    tmls_without_fqn = [tml.guid for tml in tmls if "fqn" not in tml.dumps()]
+    depends_on: Dict[GUID, Set[GUID]] = {}
+    joins_to: Dict[GUID, Set[GUID]] = {}
+    tmls_without_fqn: List[GUID] = []
+
+    for tml in tmls:
+        parents, joins = _dependencies_of(tml)
+
+        if tml.guid in exclude_joins_on:
+            joins = []
+
+        # Check that each TML defines the FQN property.
+        if None in parents or None in joins:
+            tmls_without_fqn.append(tml.guid)
+            continue
+
+        depends_on[tml.guid] = set(parents)  # type: ignore[arg-type]
+        joins_to[tml.guid] = set(joins) - depends_on[tml.guid]  # type: ignore[assignment]
 
     if tmls_without_fqn:
         raise TMLDisambiguationError(tml_guids=tmls_without_fqn)
 
-    return {}
+    graph = {
+        guid: {other for other in depends_on[guid] | joins_to[guid] if other in depends_on and other != guid}
+        for guid in depends_on
+    }
+
+    # Only a JOIN between two objects in the same component can be part of a cycle.
+    component = _strongly_connected(graph)
+    deferred = _cyclical_joins(graph, joins_to, component)
+    sorter: graphlib.TopologicalSorter[GUID] = graphlib.TopologicalSorter()
+    deferred_on: Set[GUID] = set()
+
+    for guid, others in graph.items():
+        if deferred[guid]:
+            deferred_on.add(guid)
+            log.debug(f"deferring JOINs from {guid} to break a cycle, thru.. {', '.join(sorted(deferred[guid]))}")
 
-    # import_order: Dict[GUID, int] = {}
-    # sorter = TopologicalSorter()
-    # import_level = 0
+        sorter.add(guid, *(others - deferred[guid]))
 
-    # # helpers
-    # has_tables = lambda attr: hasattr(attr, "tables") and all(t for t in attr.tables if t.fqn is not None)
-    # is_a_join  = lambda attr: isinstance(attr, _scriptability.RelationEDocProto) and attr.destination is not None
+    try:
+        sorter.prepare()
+    except graphlib.CycleError as e:
+        _, cycle = e.args
+        raise TMLError(f"cyclical dependency found without a JOIN to defer, thru.. {' -> '.join(cycle)}") from None
 
-    # for tml in tmls:
-    #     parents  = [t.fqn for tml in _recursive_scan(tml, check=has_tables) for t in tml.tables]
-    #     joins_to = [] if tml.guid in exclude_joins_on else [j.destination.fqn for j in _recursive_scan(tml, check=is_a_join)]  # noqa: E501
-    #     sorter.add(tml.guid, *parents, *joins_to)
+    if deferred_on:
+        log.warning(
+            f"Cyclical dependency found on {len(deferred_on)} objects, their JOINs must be imported again after "
+            f"the final import level, see log for details..",
+        )
+        exclude_joins_on.update(deferred_on)
 
-    # try:
-    #     sorter.prepare()
-    # except CycleError as e:
-    #     message, (parent_node, *cycles) = e.args
-    #     exclude_joins_on.add(parent_node)
-    #     log.debug(f"{message}, {parent_node} thru..\n{' -> '.join(cycles)}")
-    #     return import_sort_order(tmls, exclude_joins_on=exclude_joins_on)
+    import_order: Dict[GUID, int] = {}
+    import_level = 0
 
-    # if exclude_joins_on:
-    #     log.debug(
-    #         "The prior lines are related to the following cyclically dependent objects. If you are imlpementing a "
-    #         f"batched import process, then the GUIDs found below will need to be retried during a later import level."
-    #     )
-    #     log.warning(f"Cyclical dependency found on {len(exclude_joins_on)} objects, see log for details..")
+    while sorter.is_active():
+        import_level += 1
+        ready = sorter.get_ready()
 
-    # while sorter.is_active():
-    #     import_level += 1
+        for guid in ready:
+            import_order[guid] = import_level
 
-    #     for guid in sorter.get_ready():
-    #         import_order[guid] = import_level
-    #         sorter.done(guid)
+        sorter.done(*ready)
 
-    # return import_order
+    return import_order
@@ -0,0 +1,104 @@
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from thoughtspot_tml import bulk
+from thoughtspot_tml.exceptions import TMLDecodeError, TMLError
+from thoughtspot_tml.tml import Connection, Liveboard, Table, Worksheet
+from ward import each, raises, test
+
+from . import _const
+
+
+@test("load directory with a {executor} pool")
+def _(executor=each("process", "thread")):
+    with tempfile.TemporaryDirectory() as tmp:
+        nested = pathlib.Path(tmp) / "nested"
+        nested.mkdir()
+
+        for path in (_const.DUMMY_TABLE, _const.DUMMY_WORKSHEET, _const.DUMMY_LIVEBOARD, _const.DUMMY_SPOTAPP):
+            shutil.copy(path, tmp)
+
+        shutil.copy(_const.DATA_DIR / "BAD_DUMMY.answer.tml", nested)
+        shutil.copy(_const.DUMMY_CONNECTION, nested / "2ea7add9-0ccb-4ac1-90bb-231794ebb377.connection.tml")
+
+        results = list(bulk.load_directory(tmp, workers=2, executor=executor, ordered=True, batch_size=1))
+
+        assert [path.name for path, _ in results] == [
+            "DUMMY.liveboard.tml",
+            "DUMMY.table.tml",
+            "DUMMY.worksheet.tml",
+            "2ea7add9-0ccb-4ac1-90bb-231794ebb377.connection.tml",
+            "BAD_DUMMY.answer.tml",
+        ]
+
+        liveboard, table, worksheet, connection, error = (tml for _, tml in results)
+        assert liveboard == Liveboard.load(_const.DUMMY_LIVEBOARD)
+        assert table == Table.load(_const.DUMMY_TABLE)
+        assert worksheet == Worksheet.load(_const.DUMMY_WORKSHEET)
+        assert isinstance(connection, Connection)
+        assert connection.guid == "2ea7add9-0ccb-4ac1-90bb-231794ebb377"
+        assert isinstance(error, TMLDecodeError)
+        assert error.path == nested / "BAD_DUMMY.answer.tml"
+
+
+@test("load directory yields errors for unknown TML types")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        pathlib.Path(tmp, "DUMMY.dashboard.tml").write_text("guid: 1\n", encoding="utf-8")
+        shutil.copy(_const.DUMMY_TABLE, tmp)
+
+        results = dict(bulk.load_directory(tmp, executor="thread"))
+
+        assert type(results[pathlib.Path(tmp, "DUMMY.dashboard.tml")]) is TMLError
+        assert type(results[pathlib.Path(tmp, "DUMMY.table.tml")]) is Table
+
+
+@test("parse a file whose TML type is only found in its document")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, "worksheet.yaml")
+        shutil.copy(_const.DUMMY_WORKSHEET, path)
+
+        _, tml = bulk._build(bulk._parse_file(path), lazy=False)
+
+        assert tml == Worksheet.load(_const.DUMMY_WORKSHEET)
+
+
+@test("load directory yields errors for unreadable files with a {executor} pool, and loads the rest")
+def _(executor=each("process", "thread")):
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(_const.DUMMY_TABLE, tmp)
+        shutil.copy(_const.DUMMY_WORKSHEET, tmp)
+        pathlib.Path(tmp, "ALIAS.answer.tml").write_text("guid: *undefined\n", encoding="utf-8")
+        pathlib.Path(tmp, "LATIN1.answer.tml").write_bytes("answer:\n  name: Caf\u00e9\n".encode("latin-1"))
+
+        results = dict(bulk.load_directory(tmp, workers=2, executor=executor, batch_size=1))
+
+        assert type(results[pathlib.Path(tmp, "DUMMY.table.tml")]) is Table
+        assert type(results[pathlib.Path(tmp, "DUMMY.worksheet.tml")]) is Worksheet
+        assert type(results[pathlib.Path(tmp, "ALIAS.answer.tml")]) is TMLDecodeError
+        assert "undefined alias" in str(results[pathlib.Path(tmp, "ALIAS.answer.tml")])
+        assert type(results[pathlib.Path(tmp, "LATIN1.answer.tml")]) is TMLError
+
+
+@test("load directory requires a known executor")
+def _():
+    with raises(ValueError):
+        list(bulk.load_directory(_const.DATA_DIR, executor="cluster"))
+
+
+@test("importing the package leaves ForkingPickler alone, until the bulk loader needs it")
+def _():
+    code = (
+        "from multiprocessing.reduction import ForkingPickler\n"
+        "from thoughtspot_tml import _reduction, _scriptability, bulk, cache, spotapp\n"
+        "identity = _scriptability.Identity(name='DIM_RETAPP_PRODUCTS')\n"
+        "assert b'_reduction' not in bytes(ForkingPickler.dumps(identity))\n"
+        "_reduction.register()\n"
+        "assert b'_reduction' in bytes(ForkingPickler.dumps(identity))\n"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,93 @@
+import os
+import pathlib
+import shutil
+import tempfile
+
+from thoughtspot_tml.cache import ParseCache
+from thoughtspot_tml.tml import Connection, Liveboard, Worksheet
+from thoughtspot_tml.utils import load_any
+from ward import test
+
+from . import _const
+
+
+@test("ParseCache parses a document once, then serves it from disk")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(pathlib.Path(tmp))
+
+        first = Worksheet.load(_const.DUMMY_WORKSHEET, cache=cache)
+        again = Worksheet.load(_const.DUMMY_WORKSHEET, cache=cache)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert len(cache) == 1
+        assert again == first
+        assert again is not first
+
+        # the cache persists between instances
+        cache = ParseCache(pathlib.Path(tmp))
+        assert load_any(_const.DUMMY_WORKSHEET, cache=cache) == first
+        assert cache.hits == 1
+
+
+@test("ParseCache keys on content, type, and laziness")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(pathlib.Path(tmp, "cache"))
+        path = pathlib.Path(shutil.copy(_const.DUMMY_LIVEBOARD, tmp))
+
+        eager = Liveboard.load(path, cache=cache)
+        lazy = Liveboard.load(path, lazy=True, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 2)
+
+        lazy = Liveboard.load(path, lazy=True, cache=cache)
+        assert cache.hits == 1
+        assert lazy.liveboard.visualizations == eager.liveboard.visualizations
+
+        eager.liveboard.name = "Something Else"
+        eager.dump(path)
+
+        assert Liveboard.load(path, cache=cache).liveboard.name == "Something Else"
+        assert (cache.hits, cache.misses) == (1, 3)
+
+
+@test("ParseCache evicts the least recently used objects")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(pathlib.Path(tmp))
+        worksheet = Worksheet.load(_const.DUMMY_WORKSHEET)
+
+        for seconds, key in enumerate(("a", "b", "c"), start=1):
+            cache.put(key, worksheet)
+            os.utime(pathlib.Path(tmp, f"{key}.pickle"), (seconds, seconds))
+
+        entry_size = cache.size // 3
+        cache = ParseCache(pathlib.Path(tmp), max_bytes=entry_size * 2)
+
+        assert len(cache) == 2
+        assert cache.get("a") is None
+
+        cache.get("b")
+        cache.put("d", worksheet)
+
+        assert cache.get("c") is None
+        assert cache.get("b") == worksheet
+        assert cache.get("d") == worksheet
+        assert cache.size == entry_size * 2
+
+
+@test("ParseCache parses a document again when its entry is corrupt")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(pathlib.Path(tmp))
+        connection = Connection.load(_const.DUMMY_CONNECTION, cache=cache)
+
+        for entry in pathlib.Path(tmp).iterdir():
+            entry.write_bytes(b"not a pickle")
+
+        assert Connection.load(_const.DUMMY_CONNECTION, cache=cache) == connection
+        assert (cache.hits, cache.misses) == (0, 2)
+
+        cached = Connection.load(_const.DUMMY_CONNECTION, cache=cache)
+        assert cache.hits == 1
+        assert cached.guid == connection.guid
@@ -0,0 +1,116 @@
+from thoughtspot_tml import Liveboard, Worksheet, _decode, _scriptability
+from thoughtspot_tml.exceptions import TMLDecodeError
+from ward import raises, test
+import betterproto
+
+from . import _const
+
+
+@test("Decoder builds nested _scriptability objects")
+def _():
+    t = Liveboard.load(_const.DUMMY_LIVEBOARD)
+
+    assert type(t.liveboard) is _scriptability.PinboardEDocProto
+    assert type(t.liveboard.visualizations[0]) is _scriptability.PinnedVisualization
+    assert type(t.liveboard.visualizations[0].answer) is _scriptability.AnswerEDocProto
+    assert type(t.liveboard.visualizations[0].answer.tables[0]) is _scriptability.Identity
+    assert t.liveboard.visualizations[0].answer.parameter_values is None
+
+
+@test("Decoder objects are equivalent to hand-built objects")
+def _():
+    t = Worksheet.loads(
+        """
+        guid: 2ea7add9-0ccb-4ac1-90bb-231794ebb377
+        worksheet:
+          name: Sales
+          tables:
+          - name: fact_retapp_sales
+          properties:
+            is_bypass_rls: false
+        """,
+    )
+
+    assert t.worksheet == _scriptability.WorksheetEDocProto(
+        name="Sales",
+        tables=[_scriptability.Identity(name="fact_retapp_sales")],
+        properties=_scriptability.WorksheetEDocProtoQueryProperties(is_bypass_rls=False),
+    )
+    assert bytes(t.worksheet) == bytes(
+        _scriptability.WorksheetEDocProto(
+            name="Sales",
+            tables=[_scriptability.Identity(name="fact_retapp_sales")],
+            properties=_scriptability.WorksheetEDocProtoQueryProperties(is_bypass_rls=False),
+        ),
+    )
+
+
+@test("Decoder objects without a oneof share read-only bookkeeping, and stay mutable")
+def _():
+    t = Worksheet.load(_const.DUMMY_WORKSHEET)
+    a, b = t.worksheet.tables[:2]
+
+    assert vars(a) == vars(_scriptability.Identity(name=a.name, fqn=a.fqn))
+
+    with raises(TypeError):
+        a._group_current["id"] = "name"
+
+    a.name = "Something Else"
+    assert a.is_set("name")
+    assert a._group_current == b._group_current == {}
+    assert b.name != a.name
+    assert t.dumps().count("Something Else") == 1
+
+
+@test("Decoder objects with a oneof keep their own bookkeeping, even once copied")
+def _():
+    a = _scriptability.MetricId(personalised_view_id="b1e2c3d4")
+    b = _decode.assemble(_scriptability.MetricId, _decode.state_of(a))
+
+    b.answer_id = "2ea7add9-0ccb-4ac1-90bb-231794ebb377"
+
+    assert b._group_current == {"id": "answer_id"}
+    assert a._group_current == {"id": None}
+    assert betterproto.which_one_of(a, "id") == ("", None)
+
+
+@test("Decoder supports oneof fields")
+def _():
+    t = Worksheet.load(_const.DUMMY_MODEL)
+
+    assert type(t.worksheet.parameters[0]) is _scriptability.Parameter
+    assert t.worksheet.parameters[0].name == "Tax Rate"
+
+
+@test("Decoder raises TMLDecodeError on unexpected nested data")
+def _():
+    with raises(TMLDecodeError) as exc:
+        Worksheet.loads("guid: null\nworksheet:\n  tables:\n  - name: a\n    not_a_field: b\n")
+
+    assert "unexpected keyword argument 'not_a_field'" in str(exc.raised)
+
+
+@test("Decoder maps reserved word keys onto their python field")
+def _():
+    t = Worksheet.loads(
+        """
+        guid: 5cb2b688-8531-45a4-9efb-35dbd2104a84
+        worksheet:
+          name: Sales Model
+          description: |-
+            - with: PRODUCTS
+          schema:
+            tables:
+            - name: FACT_RETAPP_SALES
+              joins:
+              - with: PRODUCTS
+                "on": "[FACT_RETAPP_SALES::Product ID] = [DIM_RETAPP_PRODUCTS::Product ID]"
+        """,
+    )
+
+    assert t.worksheet.description == "- with: PRODUCTS"
+    assert t.worksheet.schema.tables[0].joins[0].with_ == "PRODUCTS"
+
+    # documents may also use the python-betterproto spelling
+    u = Worksheet.loads(t.dumps().replace("  - with:", "  - with_:"))
+    assert u == t
@@ -0,0 +1,55 @@
+import json
+
+from thoughtspot_tml import Connection, Worksheet, _scriptability
+from ward import test
+
+from . import _const
+
+
+@test("to_dict keeps empty values, dumps drops them")
+def _():
+    t = Worksheet.load(_const.DUMMY_WORKSHEET)
+    t.worksheet.description = ""
+    t.worksheet.filters = []
+
+    data = t.to_dict()
+    assert data["worksheet"]["description"] == ""
+    assert data["worksheet"]["filters"] == []
+    assert data["worksheet"]["schema"] is None
+
+    data = json.loads(t.dumps(format_type="JSON"))
+    assert "description" not in data["worksheet"]
+    assert "filters" not in data["worksheet"]
+    assert "schema" not in data["worksheet"]
+
+
+@test("dumps keeps empty connection property values")
+def _():
+    t = Connection.load(_const.DUMMY_CONNECTION)
+    password = next(p for p in t.connection.properties if p.key == "password")
+
+    assert password.value == ""
+    assert {"key": "password", "value": ""} in json.loads(t.dumps(format_type="JSON"))["properties"]
+
+
+@test("dumps keeps empty objects nested within a list")
+def _():
+    t = Worksheet.load(_const.DUMMY_WORKSHEET)
+    t.worksheet.tables.append(_scriptability.Identity())
+
+    assert json.loads(t.dumps(format_type="JSON"))["worksheet"]["tables"][-1] == {}
+
+
+@test("dumps renames reserved word fields to their TML key")
+def _():
+    t = Worksheet.load(_const.DUMMY_MODEL)
+    t.worksheet.description = 'a user value containing "with_"'
+
+    data = t.to_dict()
+    joins = data["worksheet"]["schema"]["tables"][2]["joins"]
+    assert all("with" in join and "with_" not in join for join in joins)
+    assert data["worksheet"]["description"] == 'a user value containing "with_"'
+
+    data = json.loads(t.dumps(format_type="JSON"))
+    assert data["worksheet"]["schema"]["tables"][2]["joins"][0]["with"] == "PRODUCTS"
+    assert data["worksheet"]["description"] == 'a user value containing "with_"'
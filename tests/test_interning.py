@@ -0,0 +1,71 @@
+import pathlib
+import shutil
+import tempfile
+
+from thoughtspot_tml import bulk
+from thoughtspot_tml.interning import InternPool
+from thoughtspot_tml.tml import Liveboard, Table, Worksheet
+from ward import each, test
+
+from . import _const
+
+
+@test("InternPool shares short strings between documents, but not long free text")
+def _():
+    pool = InternPool()
+    document = _const.DUMMY_WORKSHEET.read_text(encoding="utf-8")
+    description = "a long description, " * 10
+
+    first = Worksheet.loads(document, intern=pool)
+    misses = pool.misses
+    second = Worksheet.loads(document, intern=pool)
+
+    assert first == second == Worksheet.loads(document)
+    assert pool.misses == misses == len(pool)
+    assert pool.hits > pool.misses
+    assert 0.5 < pool.hit_rate < 1
+
+    a, b = first.worksheet.worksheet_columns[0], second.worksheet.worksheet_columns[0]
+    assert a.name is b.name
+    assert a.column_id is b.column_id
+    assert a.properties.column_type is b.properties.column_type
+    assert first.worksheet.tables[0].fqn is second.worksheet.tables[0].fqn
+    assert first.worksheet.table_paths[0].join_path[0].join[0] is second.worksheet.table_paths[0].join_path[0].join[0]
+
+    assert first.worksheet.formulas[0].expr is second.worksheet.formulas[0].expr
+
+    # long strings are usually free text, they rarely repeat
+    first.worksheet.description = description
+    third = Worksheet.loads(first.dumps(), intern=pool)
+    fourth = Worksheet.loads(first.dumps(), intern=pool)
+    assert third.worksheet.description == fourth.worksheet.description == description
+    assert third.worksheet.description is not fourth.worksheet.description
+
+    pool.clear()
+    assert (len(pool), pool.hits, pool.misses, pool.hit_rate) == (0, 0, 0, 0.0)
+
+
+@test("InternPool applies to lazily loaded {tml_cls.__name__} objects")
+def _(tml_cls=each(Liveboard, Table), path=each(_const.DUMMY_LIVEBOARD, _const.DUMMY_TABLE)):
+    pool = InternPool()
+    first = tml_cls.load(path, lazy=True, intern=pool)
+    second = tml_cls.load(path, lazy=True, intern=pool)
+
+    assert first == tml_cls.load(path)
+    assert first.name is second.name
+    assert pool.hits >= pool.misses
+
+
+@test("load directory shares one InternPool across every file")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(_const.DUMMY_WORKSHEET, tmp)
+        shutil.copy(_const.DUMMY_WORKSHEET, pathlib.Path(tmp, "COPY.worksheet.tml"))
+
+        pool = InternPool()
+        results = list(bulk.load_directory(tmp, workers=2, ordered=True, batch_size=1, intern=pool))
+        (_, first), (_, second) = results
+
+        assert first == second == Worksheet.load(_const.DUMMY_WORKSHEET)
+        assert first.worksheet.worksheet_columns[0].column_id is second.worksheet.worksheet_columns[0].column_id
+        assert len(pool) == pool.misses
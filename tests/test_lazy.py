@@ -0,0 +1,76 @@
+import copy
+
+from thoughtspot_tml import Liveboard, Worksheet, _lazy, _scriptability
+from thoughtspot_tml.exceptions import TMLDecodeError
+from thoughtspot_tml.spotapp import SpotApp
+from ward import each, raises, test
+
+from . import _const
+
+
+@test("lazy {tml_cls.__name__} dumps identically to a full load")
+def _(
+    tml_cls=each(Liveboard, Worksheet, Worksheet),
+    path=each(_const.DUMMY_LIVEBOARD, _const.DUMMY_WORKSHEET, _const.DUMMY_MODEL),
+):
+    t = tml_cls.load(path)
+    lazy = tml_cls.load(path, lazy=True)
+
+    assert lazy.dumps() == t.dumps()
+    assert lazy.dumps(format_type="JSON") == t.dumps(format_type="JSON")
+    assert lazy.to_dict() == t.to_dict()
+
+
+@test("lazy load defers nested objects until first access")
+def _():
+    t = Liveboard.load(_const.DUMMY_LIVEBOARD, lazy=True)
+
+    assert t.name == "This is our Product Universe"
+    assert _lazy.is_lazy(t.liveboard)
+    assert isinstance(t.liveboard, _scriptability.PinboardEDocProto)
+
+    visualization = t.liveboard.visualizations[0]
+    assert type(visualization) is _scriptability.PinnedVisualization
+    assert type(visualization.answer.tables[0]) is _scriptability.Identity
+
+    # every deferred field has been converted, so it's the real thing again
+    assert not _lazy.is_lazy(t.liveboard)
+    assert type(t.liveboard) is _scriptability.PinboardEDocProto
+    assert t == Liveboard.load(_const.DUMMY_LIVEBOARD)
+
+
+@test("lazy load converts on comparison, copy, and assignment")
+def _():
+    t = Worksheet.load(_const.DUMMY_WORKSHEET)
+
+    assert Worksheet.load(_const.DUMMY_WORKSHEET, lazy=True) == t
+    assert copy.deepcopy(Worksheet.load(_const.DUMMY_WORKSHEET, lazy=True)) == t
+
+    lazy = Worksheet.load(_const.DUMMY_WORKSHEET, lazy=True)
+    lazy.worksheet.tables = [_scriptability.Identity(name="NEW_TABLE")]
+
+    assert lazy.worksheet.tables[0].name == "NEW_TABLE"
+    assert "NEW_TABLE" in lazy.dumps()
+
+
+@test("lazy load raises TMLDecodeError on unexpected nested data, once accessed")
+def _():
+    document = Worksheet.load(_const.DUMMY_WORKSHEET).dumps().replace("worksheet_columns:", "some_columns:")
+
+    with raises(TMLDecodeError):
+        Worksheet.loads(document, lazy=True)
+
+    document = Worksheet.load(_const.DUMMY_WORKSHEET).dumps().replace("column_id:", "some_column_id:")
+    t = Worksheet.loads(document, lazy=True)
+
+    with raises(TMLDecodeError):
+        _ = t.worksheet.worksheet_columns
+
+
+@test("SpotApp read lazy")
+def _():
+    s = SpotApp.read(_const.DUMMY_SPOTAPP, lazy=True)
+
+    assert len(s.tml) == 5
+    assert all(_lazy.is_lazy(getattr(tml, tml.tml_type_name)) for tml in s.tml)
+    assert s.tml == SpotApp.read(_const.DUMMY_SPOTAPP).tml
@@ -0,0 +1,63 @@
+from thoughtspot_tml import Connection, Liveboard, Pinboard, Worksheet, _tml
+from thoughtspot_tml.exceptions import TMLDecodeError
+from thoughtspot_tml.utils import load_any
+from ward import each, raises, skip, test
+
+from . import _const
+
+FIXTURES = sorted(path for path in _const.DATA_DIR.glob("*.tml") if not path.name.startswith("BAD"))
+NO_MSGPACK = _tml.msgpack is None
+
+
+@skip("msgpack is not installed", when=NO_MSGPACK)
+@test("{path.name} round-trips through msgpack")
+def _(path=each(*FIXTURES)):
+    t = load_any(path)
+    data = t.dumps(format_type="MSGPACK")
+
+    assert isinstance(data, bytes)
+    assert len(data) < len(path.read_bytes())
+
+    r = type(t).loads(data, format_type="MSGPACK")
+    assert r.dumps() == t.dumps()
+
+    lazy = type(t).loads(data, format_type="MSGPACK", lazy=True)
+    assert lazy.dumps() == t.dumps()
+
+
+@skip("msgpack is not installed", when=NO_MSGPACK)
+@test("msgpack drops empty values like the other formats")
+def _():
+    t = Worksheet.load(_const.DUMMY_WORKSHEET)
+    t.worksheet.description = ""
+    t.worksheet.filters = []
+
+    r = Worksheet.loads(t.dumps(format_type="msgpack"), format_type="msgpack")
+    assert r.worksheet.description is None
+    assert r.worksheet.filters is None
+
+    c = Connection.load(_const.DUMMY_CONNECTION)
+    r = Connection.loads(c.dumps(format_type="MSGPACK"), format_type="MSGPACK")
+    assert {"key": "password", "value": ""} in r.to_dict()["properties"]
+
+
+@skip("msgpack is not installed", when=NO_MSGPACK)
+@test("msgpack keeps the Liveboard and Pinboard backwards compatibility")
+def _():
+    t = Liveboard.load(_const.DUMMY_LIVEBOARD)
+    data = t.dumps(format_type="MSGPACK")
+    assert Pinboard.loads(data, format_type="MSGPACK").pinboard.name == t.liveboard.name
+
+
+@skip("msgpack is not installed", when=NO_MSGPACK)
+@test("msgpack raises on bytes which aren't a TML document")
+def _():
+    data = Worksheet.load(_const.DUMMY_WORKSHEET).dumps(format_type="MSGPACK")
+
+    with raises(TMLDecodeError) as exc:
+        Worksheet.loads(data[:-3], format_type="MSGPACK")
+
+    assert "invalid msgpack data" in str(exc.raised)
+
+    with raises(ValueError):
+        Worksheet.loads(data, format_type="XML")
@@ -0,0 +1,105 @@
+from thoughtspot_tml import Answer, Connection, Worksheet
+from thoughtspot_tml.exceptions import TMLDecodeError
+from thoughtspot_tml.utils import load_any
+from ward import each, raises, test
+
+from . import _const
+
+
+@test("{path.name} round-trips through protobuf bytes, lazy={lazy}")
+def _(
+    path=each(
+        _const.DUMMY_TABLE,
+        _const.DUMMY_VIEW,
+        _const.DUMMY_SQL_VIEW,
+        _const.DUMMY_WORKSHEET,
+        _const.DUMMY_ANSWER,
+        _const.DUMMY_LIVEBOARD,
+        _const.DUMMY_PINBOARD,
+        _const.DUMMY_CONNECTION,
+    ),
+    lazy=each(False, True, False, True, False, True, False, True),
+):
+    t = load_any(path, lazy=lazy)
+    data = t.dumps(format_type="PROTOBUF")
+
+    assert data == t.to_bytes()
+    assert len(data) < len(path.read_bytes())
+
+    r = type(t).from_bytes(data, lazy=lazy)
+    assert r.guid == t.guid
+    assert r.dumps() == load_any(path).dumps()
+
+
+@test("Protobuf bytes match betterproto's encoding of the TML document")
+def _():
+    t = Worksheet.load(_const.DUMMY_WORKSHEET)
+    guid = t.guid.encode()
+
+    assert t.to_bytes().startswith(b"\x0a" + bytes([len(guid)]) + guid + b"\x12")
+    assert t.to_bytes().endswith(bytes(t.worksheet))
+
+
+@test("Protobuf encodes enums by name, oneofs, maps, and reserved word fields")
+def _():
+    t = Answer.loads(
+        """
+        guid: 5cb2b688-8531-45a4-9efb-35dbd2104a84
+        answer:
+          name: Sales by Product
+          parameter_values:
+            region: EMEA
+          answer_columns:
+          - name: Total Sales
+            format:
+              category: CURRENCY
+              currencyFormatConfig:
+                locale: en-US
+                unit: THOUSANDS
+        """,
+    )
+    r = Answer.from_bytes(t.to_bytes())
+
+    assert r.answer.parameter_values == {"region": "EMEA"}
+    assert r.answer.answer_columns[0].format.category == "CURRENCY"
+    assert r.answer.answer_columns[0].format.currencyFormatConfig.unit == "THOUSANDS"
+    assert r.dumps() == t.dumps()
+
+    w = Worksheet.loads(
+        """
+        guid: 5cb2b688-8531-45a4-9efb-35dbd2104a84
+        worksheet:
+          name: Sales Model
+          schema:
+            tables:
+            - name: FACT_RETAPP_SALES
+              joins:
+              - with: PRODUCTS
+                "on": "[FACT_RETAPP_SALES::Product ID] = [DIM_RETAPP_PRODUCTS::Product ID]"
+        """,
+    )
+
+    assert Worksheet.from_bytes(w.to_bytes()).worksheet.schema.tables[0].joins[0].with_ == "PRODUCTS"
+
+
+@test("Protobuf keeps a missing guid and empty connection property values")
+def _():
+    t = Connection.load(_const.DUMMY_CONNECTION)
+    t.guid = None
+    r = Connection.from_bytes(t.to_bytes())
+
+    assert r.guid is None
+    assert {"key": "password", "value": ""} in r.to_dict()["properties"]
+
+
+@test("Protobuf raises on bytes which aren't an encoded TML object")
+def _():
+    data = Worksheet.load(_const.DUMMY_WORKSHEET).to_bytes()
+
+    with raises(TMLDecodeError) as exc:
+        Worksheet.from_bytes(data[:-3])
+
+    assert "invalid protobuf data" in str(exc.raised)
+
+    with raises(ValueError):
+        Worksheet.load(_const.DUMMY_WORKSHEET).dumps(format_type="XML")
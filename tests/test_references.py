@@ -0,0 +1,130 @@
+import pathlib
+import shutil
+import tempfile
+
+from thoughtspot_tml import _scriptability
+from thoughtspot_tml.exceptions import TMLError
+from thoughtspot_tml.references import ReferenceIndex
+from thoughtspot_tml.spotapp import SpotApp
+from thoughtspot_tml.tml import Worksheet
+from ward import raises, test
+
+from . import _const
+
+WORKSHEET_GUID = "2ea7add9-0ccb-4ac1-90bb-231794ebb377"
+
+
+def _copy_fixtures(directory):
+    for path in (
+        _const.DUMMY_TABLE,
+        _const.DUMMY_VIEW,
+        _const.DUMMY_SQL_VIEW,
+        _const.DUMMY_WORKSHEET,
+        _const.DUMMY_ANSWER,
+        _const.DUMMY_LIVEBOARD,
+    ):
+        shutil.copy(path, directory)
+
+
+@test("ReferenceIndex finds who refers to a Table, Worksheet, or Visualization")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        _copy_fixtures(tmp)
+        index = ReferenceIndex.from_directory(pathlib.Path(tmp), workers=1)
+
+        assert len(index) == 6
+        assert "dim_retapp_products" in index
+        assert "DIM_RETAPP_PRODUCTS" not in index
+
+        assert index.referrers("dim_retapp_products") == {WORKSHEET_GUID}
+        assert [(r.tml_type, r.field_path) for r in index.references_to("dim_retapp_products")] == [
+            ("worksheet", "worksheet.tables[0]"),
+            ("worksheet", "worksheet.table_paths[0].table"),
+        ]
+
+        assert index.referrers("(Sample) Retail - Apparel") == {
+            "7fd39fdb-9dfe-4954-b5dd-9a5d846085b0",
+            "4b0034ad-b6ee-45c7-8989-0621008de785",
+            "6338e45d-b1ff-4bd3-8898-8112768bdf46",
+            "d00f3754-15a9-4a7a-a3d5-3248ad19aa9d",
+            "4c6e8502-1695-4dc4-b0b0-215dae7a6d71",
+        }
+
+        (reference,) = index.references_to("3054df51-804e-4900-9df1-9a4e543d3a8f")
+        assert reference.field_path == "liveboard.visualizations[0].viz_guid"
+        assert reference.file == pathlib.Path(tmp, "DUMMY.liveboard.tml").resolve()
+
+
+@test("ReferenceIndex updates a single file as it changes")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        _copy_fixtures(tmp)
+        index = ReferenceIndex.from_directory(pathlib.Path(tmp), workers=1)
+        path = pathlib.Path(tmp, "DUMMY.worksheet.tml")
+
+        worksheet = Worksheet.load(path)
+        worksheet.worksheet.tables = worksheet.worksheet.tables[1:]
+        worksheet.worksheet.table_paths = worksheet.worksheet.table_paths[1:]
+        worksheet.dump(path)
+        index.update(path)
+
+        assert "dim_retapp_products" not in index
+        assert index.referrers("dim_retapp_stores") == {WORKSHEET_GUID}
+
+        path.unlink()
+        index.update(path)
+
+        assert len(index) == 5
+        assert "dim_retapp_stores" not in index
+        assert index.references_from(path) == []
+
+        shutil.copy(_const.DATA_DIR / "BAD_DUMMY.answer.tml", tmp)
+
+        with raises(TMLError):
+            index.update(pathlib.Path(tmp, "BAD_DUMMY.answer.tml"))
+
+        pathlib.Path(tmp, "LATIN1.answer.tml").write_bytes("answer:\n  name: Caf\u00e9\n".encode("latin-1"))
+
+        with raises(TMLError):
+            index.update(pathlib.Path(tmp, "LATIN1.answer.tml"))
+
+
+@test("ReferenceIndex only builds the fields of a lazy TML which may hold a reference")
+def _():
+    worksheet = Worksheet.load(_const.DUMMY_WORKSHEET, lazy=True)
+    index = ReferenceIndex()
+    index.add(worksheet)
+
+    assert index.referrers("dim_retapp_products") == {WORKSHEET_GUID}
+    assert worksheet.worksheet.__dict__["_lazy_deferred_fields"] >= {"worksheet_columns", "formulas"}
+
+
+@test("ReferenceIndex indexes a SpotApp by guid")
+def _():
+    spotapp = SpotApp.read(_const.DUMMY_SPOTAPP)
+    index = ReferenceIndex.from_spotapp(spotapp)
+
+    assert len(index) == 5
+    assert index.referrers("Retail - Apparel") == {tml.guid for tml in spotapp.tables}
+
+    worksheet = spotapp.worksheets[0]
+    worksheet.worksheet.filters = [_scriptability.Filter(column=["Product", "Store Name"], oper="in")]
+    index.add(worksheet)
+
+    assert len(index) == 5
+    assert [r.field_path for r in index.references_to("Store Name")] == ["worksheet.filters[0].column[1]"]
+    assert len(index.references_from(worksheet.guid)) == 8
+
+    index.remove(worksheet.guid)
+
+    assert "Store Name" not in index
+    assert index.referrers("dim_retapp_products") == {"055fd813-be4d-4a08-969f-e0a89a7100b7"}
+
+
+@test("ReferenceIndex requires a guid or file to index an object under")
+def _():
+    worksheet = Worksheet.load(_const.DUMMY_WORKSHEET)
+    worksheet.guid = None
+
+    with raises(ValueError):
+        ReferenceIndex().add(worksheet)
@@ -1,8 +1,12 @@
+import pathlib
 import tempfile
+import warnings
 import zipfile
 
-from thoughtspot_tml.spotapp import SpotApp
-from ward import test
+from thoughtspot_tml import Pinboard
+from thoughtspot_tml.exceptions import TMLError
+from thoughtspot_tml.spotapp import LazyTML, SpotApp, SpotAppWriter
+from ward import each, raises, test
 
 from . import _const
 
@@ -15,6 +19,18 @@ def _():
     assert len(s.tml) > 0
 
 
+@test("SpotApp read raises TMLError on a TML which isn't UTF-8, with workers={workers}")
+def _(workers=each(None, 2)):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, "spot_app.zip")
+
+        with zipfile.ZipFile(path, mode="w") as archive:
+            archive.writestr("LATIN1.answer.tml", "answer:\n  name: Caf\u00e9\n".encode("latin-1"))
+
+        with raises(TMLError):
+            SpotApp.read(path, workers=workers)
+
+
 @test("SpotApp save")
 def _():
     s = SpotApp.read(_const.DUMMY_SPOTAPP)
@@ -27,6 +43,28 @@ def _():
         assert zipfile.is_zipfile(f) is True
 
 
+@test("SpotApp save keeps its layout, unless asked to compress or add a Manifest")
+def _():
+    s = SpotApp.read(_const.DUMMY_SPOTAPP)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, "spot_app.zip")
+        s.save(path)
+
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist() == [f"{tml.name}.{type(tml).__name__.lower()}.tml" for tml in s.tml]
+            assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+            assert [archive.read(name).decode() for name in archive.namelist()] == [tml.dumps() for tml in s.tml]
+
+        s.save(path, compression="deflate", manifest=True)
+
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist()[-1] == "Manifest.yaml"
+            assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in archive.infolist())
+
+        assert SpotApp.read(path) == s
+
+
 @test("SpotApp TML access")
 def _():
     s = SpotApp.read(_const.DUMMY_SPOTAPP)
@@ -39,3 +77,169 @@ def _():
     assert len(s.worksheets) == 1
     assert len(s.answers) == 0
     assert len(s.liveboards) == 0
+
+
+@test("SpotApp read with workers")
+def _():
+    s = SpotApp.read(_const.DUMMY_SPOTAPP, workers=2, batch_size=2)
+
+    assert s.manifest is not None
+    assert s.tml == SpotApp.read(_const.DUMMY_SPOTAPP).tml
+
+
+@test("SpotApp read lazy answers queries from the Manifest")
+def _():
+    s = SpotApp.read(_const.DUMMY_SPOTAPP, lazy=True)
+
+    assert isinstance(s.tml, LazyTML)
+    assert len(s.tml) == 5
+    assert s.tml.tml_type(0) is Pinboard
+    assert s.tml.guid(1) == "2ea7add9-0ccb-4ac1-90bb-231794ebb377"
+    assert s.tml.name(-1) == "fact_retapp_sales"
+    assert not any(s.tml.is_loaded(i) for i in range(len(s.tml)))
+
+
+@test("SpotApp read lazy only reads the TML which are accessed")
+def _():
+    s = SpotApp.read(_const.DUMMY_SPOTAPP, lazy=True)
+
+    assert len(s.tables) == 3
+    assert [s.tml.is_loaded(i) for i in range(len(s.tml))] == [False, False, True, True, True]
+
+    assert s.tml[1] is s.tml[-4]
+    assert s.tml[1].guid == "2ea7add9-0ccb-4ac1-90bb-231794ebb377"
+    assert s.tml[3:] == s.tables[1:]
+
+    s.tml.close()
+
+    assert s.tml == SpotApp.read(_const.DUMMY_SPOTAPP).tml
+
+    with raises(IndexError):
+        s.tml[5]
+
+
+@test("SpotApp releases the archive of a lazy read when closed")
+def _():
+    with SpotApp.read(_const.DUMMY_SPOTAPP, lazy=True) as s:
+        assert len(s.tables) == 3
+        archive = s.tml._archive
+        assert archive is not None and archive.fp is not None
+
+    assert archive.fp is None
+    assert s.tml._archive is None
+    assert s.tml[1].guid == "2ea7add9-0ccb-4ac1-90bb-231794ebb377"
+
+    s.close()
+    assert s.tml._archive is None
+
+    with SpotApp.read(_const.DUMMY_SPOTAPP) as s:
+        assert len(s.tables) == 3
+
+
+@test("SpotApp disambiguate reports on every TML")
+def _():
+    s = SpotApp.read(_const.DUMMY_SPOTAPP)
+    mapping = {
+        "2ea7add9-0ccb-4ac1-90bb-231794ebb377": "2ea7add9-0000-0000-0000-000000000000",
+        "dim_retapp_products": "7fd39fdb-0000-0000-0000-000000000000",
+        "dim_retapp_stores": "3f3ae98c-0000-0000-0000-000000000000",
+        "fact_retapp_sales": "055fd813-0000-0000-0000-000000000000",
+    }
+
+    reports = s.disambiguate(mapping, delete_unmapped_guids=True)
+
+    assert [r.guid for r in reports] == [tml.guid for tml in SpotApp.read(_const.DUMMY_SPOTAPP).tml]
+    assert s.tml[1].guid == "2ea7add9-0000-0000-0000-000000000000"
+    assert s.tml[0].guid is None
+
+    assert reports[0].deleted == ["4c6e8502-1695-4dc4-b0b0-215dae7a6d71", "(Sample) Retail - Apparel"]
+    assert reports[1].mapped == 4
+    assert reports[1].references == 4
+    assert reports[4].mapped == 2
+    assert reports[4].deleted == ["055fd813-be4d-4a08-969f-e0a89a7100b7", "Retail - Apparel"]
+
+
+for lazy in (False, True):
+
+    @test("SpotApp disambiguate with workers, lazy={lazy}")
+    def _(lazy=lazy):
+        mapping = {"dim_retapp_products": "7fd39fdb-0000-0000-0000-000000000000"}
+        expected = SpotApp.read(_const.DUMMY_SPOTAPP)
+        expected_reports = expected.disambiguate(mapping)
+
+        s = SpotApp.read(_const.DUMMY_SPOTAPP, lazy=lazy)
+        s.tml[2].guid = "7fd39fdb-0000-0000-0000-000000000000"
+        reports = s.disambiguate(mapping, workers=2, batch_size=2)
+
+        unchanged = [0, 1, 3, 4]
+
+        assert [s.tml[i] for i in unchanged] == [expected.tml[i] for i in unchanged]
+        assert [reports[i] for i in unchanged] == [expected_reports[i] for i in unchanged]
+        assert s.tml[2].guid == "7fd39fdb-0000-0000-0000-000000000000"
+        assert reports[2].unmapped == ["7fd39fdb-0000-0000-0000-000000000000", "Retail - Apparel"]
+
+
+@test("SpotAppWriter streams compressed TML and writes a Manifest")
+def _():
+    s = SpotApp.read(_const.DUMMY_SPOTAPP)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, "spot_app.zip")
+
+        with SpotAppWriter(path) as writer:
+            for tml in s.tml:
+                writer.write(tml)
+
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist()[-1] == "Manifest.yaml"
+            assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in archive.infolist())
+            assert archive.read("dim_retapp_stores.table.tml").decode() == s.tables[1].dumps()
+
+        t = SpotApp.read(path)
+
+        assert t.tml == s.tml
+        assert [info["id"] for info in t.manifest.object] == [tml.guid for tml in s.tml]
+
+
+@test("SpotAppWriter appends to an existing archive")
+def _(trailing_manifest=each(True, False)):
+    s = SpotApp.read(_const.DUMMY_SPOTAPP)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, "spot_app.zip")
+
+        with SpotAppWriter(path) as writer:
+            writer.write(s.tml[0])
+
+        if not trailing_manifest:
+            with zipfile.ZipFile(path, mode="a") as archive:
+                archive.writestr("(Sample) Retail - Apparel.worksheet.tml", s.tml[1].dumps())
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+
+            with SpotAppWriter(path, mode="a") as writer:
+                for tml in s.tml[1 if trailing_manifest else 2 :]:
+                    writer.write(tml)
+
+        with zipfile.ZipFile(path) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist().count("Manifest.yaml") == 1
+            assert archive.namelist()[-1] == "Manifest.yaml"
+
+        t = SpotApp.read(path)
+
+        assert t.tml == s.tml
+        assert len(t.manifest.object) == (5 if trailing_manifest else 4)
+
+
+@test("SpotAppWriter rejects unknown options")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, "spot_app.zip")
+
+        with raises(ValueError):
+            SpotAppWriter(path, mode="r")
+
+        with raises(ValueError):
+            SpotAppWriter(path, compression="brotli")
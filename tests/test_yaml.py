@@ -0,0 +1,41 @@
+from thoughtspot_tml import _yaml
+from ward import skip, test
+import yaml
+
+from . import _const
+
+
+class PurePythonLoader(yaml.SafeLoader):
+    yaml_implicit_resolvers = _yaml._IMPLICIT_RESOLVERS
+
+
+for file in sorted(_const.DATA_DIR.glob("*.tml")):
+    if file.name.startswith("BAD_"):
+        continue
+
+    @skip("libyaml is not available", when=_yaml.BACKEND != "libyaml")
+    @test("YAML backends produce identical documents: {file.name}")
+    def _(file=file):
+        text = file.read_text(encoding="utf-8")
+        data = _yaml.load(text)
+
+        assert data == yaml.load(text, Loader=PurePythonLoader)
+        assert _yaml.dump(data) == yaml.dump(
+            data,
+            Dumper=_yaml._PurePythonTMLDumper,
+            width=_yaml.INFINITY,
+            default_flow_style=False,
+            sort_keys=False,
+            allow_unicode=True,
+        )
+
+
+@test("YAML dump does not escape characters outside the Basic Multilingual Plane")
+def _():
+    assert _yaml.dump({"name": "dim_rb_accounts 🐢"}) == "name: dim_rb_accounts 🐢\n"
+
+
+@test("YAML does not resolve '=' as a special value")
+def _():
+    assert _yaml.load("expr: =") == {"expr": "="}
+    assert _yaml.dump({"expr": "="}) == "expr: =\n"